@@ -4,6 +4,7 @@ from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.utils.translation import gettext_lazy as _
 from django.db import transaction
 
+from .authentication import bump_user_versions
 from .models import Student, Parent, DepartmentHead
 
 User = get_user_model()
@@ -91,7 +92,9 @@ class UserAdmin(DjangoUserAdmin):
     @admin.action(description="Set selected users role → Student")
     def make_students(self, request, queryset):
         with transaction.atomic():
+            user_ids = list(queryset.values_list("pk", flat=True))
             updated = queryset.update(role=User.Role.STUDENT)
+            bump_user_versions(user_ids)
             created = 0
             users = User.objects.filter(pk__in=queryset.values_list("pk", flat=True))
             for user in users:
@@ -104,7 +107,9 @@ class UserAdmin(DjangoUserAdmin):
 
     @admin.action(description="Set selected users role → Instructor")
     def make_instructors(self, request, queryset):
+        user_ids = list(queryset.values_list("pk", flat=True))
         updated = queryset.update(role=User.Role.INSTRUCTOR)
+        bump_user_versions(user_ids)
         self.message_user(request, f"Marked {updated} users as Instructor.")
 
     @admin.action(description="Set selected users role → Admin (is_staff=True)")
@@ -114,19 +119,25 @@ class UserAdmin(DjangoUserAdmin):
                 request, "Only superusers can promote users to Admin.", level=messages.ERROR
             )
             return
+        user_ids = list(queryset.values_list("pk", flat=True))
         updated = queryset.update(role=User.Role.ADMIN, is_staff=True)
+        bump_user_versions(user_ids)
         self.message_user(
             request, f"Marked {updated} user(s) as Admin and set is_staff=True."
         )
 
     @admin.action(description="Enable selected users (is_active=True)")
     def enable_users(self, request, queryset):
+        user_ids = list(queryset.values_list("pk", flat=True))
         updated = queryset.update(is_active=True)
+        bump_user_versions(user_ids)
         self.message_user(request, f"Enabled {updated} user(s).")
 
     @admin.action(description="Disable selected users (is_active=False)")
     def disable_users(self, request, queryset):
+        user_ids = list(queryset.values_list("pk", flat=True))
         updated = queryset.update(is_active=False)
+        bump_user_versions(user_ids)
         self.message_user(request, f"Disabled {updated} user(s).")
 
     @admin.action(description="Create missing Student profiles for selected users")
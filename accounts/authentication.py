@@ -0,0 +1,93 @@
+"""
+JWT authentication that resolves the user from a short-lived cache.
+
+Cached users are keyed by id plus a per-user version. Anything that changes
+what authentication depends on (``User.save``, role changes, enabling and
+disabling, password changes) bumps the version, so stale entries are never
+read again and simply expire.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core import metrics
+from core.cache_versions import bump_versions, current_version
+
+
+def add_user_claims(token, user):
+    token["role"] = user.role
+    token["is_active"] = user.is_active
+    return token
+
+
+def user_version_key(user_id):
+    return f"auth:user-version:{user_id}"
+
+
+def cached_user_key(user_id, version):
+    return f"auth:user:{user_id}:{version}"
+
+
+def bump_user_versions(user_ids):
+    """Invalidate the cached users."""
+    bump_versions(user_version_key(user_id) for user_id in user_ids)
+
+
+def cache_user(user):
+    """Store a freshly loaded user so its next authenticated request skips the DB."""
+    version = current_version(user_version_key(user.pk))
+    cache.set(cached_user_key(user.pk, version), user, getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 30))
+
+
+def update_last_login(user, interval=None):
+    """
+    Write ``last_login`` only when the stored value is older than
+    ``interval`` seconds. Uses a queryset update so the cached user is kept.
+    """
+    if interval is None:
+        interval = getattr(settings, "LAST_LOGIN_UPDATE_INTERVAL", 3600)
+    now = timezone.now()
+    if user.last_login and now - user.last_login < timedelta(seconds=interval):
+        return False
+    get_user_model().objects.filter(pk=user.pk).update(last_login=now)
+    user.last_login = now
+    return True
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that only loads the user row on a cache miss."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if validated_token.get("is_active") is False:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        version = current_version(user_version_key(user_id))
+        key = cached_user_key(user_id, version)
+        user = cache.get(key)
+        metrics.record_cache_lookup("auth_user", hit=user is not None)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 30))
+            return user
+
+        # the checks the parent makes after loading the row
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -0,0 +1,20 @@
+from django.contrib.auth.hashers import get_hasher
+from django.core.checks import Error, register
+
+
+@register()
+def check_password_hasher(app_configs, **kwargs):
+    hasher = get_hasher()
+    if getattr(hasher, "library", None) is None:
+        return []
+    try:
+        hasher._load_library()
+    except ValueError as exc:
+        return [
+            Error(
+                f"The preferred password hasher cannot load its library: {exc}",
+                hint="Install it or choose another PASSWORD_HASHER.",
+                id="accounts.E001",
+            )
+        ]
+    return []
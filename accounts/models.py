@@ -5,10 +5,7 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Q
 
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
+from .tasks import thumbnail_picture
 
 
 class CustomUserManager(UserManager):
@@ -64,18 +61,15 @@ class User(AbstractUser):
         return reverse("accounts:profile", kwargs={"pk": self.pk})
 
     def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        # a file not yet in storage: this save uploads it
+        uploaded = (
+            bool(self.picture) and not self.picture._committed
+            and (update_fields is None or "picture" in update_fields)
+        )
         super().save(*args, **kwargs)
-        if Image is None or not self.picture:
-            return
-        try:
-            if hasattr(self.picture, "path"):
-                img = Image.open(self.picture.path)
-                output_size = (300, 300)
-                if img.height > 300 or img.width > 300:
-                    img.thumbnail(output_size)
-                    img.save(self.picture.path)
-        except Exception:
-            pass
+        if uploaded:
+            thumbnail_picture.enqueue(user_id=self.pk)
 
 
 BACHELOR = _("Bachelor")
@@ -2,6 +2,9 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.db import transaction
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from .authentication import add_user_claims, cache_user, update_last_login
 
 from .models import Student, Parent, DepartmentHead
 
@@ -90,4 +93,23 @@ class UserCreateSerializer(serializers.ModelSerializer):
         if "role" not in validated_data or validated_data.get("role") is None:
             validated_data["role"] = User.Role.STUDENT
         user = User.objects.create_user(password=password, **validated_data)
-        return user
\ No newline at end of file
+        return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    /api/token/ pair carrying the same role and is_active claims as
+    registration. ``last_login`` is written at most once per
+    LAST_LOGIN_UPDATE_INTERVAL, and the authenticated user is cached so the
+    client's first API call does not load it again.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        update_last_login(self.user)
+        cache_user(self.user)
+        return data
@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+
+from core.tasks import task
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+THUMBNAIL_SIZE = (300, 300)
+
+
+@task
+def thumbnail_picture(user_id):
+    """Shrink the user's uploaded picture in place to fit ``THUMBNAIL_SIZE``."""
+    user = get_user_model().objects.filter(pk=user_id).only("picture").first()
+    if Image is None or user is None or not user.picture or not hasattr(user.picture, "path"):
+        return
+    with Image.open(user.picture.path) as img:
+        if img.height <= THUMBNAIL_SIZE[1] and img.width <= THUMBNAIL_SIZE[0]:
+            return
+        img.thumbnail(THUMBNAIL_SIZE)
+        img.save(user.picture.path)
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..views import get_tokens_for_user
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="alice", password="AlicePass123!")
+        self.admin = User.objects.create_superuser(username="root", password="RootPass123!")
+        self.url = reverse("user-me")
+
+    def authorize(self, user):
+        access = get_tokens_for_user(user)["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return access
+
+    def test_tokens_carry_role_and_active_claims(self):
+        token = AccessToken(self.authorize(self.user))
+        self.assertEqual(token["role"], User.Role.STUDENT)
+        self.assertIs(token["is_active"], True)
+
+        res = self.client.post(
+            reverse("token_obtain_pair"), {"username": "alice", "password": "AlicePass123!"}, format="json"
+        )
+        self.assertEqual(AccessToken(res.data["access"])["role"], User.Role.STUDENT)
+
+    def test_user_is_loaded_once_then_served_from_cache(self):
+        self.authorize(self.user)
+        with CaptureQueriesContext(connection) as first:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as second:
+            res = self.client.get(self.url)
+        self.assertEqual(res.data["username"], "alice")
+        # /me still loads the profiles, only the user row lookup is gone
+        self.assertEqual(len(second), len(first) - 1)
+        self.assertFalse(any('FROM "accounts_user"' in q["sql"] for q in second.captured_queries))
+
+    def test_saving_the_user_invalidates_the_cache(self):
+        self.authorize(self.user)
+        self.client.get(self.url)
+        self.user.role = User.Role.INSTRUCTOR
+        self.user.save(update_fields=["role"])
+        self.assertEqual(self.client.get(self.url).data["role"], User.Role.INSTRUCTOR)
+
+    def test_disable_users_rejects_cached_user_immediately(self):
+        self.authorize(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.client.force_authenticate(user=self.admin)
+        self.client.post(reverse("user-disable-users"), {"ids": [self.user.pk]}, format="json")
+        self.client.force_authenticate(user=None)
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class TokenLoginTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="bob", password="BobPass123!")
+        self.url = reverse("token_obtain_pair")
+
+    def login(self):
+        return self.client.post(self.url, {"username": "bob", "password": "BobPass123!"}, format="json")
+
+    def test_hasher_cost_follows_settings_and_rehashes_on_login(self):
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(identify_hasher(self.user.password).decode(self.user.password)["iterations"], 2000)
+
+    def test_last_login_written_once_per_interval(self):
+        self.login()
+        self.user.refresh_from_db()
+        first = self.user.last_login
+        self.assertIsNotNone(first)
+
+        with self.assertNumQueries(1):  # the user lookup, no write
+            self.login()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_login, first)
+
+        User.objects.filter(pk=self.user.pk).update(last_login=timezone.now() - timedelta(days=1))
+        self.login()
+        self.user.refresh_from_db()
+        self.assertGreater(self.user.last_login, first)
+
+    def test_login_primes_the_authentication_cache(self):
+        access = self.login().data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('FROM "accounts_user"' in q["sql"] for q in queries.captured_queries))
@@ -9,6 +9,9 @@ from rest_framework.response import Response
 
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from core.sparse import SparseFieldsMixin
+
+from .authentication import add_user_claims, bump_user_versions
 from .models import Student, Parent, DepartmentHead
 from .serializers import (
     UserSerializer,
@@ -23,11 +26,11 @@ User = get_user_model()
 
 
 def get_tokens_for_user(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = add_user_claims(RefreshToken.for_user(user), user)
     return {"refresh": str(refresh), "access": str(refresh.access_token)}
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     /api/accounts/users/
 
@@ -99,6 +102,7 @@ class UserViewSet(viewsets.ModelViewSet):
         qs = User.objects.filter(id__in=ids)
         with transaction.atomic():
             updated = qs.update(role=User.Role.STUDENT)
+            bump_user_versions(ids)
             created = 0
             for user in qs:
                 obj, was_created = Student.objects.get_or_create(user=user)
@@ -110,6 +114,7 @@ class UserViewSet(viewsets.ModelViewSet):
     def make_instructors(self, request):
         ids = self._ids_from_request(request)
         updated = User.objects.filter(id__in=ids).update(role=User.Role.INSTRUCTOR)
+        bump_user_versions(ids)
         return Response({"updated": updated})
 
     @action(detail=False, methods=["post"], permission_classes=[IsAdminUser])
@@ -118,18 +123,21 @@ class UserViewSet(viewsets.ModelViewSet):
         if not request.user.is_superuser:
             return Response({"detail": "only superusers can promote to admin"}, status=status.HTTP_403_FORBIDDEN)
         updated = User.objects.filter(id__in=ids).update(role=User.Role.ADMIN, is_staff=True)
+        bump_user_versions(ids)
         return Response({"updated": updated})
 
     @action(detail=False, methods=["post"], permission_classes=[IsAdminUser])
     def enable_users(self, request):
         ids = self._ids_from_request(request)
         updated = User.objects.filter(id__in=ids).update(is_active=True)
+        bump_user_versions(ids)
         return Response({"updated": updated})
 
     @action(detail=False, methods=["post"], permission_classes=[IsAdminUser])
     def disable_users(self, request):
         ids = self._ids_from_request(request)
         updated = User.objects.filter(id__in=ids).update(is_active=False)
+        bump_user_versions(ids)
         return Response({"updated": updated})
 
     @action(detail=False, methods=["post"], permission_classes=[IsAdminUser])
@@ -145,7 +153,7 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response({"created_student_profiles": created})
 
 
-class StudentViewSet(viewsets.ModelViewSet):
+class StudentViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     /api/accounts/students/
 
@@ -160,7 +168,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         return [perm() for perm in self.permission_classes]
 
 
-class ParentViewSet(viewsets.ModelViewSet):
+class ParentViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Parent.objects.select_related("user").prefetch_related("students").all()
     serializer_class = ParentSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
@@ -195,7 +203,7 @@ class ParentViewSet(viewsets.ModelViewSet):
         return Response({"detail": "student removed"}, status=status.HTTP_200_OK)
 
 
-class DepartmentHeadViewSet(viewsets.ModelViewSet):
+class DepartmentHeadViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = DepartmentHead.objects.select_related("user", "department").all()
     serializer_class = DepartmentHeadSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
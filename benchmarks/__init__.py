@@ -0,0 +1,15 @@
+"""
+Benchmarks for the exam-day critical path.
+
+* ``python manage.py bench`` seeds a throwaway test database with
+  ``benchmarks.datagen`` and times the hot endpoints in-process (latency
+  percentiles, throughput, query counts), writing the results to
+  ``benchmarks/results/<commit>.json``. Pass ``--compare`` with an older
+  file to spot regressions.
+* ``python manage.py bench --seed-only`` seeds the configured database so
+  ``python -m benchmarks.loadgen`` can drive a running runserver/gunicorn.
+* ``python manage.py bench_cache`` compares the shared-memory cache backend
+  with locmem and the file-based cache (``benchmarks.caches``).
+"""
+
+BENCH_PASSWORD = "bench-pass-123"
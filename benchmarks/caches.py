@@ -0,0 +1,68 @@
+"""
+Cache backend micro-benchmark: the shared-memory cache (core.shared_cache)
+against locmem and the file-based cache.
+
+``time_operations`` times set, get (hits) and incr in one process.
+``count_builds`` has several forked workers get-or-build the same keys and
+counts the builds: a per-process cache builds every key once per worker, a
+shared one about once in all.
+"""
+import multiprocessing
+import time
+from pathlib import Path
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from core.shared_cache import SharedMemoryCache
+
+from . import runner
+
+
+def backends(directory):
+    return {
+        "locmem": LocMemCache("bench", {}),
+        "filebased": FileBasedCache(str(Path(directory) / "filebased"), {"OPTIONS": {"MAX_ENTRIES": 100000}}),
+        "shared": SharedMemoryCache(str(Path(directory) / "shared.mmap"), {}),
+    }
+
+
+def _timed(fn, keys):
+    timings = []
+    for key in keys:
+        start = time.perf_counter()
+        fn(key)
+        timings.append(time.perf_counter() - start)
+    return runner.summarize(timings, [], 0)
+
+
+def time_operations(cache, iterations=1000, payload_size=1024):
+    payload = {"data": "x" * payload_size}
+    keys = [f"bench:{n}" for n in range(iterations)]
+    results = {
+        "set": _timed(lambda key: cache.set(key, payload), keys),
+        "get": _timed(cache.get, keys),
+    }
+    cache.set("bench:counter", 0)
+    results["incr"] = _timed(lambda key: cache.incr("bench:counter"), keys)
+    return results
+
+
+def _get_or_build(cache, keys, builds):
+    for key in keys:
+        if cache.get(key) is None:
+            with builds.get_lock():
+                builds.value += 1
+            cache.set(key, {"built": key})
+
+
+def count_builds(cache, keys=200, workers=4):
+    context = multiprocessing.get_context("fork")
+    builds = context.Value("i", 0)
+    keys = [f"bench:build:{n}" for n in range(keys)]
+    processes = [context.Process(target=_get_or_build, args=(cache, keys, builds)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return builds.value
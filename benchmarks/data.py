@@ -0,0 +1,53 @@
+from dataclasses import dataclass, field
+
+from benchmarks import BENCH_PASSWORD
+from benchmarks.datagen import DatabaseWriter, generate
+
+SCALES = {
+    "small": {
+        "students": 300,
+        "instructors": 10,
+        "programs": 3,
+        "courses": 30,
+        "offerings_per_course": 2,
+        "quizzes_per_course": 1,
+        "questions_per_quiz": 50,
+        "choices_per_question": 4,
+        "courses_per_student": 4,
+        "attempt_rate": 0.2,
+    },
+    "exam": {
+        "students": 5000,
+        "instructors": 100,
+        "programs": 10,
+        "courses": 300,
+        "offerings_per_course": 2,
+        "quizzes_per_course": 2,
+        "questions_per_quiz": 60,
+        "choices_per_question": 4,
+        "courses_per_student": 6,
+        "attempt_rate": 0.2,
+    },
+}
+
+
+@dataclass
+class BenchData:
+    student_ids: list = field(default_factory=list)
+    course_ids: list = field(default_factory=list)
+    quizzes_by_course: dict = field(default_factory=dict)
+    courses_by_student: dict = field(default_factory=dict)
+
+
+def seed(scale="small", seed=0, batch_size=2000):
+    """
+    Generate the benchmark dataset and return the ids the scenarios need.
+    Students log in as ``student_<seed>_<n>`` with ``BENCH_PASSWORD``.
+    """
+    generator = generate(DatabaseWriter(batch_size), seed=seed, password=BENCH_PASSWORD, **SCALES[scale])
+    return BenchData(
+        student_ids=generator.student_ids,
+        course_ids=generator.course_ids,
+        quizzes_by_course=generator.quizzes_by_course,
+        courses_by_student=generator.courses_by_student,
+    )
@@ -0,0 +1,437 @@
+"""
+Reproducible synthetic dataset generator.
+
+Rows are produced as plain dicts with explicit primary keys, so foreign keys
+can be computed instead of read back from the database, and are written in
+batches either with ``bulk_create`` (``DatabaseWriter``) or as PostgreSQL
+``COPY ... FROM stdin`` scripts (``CopyWriter``). Nothing goes through
+``Model.save()`` and model signals are muted while writing.
+"""
+import math
+import os
+import random
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.utils import timezone
+
+from accounts.models import Student
+from core.models import Semester, Session
+from courses.models import Course, CourseOffering, Program
+from quizzes.models import Answer, Choice, Question, Quiz, QuizAttempt, score_percentage
+
+User = get_user_model()
+
+PRESETS = {
+    "tiny": {
+        "students": 200, "instructors": 10, "programs": 3, "courses": 20,
+        "offerings_per_course": 2, "quizzes_per_course": 1, "questions_per_quiz": 20,
+        "choices_per_question": 4, "courses_per_student": 4, "attempt_rate": 0.6,
+    },
+    "medium": {
+        "students": 20000, "instructors": 400, "programs": 20, "courses": 1000,
+        "offerings_per_course": 2, "quizzes_per_course": 2, "questions_per_quiz": 50,
+        "choices_per_question": 4, "courses_per_student": 6, "attempt_rate": 0.7,
+    },
+    "large": {
+        "students": 200000, "instructors": 3000, "programs": 60, "courses": 8000,
+        "offerings_per_course": 3, "quizzes_per_course": 3, "questions_per_quiz": 50,
+        "choices_per_question": 4, "courses_per_student": 6, "attempt_rate": 0.7,
+    },
+}
+
+DEFAULT_PASSWORD = "datagen-pass-123"
+EPOCH = datetime(2024, 9, 1, tzinfo=dt_timezone.utc)
+
+_SIGNALS = (pre_save, post_save, pre_delete, post_delete, m2m_changed)
+
+
+@contextmanager
+def muted_signals():
+    saved = [(signal, signal.receivers) for signal in _SIGNALS]
+    for signal, _ in saved:
+        signal.receivers = []
+        signal.sender_receivers_cache.clear()
+    try:
+        yield
+    finally:
+        for signal, receivers in saved:
+            signal.receivers = receivers
+            signal.sender_receivers_cache.clear()
+
+
+def _batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+class DatabaseWriter:
+    def __init__(self, batch_size=2000):
+        self.batch_size = batch_size
+        self.models = []
+
+    def first_id(self, model):
+        return (model.objects.aggregate(m=Max("pk"))["m"] or 0) + 1
+
+    def write(self, model, rows):
+        if model not in self.models:
+            self.models.append(model)
+        total = 0
+        for batch in _batched(rows, self.batch_size):
+            model.objects.bulk_create([model(**row) for row in batch], batch_size=self.batch_size)
+            total += len(batch)
+        return total
+
+    def close(self):
+        statements = connection.ops.sequence_reset_sql(no_style(), self.models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+class CopyWriter:
+    """
+    Writes one ``NN_<table>.sql`` file per table, numbered in dependency
+    order, plus ``zz_sequences.sql`` resetting the id sequences afterwards.
+    Load them in one transaction so deferred foreign keys are satisfied.
+    """
+
+    def __init__(self, directory, batch_size=2000):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.max_ids = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def first_id(self, model):
+        return 1
+
+    @staticmethod
+    def _format(value):
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, datetime):
+            return value.isoformat()
+        text = str(value)
+        return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+    def _values(self, model, fields, row):
+        obj = model(**row)
+        values = []
+        for field in fields:
+            value = getattr(obj, field.attname)
+            if value is None and (getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)):
+                value = timezone.now()
+            values.append(self._format(value))
+        return values
+
+    def write(self, model, rows):
+        table = model._meta.db_table
+        mode = "a" if table in self.max_ids else "w"
+        self.max_ids.setdefault(table, 0)
+        path = os.path.join(self.directory, f"{list(self.max_ids).index(table):02d}_{table}.sql")
+        total = 0
+        with open(path, mode) as fh:
+            for batch in _batched(rows, self.batch_size):
+                if total == 0:
+                    fields = [f for f in model._meta.concrete_fields if not f.primary_key or f.attname in batch[0]]
+                    columns = ", ".join(f'"{f.column}"' for f in fields)
+                    fh.write(f'COPY "{table}" ({columns}) FROM stdin;\n')
+                for row in batch:
+                    fh.write("\t".join(self._values(model, fields, row)) + "\n")
+                    if "id" in row:
+                        self.max_ids[table] = max(self.max_ids.get(table, 0), row["id"])
+                total += len(batch)
+            if total:
+                fh.write("\\.\n")
+        return total
+
+    def close(self):
+        with open(os.path.join(self.directory, "zz_sequences.sql"), "w") as fh:
+            for table, max_id in sorted(self.max_ids.items()):
+                if max_id:
+                    fh.write(f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), {max_id});\n")
+
+
+class Generator:
+    def __init__(self, writer, seed=0, password=DEFAULT_PASSWORD, **sizes):
+        self.writer = writer
+        self.password = password
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.sizes = sizes
+        self.counts = {}
+        self.students_by_course = {}
+        self.courses_by_student = {}
+        self.quizzes_by_course = {}
+
+    def _ids(self, model, n):
+        start = self.writer.first_id(model)
+        return range(start, start + n)
+
+    def _write(self, model, rows):
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + self.writer.write(model, rows)
+
+    def _timestamp(self, max_days=120):
+        return EPOCH + timedelta(seconds=self.rng.randrange(max_days * 86400))
+
+    def run(self):
+        with muted_signals():
+            self._people_and_catalogue()
+            self._enrollments()
+            self._quizzes()
+            self._attempts()
+            self.writer.close()
+        return self.counts
+
+    def _people_and_catalogue(self):
+        s, rng = self.sizes, self.rng
+        password = make_password(self.password)
+
+        session_id = self._ids(Session, 1)[0]
+        self._write(Session, [{"id": session_id, "name": f"Generated {self.seed}-{session_id}", "created_at": EPOCH}])
+        self.semester_id = self._ids(Semester, 1)[0]
+        self._write(Semester, [{"id": self.semester_id, "semester": "first", "session_id": session_id, "created_at": EPOCH}])
+        self.session_id = session_id
+
+        user_ids = self._ids(User, s["instructors"] + s["students"])
+        first_student = user_ids.start + s["instructors"]
+        self.instructor_ids = list(user_ids[: s["instructors"]])
+        self.student_ids = list(user_ids[s["instructors"]:])
+        self._write(User, (
+            {
+                "id": pk,
+                "username": (
+                    f"instructor_{self.seed}_{pk - user_ids.start}" if pk < first_student
+                    else f"student_{self.seed}_{pk - first_student}"
+                ),
+                "password": password,
+                "first_name": f"First{pk}",
+                "last_name": f"Last{pk}",
+                "email": f"user{pk}@example.com",
+                "role": User.Role.INSTRUCTOR if pk < first_student else User.Role.STUDENT,
+                "is_active": True,
+                "is_staff": False,
+                "is_superuser": False,
+                "date_joined": self._timestamp(365),
+            }
+            for pk in user_ids
+        ))
+
+        self.program_ids = list(self._ids(Program, s["programs"]))
+        self._write(Program, (
+            {"id": pk, "title": f"Program {self.seed}-{pk}", "summary": "Generated program"}
+            for pk in self.program_ids
+        ))
+        self._write(Student, (
+            {"id": pk, "user_id": user_id, "level": rng.choice(["Bachelor", "Master"]), "program_id": rng.choice(self.program_ids)}
+            for pk, user_id in zip(self._ids(Student, len(self.student_ids)), self.student_ids)
+        ))
+
+        self.course_ids = list(self._ids(Course, s["courses"]))
+        self._write(Course, (
+            {
+                "id": pk,
+                "slug": f"gen-{self.seed}-{pk}",
+                "title": f"Course {pk}",
+                "code": f"GEN-{self.seed}-{pk}",
+                "credit": rng.randint(1, 6),
+                "summary": "Generated course",
+                "program_id": rng.choice(self.program_ids),
+                "level": rng.choice(["bachelor", "master"]),
+                "year": rng.randint(1, 4),
+                "semester": rng.choice(["fall", "spring"]),
+                "is_elective": rng.random() < 0.3,
+                "instructor_id": rng.choice(self.instructor_ids),
+            }
+            for pk in self.course_ids
+        ))
+
+    def _enrollments(self):
+        """
+        Course popularity follows a Zipf-like curve, so a few courses have
+        very large rosters and most have small ones; each student takes a
+        normally distributed number of courses around the configured mean.
+        """
+        s, rng = self.sizes, self.rng
+        weights = list(accumulate(1.0 / math.pow(rank, 0.8) for rank in range(1, len(self.course_ids) + 1)))
+        popularity = self.course_ids[:]
+        rng.shuffle(popularity)
+
+        for student_id in self.student_ids:
+            wanted = max(1, min(len(popularity), int(rng.gauss(s["courses_per_student"], 1.5))))
+            picked = set()
+            while len(picked) < wanted:
+                picked.add(popularity[bisect_left(weights, rng.random() * weights[-1])])
+            self.courses_by_student[student_id] = sorted(picked)
+            for course_id in picked:
+                self.students_by_course.setdefault(course_id, []).append(student_id)
+
+        self._write(Course.students.through, (
+            {"course_id": course_id, "user_id": student_id}
+            for student_id, courses in self.courses_by_student.items()
+            for course_id in courses
+        ))
+
+        offering_ids = iter(self._ids(CourseOffering, len(self.course_ids) * s["offerings_per_course"]))
+        offerings = {
+            course_id: [next(offering_ids) for _ in range(s["offerings_per_course"])]
+            for course_id in self.course_ids
+        }
+        self._write(CourseOffering, (
+            {
+                "id": offering_id,
+                "course_id": course_id,
+                "session_id": self.session_id,
+                "semester_id": self.semester_id,
+                "instructor_id": rng.choice(self.instructor_ids),
+                "is_elective": False,
+                "capacity": None,
+                "created_at": EPOCH,
+            }
+            for course_id, ids in offerings.items()
+            for offering_id in ids
+        ))
+        self._write(CourseOffering.students.through, (
+            {"courseoffering_id": rng.choice(offerings[course_id]), "user_id": student_id}
+            for course_id, students in self.students_by_course.items()
+            for student_id in students
+        ))
+
+    def _quizzes(self):
+        s, rng = self.sizes, self.rng
+        quiz_ids = iter(self._ids(Quiz, len(self.course_ids) * s["quizzes_per_course"]))
+        quizzes = []
+        self.time_limits = {}
+        for course_id in self.course_ids:
+            for _ in range(s["quizzes_per_course"]):
+                quiz_id = next(quiz_ids)
+                quizzes.append((quiz_id, course_id))
+                self.time_limits[quiz_id] = rng.choice([None, 30, 60, 90])
+                self.quizzes_by_course.setdefault(course_id, []).append(quiz_id)
+        self._write(Quiz, (
+            {
+                "id": quiz_id,
+                "course_id": course_id,
+                "title": f"Quiz {quiz_id}",
+                "description": "Generated quiz",
+                "pass_mark": 50,
+                "time_limit": self.time_limits[quiz_id],
+                "created_at": created_at,
+                # published on creation: bulk writes bypass Quiz.save
+                "published_at": created_at,
+            }
+            for quiz_id, course_id in quizzes
+            for created_at in (self._timestamp(),)
+        ))
+
+        per_quiz, per_question = s["questions_per_quiz"], s["choices_per_question"]
+        self.first_question_id = self._ids(Question, 1)[0]
+        self.first_choice_id = self._ids(Choice, 1)[0]
+        self.quiz_index = {quiz_id: index for index, (quiz_id, _) in enumerate(quizzes)}
+        self.correct_choice = [rng.randrange(per_question) for _ in range(len(quizzes) * per_quiz)]
+        text = "Which of the following statements about this topic is correct? "
+
+        self._write(Question, (
+            {
+                "id": self.first_question_id + index * per_quiz + order,
+                "quiz_id": quiz_id,
+                "text": text * rng.randint(1, 4),
+                "order": order,
+                "type": Question.MULTIPLE_CHOICE,
+            }
+            for index, (quiz_id, _) in enumerate(quizzes)
+            for order in range(per_quiz)
+        ))
+        self._write(Choice, (
+            {
+                "id": self.first_choice_id + q * per_question + k,
+                "question_id": self.first_question_id + q,
+                "text": f"Option {k + 1}",
+                "is_correct": k == self.correct_choice[q],
+            }
+            for q in range(len(self.correct_choice))
+            for k in range(per_question)
+        ))
+
+    def _attempts(self):
+        """
+        Each enrolled student attempts a quiz with probability
+        ``attempt_rate``; a per-attempt ability drawn from Beta(5, 2) gives the
+        left-skewed score distribution typical of course quizzes.
+        """
+        s, rng = self.sizes, self.rng
+        per_quiz, per_question = s["questions_per_quiz"], s["choices_per_question"]
+        attempt_id = self._ids(QuizAttempt, 1)[0]
+        answer_id = self._ids(Answer, 1)[0]
+        attempts, answers = [], []
+
+        def flush():
+            self._write(QuizAttempt, attempts)
+            self._write(Answer, answers)
+            attempts.clear()
+            answers.clear()
+
+        for course_id, quiz_ids in self.quizzes_by_course.items():
+            for quiz_id in quiz_ids:
+                base = self.quiz_index[quiz_id] * per_quiz
+                time_limit = self.time_limits[quiz_id]
+                for student_id in self.students_by_course.get(course_id, ()):
+                    if rng.random() >= s["attempt_rate"]:
+                        continue
+                    started = self._timestamp()
+                    expires = started + timedelta(minutes=time_limit) if time_limit else None
+                    completed = rng.random() < 0.95
+                    ability = rng.betavariate(5, 2)
+                    correct = 0
+                    for q in range(base, base + per_quiz):
+                        if completed and rng.random() < 0.05:
+                            continue
+                        is_right = rng.random() < ability
+                        correct += is_right
+                        k = self.correct_choice[q]
+                        if not is_right:
+                            k = (k + rng.randrange(1, per_question)) % per_question
+                        answers.append({
+                            "id": answer_id,
+                            "attempt_id": attempt_id,
+                            "question_id": self.first_question_id + q,
+                            "selected_choice_id": self.first_choice_id + q * per_question + k,
+                        })
+                        answer_id += 1
+                    attempts.append({
+                        "id": attempt_id,
+                        "quiz_id": quiz_id,
+                        "user_id": student_id,
+                        "attempt_number": 1,
+                        "started_at": started,
+                        "expires_at": expires,
+                        "completed_at": started + timedelta(minutes=rng.randint(5, time_limit or 90)) if completed else None,
+                        "score": Decimal(str(score_percentage(correct, per_quiz))) if completed else None,
+                    })
+                    attempt_id += 1
+                    if len(answers) >= 50000:
+                        flush()
+        flush()
+
+
+def generate(writer, seed=0, password=DEFAULT_PASSWORD, **sizes):
+    generator = Generator(writer, seed=seed, password=password, **sizes)
+    if isinstance(writer, DatabaseWriter):
+        with transaction.atomic():
+            generator.run()
+    else:
+        generator.run()
+    return generator
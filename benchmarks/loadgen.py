@@ -0,0 +1,133 @@
+"""
+Scripted HTTP load generator for a running server.
+
+    python manage.py bench --seed-only --scale exam
+    python -m benchmarks.loadgen --base-url http://127.0.0.1:8000 --users 100 --duration 60
+
+Every virtual user logs in as ``student_<dataset seed>_<n>`` and loops over the
+exam-day script: list quizzes, retrieve one, start an attempt, answer it,
+complete it and check ``my_courses``. Latency percentiles, throughput and
+the query counts reported in ``Server-Timing`` are written as JSON in the
+same format as ``manage.py bench``.
+"""
+import argparse
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from . import BENCH_PASSWORD, runner
+
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def add(self, name, elapsed, response):
+        match = _QUERIES_RE.search(response.headers.get("Server-Timing", ""))
+        with self.lock:
+            timings, queries, errors = self.samples.setdefault(name, ([], [], [0]))
+            timings.append(elapsed)
+            if match:
+                queries.append(int(match.group(1)))
+            if response.status_code >= 400:
+                errors[0] += 1
+
+    def results(self, duration):
+        results = {}
+        for name, (timings, queries, errors) in sorted(self.samples.items()):
+            stats = runner.summarize(timings, queries, errors[0])
+            stats["throughput_rps"] = round(len(timings) / duration, 2)
+            results[name] = stats
+        return results
+
+
+class VirtualUser:
+    def __init__(self, base_url, username, recorder, rng):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.username = username
+        self.recorder = recorder
+        self.rng = rng
+
+    def call(self, name, method, path, **kwargs):
+        start = time.perf_counter()
+        response = self.session.request(method, self.base_url + path, timeout=30, **kwargs)
+        self.recorder.add(name, time.perf_counter() - start, response)
+        return response
+
+    def login(self):
+        response = self.call(
+            "token", "POST", "/api/token/", json={"username": self.username, "password": BENCH_PASSWORD}
+        )
+        response.raise_for_status()
+        self.session.headers["Authorization"] = "Bearer " + response.json()["access"]
+
+    def exam_script(self, answers_per_attempt):
+        quizzes = self.call("quiz_list", "GET", "/api/quizzes/").json()
+        if not quizzes:
+            return
+        quiz_id = self.rng.choice(quizzes)["id"]
+        quiz = self.call("quiz_retrieve", "GET", f"/api/quizzes/{quiz_id}/").json()
+        attempt = self.call("start_attempt", "POST", "/api/quizzes/attempts/", json={"quiz": quiz_id})
+        if attempt.status_code != 201:
+            return
+        attempt_id = attempt.json()["id"]
+        for question in quiz["questions"][:answers_per_attempt]:
+            payload = {"question": question["id"]}
+            if question["choices"]:
+                payload["selected_choice"] = self.rng.choice(question["choices"])["id"]
+            else:
+                payload["free_response"] = "Benchmark answer"
+            self.call("answer", "POST", f"/api/quizzes/attempts/{attempt_id}/answer/", json=payload)
+        self.call("complete", "POST", f"/api/quizzes/attempts/{attempt_id}/complete/", json={})
+        self.call("my_courses", "GET", "/api/courses/courses/my_courses/")
+
+
+def run(args):
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + args.duration
+
+    def worker(n):
+        username = f"student_{args.dataset_seed}_{n}"
+        user = VirtualUser(args.base_url, username, recorder, random.Random(args.seed + n))
+        user.login()
+        while time.monotonic() < deadline:
+            user.exam_script(args.answers)
+
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for future in [pool.submit(worker, n) for n in range(args.users)]:
+            future.result()
+    return recorder.results(time.monotonic() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run.")
+    parser.add_argument("--answers", type=int, default=20, help="Answers submitted per attempt.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dataset-seed", type=int, default=0, help="--seed given to manage.py bench --seed-only.")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    report = runner.build_report(results, mode="http", users=args.users, duration=args.duration)
+    output = Path(args.output or Path(__file__).parent / "results" / f"{report['meta']['commit']}-http.json")
+    runner.save_report(report, output)
+    for name, stats in results.items():
+        print(f"{name:15} p95 {stats['p95_ms']:8.2f}ms  {stats['throughput_rps']:8.1f} req/s  errors {stats['errors']}")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
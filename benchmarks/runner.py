@@ -0,0 +1,115 @@
+import json
+import math
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import django
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(timings, queries, errors):
+    ordered = sorted(timings)
+    total = sum(ordered)
+    return {
+        "iterations": len(ordered),
+        "errors": errors,
+        "mean_ms": round(total / len(ordered) * 1000, 3) if ordered else 0.0,
+        "min_ms": round(ordered[0] * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "throughput_rps": round(len(ordered) / total, 2) if total else 0.0,
+        "queries_mean": round(sum(queries) / len(queries), 2) if queries else 0.0,
+        "queries_max": max(queries) if queries else 0,
+    }
+
+
+def measure(fn, iterations=50, warmup=5):
+    """
+    Call ``fn`` ``warmup + iterations`` times and summarize the timed runs.
+    ``fn`` returns the response, or a list of responses for multi-request
+    scenarios; query counts are read from the ``query_stats`` the query
+    budget middleware attaches to each response. A scenario that needs fresh
+    state for each call sets ``fn.setup``: it is called untimed before each
+    run and its result is passed to ``fn``.
+    """
+    setup = getattr(fn, "setup", None)
+    for _ in range(warmup):
+        fn(*((setup(),) if setup else ()))
+    timings, queries, errors = [], [], 0
+    for _ in range(iterations):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        responses = fn(*args)
+        timings.append(time.perf_counter() - start)
+        if not isinstance(responses, list):
+            responses = [responses]
+        count = 0
+        for response in responses:
+            stats = getattr(response, "query_stats", None)
+            count += stats.count if stats is not None else 0
+            if response.status_code >= 400:
+                errors += 1
+        queries.append(count)
+    return summarize(timings, queries, errors)
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build_report(results, **meta):
+    return {
+        "meta": {
+            "commit": current_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            **meta,
+        },
+        "scenarios": results,
+    }
+
+
+def save_report(report, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+
+
+def compare(baseline, current, tolerance=0.2):
+    """
+    Return ``(lines, regressions)`` comparing two reports: a scenario
+    regresses when its p95 grows by more than ``tolerance`` or it issues
+    more queries than before.
+    """
+    lines, regressions = [], []
+    for name, now in sorted(current["scenarios"].items()):
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            lines.append(f"{name}: new scenario, p95 {now['p95_ms']}ms")
+            continue
+        delta = (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        line = (
+            f"{name}: p95 {before['p95_ms']}ms -> {now['p95_ms']}ms ({delta:+.0%}), "
+            f"queries {before['queries_max']} -> {now['queries_max']}"
+        )
+        if delta > tolerance or now["queries_max"] > before["queries_max"]:
+            regressions.append(name)
+            line += "  REGRESSION"
+        lines.append(line)
+    return lines, regressions
@@ -0,0 +1,149 @@
+"""
+In-process scenarios for the exam-day critical path. Each scenario is a
+factory taking ``(client_factory, users, data, rng)`` and returning a
+callable that performs one iteration: without arguments, or with the
+result of its ``setup`` attribute when each iteration needs fresh state
+that should not be timed (see ``runner.measure``).
+"""
+from django.urls import reverse
+
+from benchmarks import BENCH_PASSWORD
+from quizzes.models import Question
+
+
+def _next_user(users, rng):
+    return users[rng.randrange(len(users))]
+
+
+def _pick_quiz(user, data, rng):
+    courses = [c for c in data.courses_by_student[user.pk] if data.quizzes_by_course.get(c)]
+    return rng.choice(data.quizzes_by_course[rng.choice(courses)])
+
+
+_questions_by_quiz = {}
+
+
+def _questions(quiz_id):
+    if quiz_id not in _questions_by_quiz:
+        _questions_by_quiz[quiz_id] = list(
+            Question.objects.filter(quiz_id=quiz_id).order_by("order").values_list("pk", "choices__pk")
+        )
+    return _questions_by_quiz[quiz_id]
+
+
+def _answer_payloads(quiz_id):
+    seen, payloads = set(), []
+    for question_id, choice_id in _questions(quiz_id):
+        if question_id not in seen:
+            seen.add(question_id)
+            payloads.append({"question": question_id, "selected_choice": choice_id})
+    return payloads
+
+
+def start_attempt(client_factory, users, data, rng):
+    def run():
+        user = _next_user(users, rng)
+        client = client_factory(user)
+        return client.post(reverse("attempt-list"), {"quiz": _pick_quiz(user, data, rng)}, format="json")
+    return run
+
+
+def _open_attempt(client_factory, users, data, rng):
+    user = _next_user(users, rng)
+    client = client_factory(user)
+    quiz_id = _pick_quiz(user, data, rng)
+    response = client.post(reverse("attempt-list"), {"quiz": quiz_id}, format="json")
+    return client, response.json()["id"], quiz_id
+
+
+def answer(client_factory, users, data, rng):
+    client, attempt_id, quiz_id = _open_attempt(client_factory, users, data, rng)
+    payloads = _answer_payloads(quiz_id)
+    url = reverse("attempt-answer", args=[attempt_id])
+
+    def run():
+        return client.post(url, rng.choice(payloads), format="json")
+    return run
+
+
+def bulk_answer(client_factory, users, data, rng):
+    """
+    A full answer sheet for a fresh attempt. There is no batch answer
+    endpoint, so this posts every question through ``answer`` in turn.
+    """
+    def run(opened):
+        client, attempt_id, quiz_id = opened
+        url = reverse("attempt-answer", args=[attempt_id])
+        return [client.post(url, payload, format="json") for payload in _answer_payloads(quiz_id)]
+    run.setup = lambda: _open_attempt(client_factory, users, data, rng)
+    return run
+
+
+def complete(client_factory, users, data, rng):
+    def run(opened):
+        client, attempt_id, quiz_id = opened
+        url = reverse("attempt-answer", args=[attempt_id])
+        for payload in _answer_payloads(quiz_id)[:10]:
+            client.post(url, payload, format="json")
+        return client.post(reverse("attempt-complete", args=[attempt_id]), {}, format="json")
+    run.setup = lambda: _open_attempt(client_factory, users, data, rng)
+    return run
+
+
+def quiz_retrieve(client_factory, users, data, rng):
+    def run():
+        user = _next_user(users, rng)
+        return client_factory(user).get(reverse("quiz-detail", args=[_pick_quiz(user, data, rng)]))
+    return run
+
+
+def quiz_list(client_factory, users, data, rng):
+    def run():
+        return client_factory(_next_user(users, rng)).get(reverse("quiz-list"))
+    return run
+
+
+def attempt_list(client_factory, users, data, rng):
+    def run():
+        return client_factory(_next_user(users, rng)).get(reverse("attempt-list"))
+    return run
+
+
+def my_courses(client_factory, users, data, rng):
+    def run():
+        return client_factory(_next_user(users, rng)).get(reverse("course-my-courses"))
+    return run
+
+
+def enroll(client_factory, users, data, rng):
+    def run():
+        user = _next_user(users, rng)
+        enrolled = set(data.courses_by_student[user.pk])
+        course_id = rng.choice([c for c in data.course_ids if c not in enrolled] or data.course_ids)
+        return client_factory(user).post(reverse("course-enroll", args=[course_id]))
+    return run
+
+
+def login(client_factory, users, data, rng):
+    """
+    Password login through /api/token/. Runs single-threaded, so req/s is
+    login throughput per core for the configured PASSWORD_HASHER.
+    """
+    def run():
+        credentials = {"username": _next_user(users, rng).username, "password": BENCH_PASSWORD}
+        return client_factory(None).post(reverse("token_obtain_pair"), credentials, format="json")
+    return run
+
+
+SCENARIOS = {
+    "login": login,
+    "start_attempt": start_attempt,
+    "answer": answer,
+    "bulk_answer": bulk_answer,
+    "complete": complete,
+    "quiz_retrieve": quiz_retrieve,
+    "quiz_list": quiz_list,
+    "attempt_list": attempt_list,
+    "my_courses": my_courses,
+    "enroll": enroll,
+}
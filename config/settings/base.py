@@ -1,8 +1,12 @@
 # config/settings/base.py
 import os
+import tempfile
+from importlib.util import find_spec
 from pathlib import Path
 
 import environ
+from corsheaders.defaults import default_headers
+from django.core.exceptions import ImproperlyConfigured
 
 # ─── 1) Project base directory ────────────────────────────────────────────────
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -45,6 +49,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.DegradedModeMiddleware',
+    'core.middleware.QueryBudgetMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -89,6 +98,26 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = 'accounts.User'
 
+# PASSWORD_HASHER picks the algorithm new hashes use; the others stay listed
+# so existing hashes still verify and are upgraded on the next login.
+# argon2 needs ``argon2-cffi`` and bcrypt needs ``bcrypt``.
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'accounts.hashers.TunablePBKDF2PasswordHasher',
+    'argon2': 'accounts.hashers.TunableArgon2PasswordHasher',
+    'bcrypt': 'accounts.hashers.TunableBCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHER  = env('PASSWORD_HASHER', default='pbkdf2')
+if PASSWORD_HASHER not in _PASSWORD_HASHERS:
+    raise ImproperlyConfigured(f"PASSWORD_HASHER must be one of {', '.join(_PASSWORD_HASHERS)}")
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+PASSWORD_PBKDF2_ITERATIONS  = env.int('PASSWORD_PBKDF2_ITERATIONS', default=1_000_000)
+PASSWORD_ARGON2_TIME_COST   = env.int('PASSWORD_ARGON2_TIME_COST', default=2)
+PASSWORD_ARGON2_MEMORY_COST = env.int('PASSWORD_ARGON2_MEMORY_COST', default=102400)  # KiB
+PASSWORD_ARGON2_PARALLELISM = env.int('PASSWORD_ARGON2_PARALLELISM', default=8)
+PASSWORD_BCRYPT_ROUNDS      = env.int('PASSWORD_BCRYPT_ROUNDS', default=12)
+
 # ─── 8) Internationalization ──────────────────────────────────────────────────
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE     = 'UTC'
@@ -104,10 +133,163 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # ─── 11) DRF & CORS ────────────────────────────────────────────────────────────
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
+    # orjson-backed JSON; MessagePack for `Accept: application/msgpack`
+    # when the optional msgpack package is installed.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ] + (['core.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+    # Token buckets (core.throttling) for views with a ``throttle_scope``
+    # and for ?search= queries; see section 19.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.TokenBucketThrottle',
+        'core.throttling.SearchThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'login': '10/min',
+        'search': '30/min',
+        'attempts': '120/min',
+        'answer': '120/min',
+        'complete': '10/min',
+    },
+    # Reverse proxies in front of the app that append to X-Forwarded-For.
+    # Anonymous buckets are keyed on the client address; with 0 that is
+    # REMOTE_ADDR, since a client can put anything in X-Forwarded-For.
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=0),
 }
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
+
+# ─── 12) Query budgets ────────────────────────────────────────────────────────
+# Views may declare their own ``query_budget``; this applies to the rest.
+QUERY_BUDGET_DEFAULT       = env.int('QUERY_BUDGET_DEFAULT', default=50)
+QUERY_N_PLUS_ONE_THRESHOLD = env.int('QUERY_N_PLUS_ONE_THRESHOLD', default=5)
+QUERY_BUDGET_STRICT        = env.bool('QUERY_BUDGET_STRICT', default=False)
+
+# ─── 13) Metrics ──────────────────────────────────────────────────────────────
+# Set to a writable directory when running several worker processes so
+# /metrics/ aggregates all of them (wipe it on deploy).
+METRICS_MULTIPROC_DIR  = env('METRICS_MULTIPROC_DIR', default=None)
+METRICS_FLUSH_INTERVAL = env.float('METRICS_FLUSH_INTERVAL', default=1.0)
+# /metrics/ is served to these client addresses, and to requests carrying
+# `Authorization: Bearer <METRICS_TOKEN>` when a token is set.
+METRICS_ALLOWED_IPS    = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1', '::1'])
+METRICS_TOKEN          = env('METRICS_TOKEN', default='')
+
+# ─── 14) Caching ──────────────────────────────────────────────────────────────
+DASHBOARD_CACHE_TIMEOUT = env.int('DASHBOARD_CACHE_TIMEOUT', default=60)
+# Authenticated users are served from the cache for this long at most;
+# saves, role changes and (de)activation invalidate them immediately.
+AUTH_USER_CACHE_TIMEOUT = env.int('AUTH_USER_CACHE_TIMEOUT', default=30)
+# Anonymous GETs of the public catalogue and news (core.http_cache): server
+# side body cache lifetime (0 disables it) and the Cache-Control max-age.
+PUBLIC_CACHE_TIMEOUT = env.int('PUBLIC_CACHE_TIMEOUT', default=300)
+PUBLIC_CACHE_MAX_AGE = env.int('PUBLIC_CACHE_MAX_AGE', default=60)
+# Single-flight fills (core.singleflight): how long a rebuild may hold its
+# cross-process lease, and how long other callers wait for it before
+# rebuilding themselves.
+SINGLE_FLIGHT_LEASE = env.int('SINGLE_FLIGHT_LEASE', default=10)
+SINGLE_FLIGHT_WAIT  = env.float('SINGLE_FLIGHT_WAIT', default=5)
+# Quiz payloads and answer keys, and the current session/semester; all are
+# invalidated on save.
+QUIZ_CACHE_TIMEOUT         = env.int('QUIZ_CACHE_TIMEOUT', default=600)
+CURRENT_TERM_CACHE_TIMEOUT = env.int('CURRENT_TERM_CACHE_TIMEOUT', default=600)
+# publish_quizzes warms a scheduled quiz's caches this many seconds before
+# its opens_at.
+QUIZ_PREWARM_LEAD          = env.int('QUIZ_PREWARM_LEAD', default=300)
+# Production keeps the default cache in a memory-mapped file shared by the
+# workers of a host (core.shared_cache): SHARED_CACHE_SIZE bytes, split
+# between slot size classes; larger values are not cached.
+SHARED_CACHE_PATH       = env('SHARED_CACHE_PATH', default=str(Path(tempfile.gettempdir()) / 'openlearn-cache.mmap'))
+SHARED_CACHE_SIZE       = env.int('SHARED_CACHE_SIZE', default=64 * 1024 * 1024)
+SHARED_CACHE_SLOT_SIZES = env.list('SHARED_CACHE_SLOT_SIZES', cast=int, default=[256, 4096, 65536])
+# Token logins only write last_login when the stored value is older than this.
+LAST_LOGIN_UPDATE_INTERVAL = env.int('LAST_LOGIN_UPDATE_INTERVAL', default=3600)
+
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.ClaimsTokenObtainPairSerializer',
+    # the serializer above throttles last_login writes itself
+    'UPDATE_LAST_LOGIN': False,
+}
+
+# ─── 15) Response compression ─────────────────────────────────────────────────
+# brotli is used when the client accepts it and the optional ``brotli``
+# package is installed, gzip otherwise.
+RESPONSE_COMPRESSION_MIN_SIZE = env.int('RESPONSE_COMPRESSION_MIN_SIZE', default=1024)
+RESPONSE_BROTLI_QUALITY       = env.int('RESPONSE_BROTLI_QUALITY', default=4)
+
+# ─── 16) Read replicas ────────────────────────────────────────────────────────
+# Each URL becomes a ``replica_<n>`` alias (added in development.py and
+# production.py). Safe requests to the views below read from a random
+# replica unless the user wrote something in the last REPLICA_STICKY_SECONDS.
+# Entries are ``ViewSet`` (every action) or ``ViewSet.action``.
+REPLICA_DATABASE_URLS  = env.list('REPLICA_DATABASE_URLS', default=[])
+REPLICA_DATABASES      = []
+REPLICA_STICKY_SECONDS = env.int('REPLICA_STICKY_SECONDS', default=5)
+REPLICA_ROUTED_VIEWS   = [
+    'CourseViewSet.list',
+    'CourseViewSet.retrieve',
+    'NewsAndEventsViewSet',
+    'QuizViewSet',
+    'ActivityLogViewSet',
+]
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+
+# ─── 17) Idempotency keys ─────────────────────────────────────────────────────
+# Responses to requests with an Idempotency-Key header (core.idempotency) are
+# replayed for this long; a first request that has not finished after
+# IDEMPOTENCY_LOCK_SECONDS is assumed dead and its key can be reused.
+IDEMPOTENCY_TTL          = env.int('IDEMPOTENCY_TTL', default=86400)
+IDEMPOTENCY_LOCK_SECONDS = env.int('IDEMPOTENCY_LOCK_SECONDS', default=60)
+
+# ─── 18) Background tasks ─────────────────────────────────────────────────────
+# Queued in the database (core.tasks) and run by ``manage.py run_tasks``.
+# TASKS_EAGER runs them in-process after commit instead, for development
+# without a worker. Failed tasks are retried after TASK_RETRY_BACKOFF *
+# 2^(attempt-1) seconds, capped at TASK_RETRY_BACKOFF_MAX; a claimed task
+# whose worker disappears is retried after TASK_LEASE_SECONDS.
+TASKS_EAGER             = env.bool('TASKS_EAGER', default=False)
+TASK_MAX_ATTEMPTS       = env.int('TASK_MAX_ATTEMPTS', default=5)
+TASK_RETRY_BACKOFF      = env.int('TASK_RETRY_BACKOFF', default=10)
+TASK_RETRY_BACKOFF_MAX  = env.int('TASK_RETRY_BACKOFF_MAX', default=3600)
+TASK_LEASE_SECONDS      = env.int('TASK_LEASE_SECONDS', default=300)
+
+# ─── 19) Throttling ───────────────────────────────────────────────────────────
+# Token buckets are kept in a SQLite database shared by the workers of one
+# host, so point THROTTLE_STORE_PATH at local disk (not NFS); each host
+# throttles on its own.
+THROTTLE_ENABLED    = env.bool('THROTTLE_ENABLED', default=True)
+THROTTLE_STORE_PATH = env('THROTTLE_STORE_PATH', default=str(Path(tempfile.gettempdir()) / 'openlearn-throttle.sqlite3'))
+# Tests run with throttling off (see core.test_runner).
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+# ─── 20) Degraded mode ────────────────────────────────────────────────────────
+# The database circuit breaker (core.degrade) trips when the moving average
+# of per-request mean query time exceeds DEGRADE_DB_LATENCY seconds. Cached
+# reads then serve their last known value, kept for DEGRADE_STALE_TIMEOUT,
+# and other reads are refused for DEGRADE_OPEN_SECONDS before probing again.
+DEGRADE_DB_LATENCY    = env.float('DEGRADE_DB_LATENCY', default=0.25)
+DEGRADE_OPEN_SECONDS  = env.int('DEGRADE_OPEN_SECONDS', default=30)
+DEGRADE_STALE_TIMEOUT = env.int('DEGRADE_STALE_TIMEOUT', default=86400)
+
+# ─── 21) Batch requests ───────────────────────────────────────────────────────
+# Most GET requests one POST /api/batch/ may carry (core.batch).
+BATCH_MAX_REQUESTS = env.int('BATCH_MAX_REQUESTS', default=20)
+
+# ─── 22) Delta sync ───────────────────────────────────────────────────────────
+# Rows per page of GET /api/sync/<resource>/ (core.sync); changes younger
+# than SYNC_SETTLE_SECONDS wait for the next call so late commits are not
+# skipped; deletions are remembered SYNC_TOMBSTONE_DAYS (prune_tombstones).
+SYNC_PAGE_SIZE = env.int('SYNC_PAGE_SIZE', default=500)
+SYNC_SETTLE_SECONDS = env.int('SYNC_SETTLE_SECONDS', default=5)
+SYNC_TOMBSTONE_DAYS = env.int('SYNC_TOMBSTONE_DAYS', default=30)
+
+# ─── 23) Activity feed ────────────────────────────────────────────────────────
+# Items per page of GET /api/feed/ (core.feed).
+FEED_PAGE_SIZE = env.int('FEED_PAGE_SIZE', default=20)
 
 
 
@@ -12,3 +12,10 @@ DATABASES = {
     )
 }
 
+# Read replicas. To try routing locally with SQLite, copy db.sqlite3 to
+# replica.sqlite3 and set REPLICA_DATABASE_URLS=sqlite:///replica.sqlite3;
+# responses carry an X-Read-Database header. Tests mirror replicas to the
+# default test database.
+for number, url in enumerate(REPLICA_DATABASE_URLS, 1):
+    DATABASES[f'replica_{number}'] = {**env.db_url_config(url), 'TEST': {'MIRROR': 'default'}}
+REPLICA_DATABASES = [alias for alias in DATABASES if alias.startswith('replica_')]
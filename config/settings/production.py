@@ -13,6 +13,59 @@ DATABASES = {
     )
 }
 
+# Connection reuse. Pick one of three modes:
+#
+#   persistent (default)  each worker keeps its connection for CONN_MAX_AGE
+#                         seconds and pings it before reuse (CONN_HEALTH_CHECKS).
+#   DB_POOL=True          psycopg 3 pool per process (Django 5.1+). Django
+#                         requires CONN_MAX_AGE=0 with it, which is forced here.
+#   DB_PGBOUNCER=True     connect through a local pgbouncer in transaction
+#                         pooling mode; server-side cursors and automatic
+#                         prepared statements are turned off because the
+#                         backend connection can change between transactions.
+#
+# `manage.py check` prints the effective settings (core.I001).
+DB_POOL      = env.bool('DB_POOL', default=False)
+DB_PGBOUNCER = env.bool('DB_PGBOUNCER', default=False)
+
+DATABASES['default']['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=60)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env.bool('CONN_HEALTH_CHECKS', default=True)
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    options = DATABASES['default'].setdefault('OPTIONS', {})
+    if DB_POOL:
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        options['pool'] = {
+            'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+            'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+            'timeout': env.float('DB_POOL_TIMEOUT', default=10.0),
+            'max_idle': env.float('DB_POOL_MAX_IDLE', default=600.0),
+            'max_lifetime': env.float('DB_POOL_MAX_LIFETIME', default=3600.0),
+        }
+    if DB_PGBOUNCER:
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+        options['prepare_threshold'] = None
+
+# Read replicas share the connection settings of default.
+for number, url in enumerate(REPLICA_DATABASE_URLS, 1):
+    replica = env.db_url_config(url)
+    replica['CONN_MAX_AGE'] = DATABASES['default']['CONN_MAX_AGE']
+    replica['CONN_HEALTH_CHECKS'] = DATABASES['default']['CONN_HEALTH_CHECKS']
+    replica['OPTIONS'] = {**replica.get('OPTIONS', {}), **DATABASES['default'].get('OPTIONS', {})}
+    DATABASES[f'replica_{number}'] = replica
+REPLICA_DATABASES = [alias for alias in DATABASES if alias.startswith('replica_')]
+
+# One cache for all workers of this host, so entries are built once and
+# invalidations reach every worker (see SHARED_CACHE_* in base).
+CACHES = {
+    'default': {
+        'BACKEND': 'core.shared_cache.SharedMemoryCache',
+        'LOCATION': SHARED_CACHE_PATH,
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_SIZE': SHARED_CACHE_SIZE, 'SLOT_SIZES': SHARED_CACHE_SLOT_SIZES},
+    }
+}
+
 # Fill ALLOWED_HOSTS from env or fallback to your real domain(s)
 ALLOWED_HOSTS = env.list('ALLOWED_HOSTS')
 
@@ -1,5 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
+from core.metrics import metrics_view
+from core.throttling import LoginThrottle
+from core.views import BatchView, DashboardView, FeedView, SyncView
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -11,7 +14,12 @@ urlpatterns = [
     path('api/courses/', include('courses.urls')),
     path('api/core/', include('core.api_urls')),
     path('api/quizzes/', include('quizzes.urls')),
+    path('api/dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('api/sync/<slug:resource>/', SyncView.as_view(), name='sync'),
+    path('api/feed/', FeedView.as_view(), name='feed'),
      # JWT Auth endpoints
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/token/', TokenObtainPairView.as_view(throttle_classes=[LoginThrottle]), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
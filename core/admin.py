@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from .models import NewsAndEvents, Session, Semester, ActivityLog
+from .models import NewsAndEvents, Session, Semester, ActivityLog, Task
 
 @admin.register(NewsAndEvents)
 class NewsAndEventsAdmin(admin.ModelAdmin):
@@ -62,4 +62,12 @@ class ActivityLogAdmin(admin.ModelAdmin):
 
     def truncated_message(self, obj):
         return obj.message[:100] + '...' if len(obj.message) > 100 else obj.message
-    truncated_message.short_description = _('Message')
\ No newline at end of file
+    truncated_message.short_description = _('Message')
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
+    ordering = ('-run_at',)
+    readonly_fields = ('created_at', 'finished_at', 'locked_by', 'locked_until', 'last_error')
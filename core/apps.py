@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        from . import checks, dashboard, http_cache, sync  # noqa: F401  system checks, cache invalidation and sync receivers
+
+        # register every app's background tasks
+        autodiscover_modules("tasks")
@@ -0,0 +1,48 @@
+"""
+Version counters for cache invalidation. Cached entries embed the current
+version of what they depend on in their key; bumping the version makes
+them unreachable and they simply expire.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _incr(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # no version yet, or it was evicted: a clock value cannot collide
+            # with a version that still has an entry cached under it
+            cache.set(key, time.time_ns(), None)
+
+
+def current_version(key):
+    """
+    The version stored under ``key``. A missing one (never bumped, or
+    evicted) is initialised from the clock rather than read as 0, so a
+    reader never gets back to a version that may still have entries cached
+    from before a bump.
+    """
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_versions(keys):
+    """
+    Bump each version key. Bumps again on commit when called inside a
+    transaction, so a request that read the old rows before commit cannot
+    leave them cached under the new version.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    _incr(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _incr(keys))
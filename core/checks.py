@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.checks import Info, Warning, register
+
+
+def describe_connection_reuse(alias, db):
+    pool = db.get("OPTIONS", {}).get("pool")
+    if pool:
+        if pool is True:
+            return f"{alias}: psycopg pool with default sizes"
+        sizes = ", ".join(f"{key}={value}" for key, value in sorted(pool.items()))
+        return f"{alias}: psycopg pool ({sizes})"
+    mode = "pgbouncer, " if db.get("DISABLE_SERVER_SIDE_CURSORS") else ""
+    max_age = db.get("CONN_MAX_AGE", 0)
+    if max_age is None:
+        lifetime = "unlimited"
+    elif max_age:
+        lifetime = f"CONN_MAX_AGE={max_age}s"
+    else:
+        lifetime = "new connection per request"
+    return f"{alias}: {mode}{lifetime}, health checks {'on' if db.get('CONN_HEALTH_CHECKS') else 'off'}"
+
+
+def database_connection_messages(databases, debug=False):
+    """Report how each Postgres alias reuses connections and flag settings that defeat it."""
+    messages = []
+    for alias, db in databases.items():
+        if db.get("ENGINE") != "django.db.backends.postgresql":
+            continue
+        messages.append(Info(describe_connection_reuse(alias, db), id="core.I001"))
+        pooled = bool(db.get("OPTIONS", {}).get("pool"))
+        if not pooled and db.get("CONN_MAX_AGE", 0) == 0 and not debug:
+            messages.append(
+                Warning(
+                    f"Database '{alias}' opens a new connection for every request.",
+                    hint="Set CONN_MAX_AGE, DB_POOL=True or DB_PGBOUNCER=True.",
+                    id="core.W001",
+                )
+            )
+        if db.get("CONN_MAX_AGE") and not db.get("CONN_HEALTH_CHECKS"):
+            messages.append(
+                Warning(
+                    f"Database '{alias}' keeps connections without health checks; "
+                    "a dropped connection fails the first request that reuses it.",
+                    hint="Set CONN_HEALTH_CHECKS=True.",
+                    id="core.W002",
+                )
+            )
+    return messages
+
+
+@register()
+def check_database_connections(app_configs, **kwargs):
+    return database_connection_messages(settings.DATABASES, debug=settings.DEBUG)
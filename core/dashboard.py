@@ -0,0 +1,93 @@
+"""
+Per-user dashboard: enrolled courses, open quizzes with the user's latest
+score, and the current session/semester, built with a fixed number of
+queries and cached per user until enrollment or an attempt changes.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from courses.models import Course
+from courses.serializers import FastEnrolledCourseSerializer
+from quizzes.models import Quiz, QuizAttempt
+from quizzes.signals import attempts_completed
+
+from . import metrics
+from .models import Semester, Session
+from .serializers import DashboardQuizSerializer, SemesterSerializer, SessionSerializer
+
+
+def dashboard_cache_key(user_id):
+    return f"dashboard:{user_id}"
+
+
+def build_dashboard(user):
+    courses = FastEnrolledCourseSerializer(Course.objects.filter(students=user).order_by("title")).data
+    latest = (
+        QuizAttempt.objects.filter(quiz=OuterRef("pk"), user=user, completed_at__isnull=False)
+        .order_by("-completed_at")
+    )
+    quizzes = (
+        Quiz.objects.open().filter(course_id__in=[course["id"] for course in courses])
+        .annotate(
+            latest_score=Subquery(latest.values("score")[:1]),
+            latest_completed_at=Subquery(latest.values("completed_at")[:1]),
+        )
+        .only("id", "title", "course_id", "time_limit", "pass_mark", "single_attempt", "created_at")
+    )
+    session = Session.objects.filter(is_current=True).first()
+    semester = Semester.objects.filter(is_current=True).first()
+    return {
+        "username": user.username,
+        "session": SessionSerializer(session).data if session else None,
+        "semester": SemesterSerializer(semester).data if semester else None,
+        "courses": courses,
+        "quizzes": DashboardQuizSerializer(quizzes, many=True).data,
+    }
+
+
+def get_dashboard(user):
+    key = dashboard_cache_key(user.pk)
+    data = cache.get(key)
+    metrics.record_cache_lookup("dashboard", hit=data is not None)
+    if data is None:
+        data = build_dashboard(user)
+        cache.set(key, data, getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 60))
+    return data
+
+
+def invalidate_dashboards(user_ids):
+    cache.delete_many([dashboard_cache_key(user_id) for user_id in user_ids])
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def enrollment_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action in ("post_add", "post_remove", "post_clear"):
+        invalidate_dashboards([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        invalidate_dashboards(pk_set)
+    elif action == "pre_clear" and not reverse:
+        # clear() does not report the removed users, read them beforehand
+        invalidate_dashboards(
+            Course.students.through.objects.filter(course_id=instance.pk).values_list("user_id", flat=True)
+        )
+
+
+@receiver(post_save, sender=QuizAttempt)
+def attempt_saved(sender, instance, **kwargs):
+    if instance.completed_at is not None and instance.user_id:
+        invalidate_dashboards([instance.user_id])
+
+
+@receiver(attempts_completed)
+def attempts_completed_in_bulk(sender, user_ids, **kwargs):
+    invalidate_dashboards(user_ids)
+
+
+@receiver(post_save, sender=Quiz)
+def quiz_saved(sender, instance, **kwargs):
+    invalidate_dashboards(
+        Course.students.through.objects.filter(course_id=instance.course_id).values_list("user_id", flat=True)
+    )
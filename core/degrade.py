@@ -0,0 +1,146 @@
+"""
+Degraded serving while the database is saturated.
+
+A circuit breaker watches database latency: ``DegradedModeMiddleware`` feeds
+it the mean query time of every request, and when the moving average
+crosses ``DEGRADE_DB_LATENCY`` (or a query fails with ``OperationalError``)
+it trips for all workers, through the shared cache. Its states:
+
+* closed: normal operation.
+* open, for ``DEGRADE_OPEN_SECONDS`` after tripping: cached reads (filled
+  through ``core.singleflight.get_or_build`` with a ``stale_key``, and
+  ``core.http_cache``) answer with their last known value instead of
+  rebuilding, and safe requests to views that are not
+  ``available_when_degraded`` get ``503`` with ``Retry-After``, leaving the
+  remaining database capacity to writes such as answers.
+* half-open, afterwards: nothing is refused and cached reads still answer
+  stale, except that one request per entry (the one taking its refresh
+  lease) rebuilds it. Those requests are the breaker's probes: it closes
+  once the average is back under the threshold and trips again otherwise.
+
+Responses that used a stale value carry ``Warning: 110`` and ``Age``.
+"""
+import contextvars
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError
+from django.http import JsonResponse
+
+from . import metrics
+from .utils import view_label
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+STATE_KEY = "db-breaker:opened-at"
+SMOOTHING = 0.2
+# seconds a worker reuses the breaker state it read from the cache
+STATE_TTL = 1.0
+
+_average = 0.0
+_state = (0.0, None)
+_stale_since = contextvars.ContextVar("stale_since", default=None)
+
+
+def _threshold():
+    return getattr(settings, "DEGRADE_DB_LATENCY", 0.25)
+
+
+def _opened_at():
+    global _state
+    checked_at, opened_at = _state
+    now = time.monotonic()
+    if now - checked_at >= STATE_TTL:
+        opened_at = cache.get(STATE_KEY)
+        _state = (now, opened_at)
+    return opened_at
+
+
+def state():
+    opened_at = _opened_at()
+    if opened_at is None:
+        return CLOSED
+    if time.time() - opened_at < getattr(settings, "DEGRADE_OPEN_SECONDS", 30):
+        return OPEN
+    return HALF_OPEN
+
+
+def trip():
+    global _state
+    opened_at = time.time()
+    cache.set(STATE_KEY, opened_at, None)
+    _state = (time.monotonic(), opened_at)
+    metrics.BREAKER_TRIPS.inc()
+
+
+def reset():
+    global _average, _state
+    cache.delete(STATE_KEY)
+    _average = 0.0
+    _state = (time.monotonic(), None)
+
+
+def observe(query_latency):
+    """Feed the mean query time of a request; trips or closes the breaker."""
+    global _average
+    _average += SMOOTHING * (query_latency - _average)
+    current = state()
+    if _average > _threshold():
+        if current != OPEN:
+            trip()
+    elif current == HALF_OPEN:
+        reset()
+
+
+def observe_exception(exception):
+    if isinstance(exception, OperationalError) and state() != OPEN:
+        trip()
+
+
+def shed(request, view_func):
+    """A ``503`` response when the breaker is open and ``view_func`` cannot serve ``request``, else ``None``."""
+    if request.method not in ("GET", "HEAD", "OPTIONS") or state() != OPEN:
+        return None
+    if getattr(getattr(view_func, "cls", view_func), "available_when_degraded", False):
+        return None
+    metrics.SHED_REQUESTS.inc(view=view_label(view_func, request.method))
+    response = JsonResponse({"detail": "The service is under heavy load; please retry shortly."}, status=503)
+    response["Retry-After"] = str(getattr(settings, "DEGRADE_OPEN_SECONDS", 30))
+    return response
+
+
+def serve_stale(stale_key):
+    """
+    The last known value stored under ``stale_key`` when the breaker is not
+    closed, or ``None`` when the caller should build the value itself.
+    """
+    current = state()
+    if current == CLOSED:
+        return None
+    stale = cache.get(stale_key)
+    if stale is None:
+        return None
+    if current == HALF_OPEN and cache.add(f"{stale_key}:refresh", 1, getattr(settings, "SINGLE_FLIGHT_LEASE", 10)):
+        return None
+    value, built_at = stale
+    since = _stale_since.get()
+    _stale_since.set(built_at if since is None else min(since, built_at))
+    return value
+
+
+def store_stale(stale_key, value):
+    cache.set(stale_key, (value, time.time()), getattr(settings, "DEGRADE_STALE_TIMEOUT", 86400))
+
+
+def begin_request():
+    return _stale_since.set(None)
+
+
+def end_request(token, response):
+    since = _stale_since.get()
+    _stale_since.reset(token)
+    if since is not None:
+        response["Warning"] = '110 - "Response is Stale"'
+        response["Age"] = str(max(0, int(time.time() - since)))
+    return response
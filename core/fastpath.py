@@ -0,0 +1,168 @@
+"""
+Fast read path for ``ModelSerializer`` output.
+
+``FastSerializer`` introspects an existing serializer once and compiles a
+function turning ``values_list()`` rows into the same dicts the serializer
+would produce, without instantiating models or walking DRF fields per
+object. Supported fields are model columns (including dotted sources and
+annotations), primary key relations, nested single serializers over
+forward foreign keys and nested ``many=True`` serializers over reverse
+foreign keys (one extra query per level, like ``prefetch_related``).
+Anything else, such as ``SerializerMethodField``, needs an entry in
+``FastSerializer.custom``.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+# to_representation() is a no-op on the values the database returns for these
+IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField)
+
+
+class _Plan:
+    def __init__(self, model):
+        self.model = model
+        self.columns = []
+        self.children = []  # (plan, fk_name, fk_attname)
+        self.namespace = {}
+        self.convert = None
+
+    def constant(self, value):
+        name = f"c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def column(self, lookup):
+        self.columns.append(lookup)
+        return f"row[{len(self.columns) - 1}]"
+
+    def serialize(self, rows):
+        rows = list(rows)
+        nested = []
+        if self.children:
+            parent_ids = [row[self.pk_index] for row in rows]
+            for child, fk_name, fk_attname in self.children:
+                child_rows = list(
+                    child.model._default_manager.filter(**{f"{fk_name}__in": parent_ids})
+                    .values_list(*child.columns, fk_attname)
+                )
+                grouped = defaultdict(list)
+                for row, data in zip(child_rows, child.serialize(child_rows)):
+                    grouped[row[-1]].append(data)
+                nested.append(grouped)
+        convert = self.convert
+        return [convert(row, nested) for row in rows]
+
+
+def _is_drf_field(field):
+    return type(field).__module__.startswith("rest_framework.")
+
+
+def _through_nullable_relation(model, source):
+    *relations, _ = source.split(".")
+    for name in relations:
+        field = model._meta.get_field(name)
+        if not field.many_to_one or field.null:
+            return True
+        model = field.related_model
+    return False
+
+
+def _compile_fields(plan, serializer, prefix, custom, path):
+    model = serializer.Meta.model
+    parts = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        key = f"{path}{name}"
+        if key in custom:
+            lookups, build = custom[key]
+            args = ", ".join(plan.column(f"{prefix}{lookup}") for lookup in lookups)
+            parts.append(f"{name!r}: {plan.constant(build)}({args})")
+            continue
+        if field.source == "*" or isinstance(field, serializers.SerializerMethodField):
+            raise ImproperlyConfigured(f"{key}: no column to read, declare it in FastSerializer.custom")
+        if _through_nullable_relation(model, field.source):
+            # DRF skips the key entirely when the relation is empty
+            raise ImproperlyConfigured(f"{key}: source crosses a nullable relation, declare it in FastSerializer.custom")
+        source = f"{prefix}{field.source.replace('.', '__')}"
+
+        if isinstance(field, serializers.ListSerializer) and isinstance(field.child, serializers.ModelSerializer):
+            if prefix:
+                raise ImproperlyConfigured(f"{key}: nested many serializers are only supported at the top level")
+            relation = model._meta.get_field(field.source)
+            if not relation.one_to_many:
+                raise ImproperlyConfigured(f"{key}: only reverse foreign keys can be nested with many=True")
+            child = _compile(field.child, custom, path=f"{key}.")
+            plan.children.append((child, relation.field.name, relation.field.attname))
+            parts.append(f"{name!r}: nested[{len(plan.children) - 1}].get(row[pk], [])")
+        elif isinstance(field, serializers.ModelSerializer):
+            pk = plan.column(f"{source}__pk")
+            inner = _compile_fields(plan, field, f"{source}__", custom, f"{key}.")
+            parts.append(f"{name!r}: None if {pk} is None else {{{inner}}}")
+        elif isinstance(field, serializers.RelatedField):
+            if not isinstance(field, serializers.PrimaryKeyRelatedField):
+                raise ImproperlyConfigured(f"{key}: only primary key relations are supported")
+            parts.append(f"{name!r}: {plan.column(source)}")
+        elif not _is_drf_field(field):
+            raise ImproperlyConfigured(f"{key}: custom field {type(field).__name__}, declare it in FastSerializer.custom")
+        elif type(field) in IDENTITY_FIELDS:
+            parts.append(f"{name!r}: {plan.column(source)}")
+        else:
+            value = plan.column(source)
+            # DRF never passes None to to_representation
+            parts.append(f"{name!r}: None if {value} is None else {plan.constant(field.to_representation)}({value})")
+    return ", ".join(parts)
+
+
+def _compile(serializer, custom, path=""):
+    plan = _Plan(serializer.Meta.model)
+    body = _compile_fields(plan, serializer, "", custom, path)
+    plan.pk_index = len(plan.columns)
+    plan.columns.append("pk")
+    source = f"def convert(row, nested, pk={plan.pk_index}):\n    return {{{body}}}\n"
+    exec(compile(source, f"<fastpath {type(serializer).__name__}>", "exec"), plan.namespace)
+    plan.convert = plan.namespace["convert"]
+    return plan
+
+
+class FastSerializer:
+    """
+    Read-only, values()-based stand-in for ``serializer_class``::
+
+        class FastQuizSerializer(FastSerializer):
+            serializer_class = QuizSerializer
+
+        FastQuizSerializer(queryset).data
+
+    ``custom`` maps a field path (``"program"``, ``"questions.choices"``) to
+    ``(lookups, build)``: the values are read with ``lookups`` relative to the
+    serializer's model and passed to ``build``.
+    """
+
+    serializer_class = None
+    custom = {}
+
+    _plans = {}
+
+    def __init__(self, queryset, many=True):
+        self.queryset = queryset
+        self.many = many
+
+    @classmethod
+    def plan(cls):
+        if cls not in FastSerializer._plans:
+            FastSerializer._plans[cls] = _compile(cls.serializer_class(), cls.custom)
+        return FastSerializer._plans[cls]
+
+    @property
+    def data(self):
+        plan = self.plan()
+        rows = self.queryset.prefetch_related(None).values_list(*plan.columns)
+        if not self.many:
+            rows = rows[:1]
+        result = plan.serialize(rows)
+        if self.many:
+            return result
+        return result[0] if result else None
@@ -0,0 +1,103 @@
+"""
+Per-student activity feed (``GET /api/feed/?cursor=``): news and events,
+activity about the student's courses, quizzes published in them and the
+student's own completed attempts, newest first.
+
+Each source is read by one query bounded by the page size, in feed order
+through an index, and the sorted streams are combined by
+``merged_sorted_lists.merge_sorted_lists``: a page reads at most
+``page size × sources`` rows whatever the size of the tables, where a
+``UNION ALL`` would have the database sort all of them. Pages are chained by
+a keyset cursor on the last item's ``(at, source, id)``.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+
+from courses.models import Course
+from merged_sorted_lists import merge_sorted_lists
+from quizzes.models import Quiz, QuizAttempt
+
+from .models import ActivityLog, NewsAndEvents
+from .serializers import (
+    ActivityLogSerializer,
+    FeedAttemptSerializer,
+    FeedQuizSerializer,
+    NewsAndEventsSerializer,
+)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# (type, timestamp field, serializer); the position breaks ties between sources
+SOURCES = (
+    ("news", "created_at", NewsAndEventsSerializer),
+    ("activity", "created_at", ActivityLogSerializer),
+    ("quiz", "published_at", FeedQuizSerializer),
+    ("attempt", "completed_at", FeedAttemptSerializer),
+)
+RANKS = {name: rank for rank, (name, _, _) in enumerate(SOURCES)}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(at, source, pk):
+    raw = json.dumps([(at - EPOCH) // timedelta(microseconds=1), source, pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """The ``(at, rank, id)`` position encoded in ``cursor``."""
+    try:
+        micros, source, pk = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return EPOCH + timedelta(microseconds=int(micros)), RANKS[source], int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError, OverflowError):
+        raise InvalidCursor(cursor) from None
+
+
+def _querysets(user):
+    course_ids = list(Course.students.through.objects.filter(user=user).values_list("course_id", flat=True))
+    return (
+        NewsAndEvents.objects.all(),
+        ActivityLog.objects.filter(course_id__in=course_ids),
+        Quiz.objects.filter(course_id__in=course_ids, draft=False, published_at__isnull=False),
+        QuizAttempt.objects.filter(user=user, completed_at__isnull=False).select_related("quiz"),
+    )
+
+
+def _before(queryset, field, rank, position):
+    """Rows of source ``rank`` that come after ``position`` in the feed."""
+    at, cursor_rank, pk = position
+    if rank < cursor_rank:
+        return queryset.filter(**{f"{field}__lte": at})
+    if rank > cursor_rank:
+        return queryset.filter(**{f"{field}__lt": at})
+    return queryset.filter(Q(**{f"{field}__lt": at}) | Q(**{field: at, "pk__lt": pk}))
+
+
+def get_feed(user, cursor=None, limit=None):
+    limit = limit or getattr(settings, "FEED_PAGE_SIZE", 20)
+    position = decode_cursor(cursor) if cursor else None
+    streams = []
+    for rank, ((name, field, _), queryset) in enumerate(zip(SOURCES, _querysets(user))):
+        if position is not None:
+            queryset = _before(queryset, field, rank, position)
+        rows = queryset.order_by(f"-{field}", "-pk")[:limit + 1]
+        streams.append([(getattr(row, field), rank, row.pk, row) for row in rows])
+
+    items = list(merge_sorted_lists(streams, key=lambda item: item[:3], reverse=True, limit=limit + 1))
+    page = items[:limit]
+    results = [
+        {"type": SOURCES[rank][0], "id": pk, "at": at, "data": SOURCES[rank][2](row).data}
+        for at, rank, pk, row in page
+    ]
+    next_cursor = None
+    if len(items) > limit:
+        at, rank, pk, _ = page[-1]
+        next_cursor = encode_cursor(at, SOURCES[rank][0], pk)
+    return {"results": results, "next": next_cursor}
@@ -0,0 +1,176 @@
+"""
+Response cache for anonymous GETs of public endpoints.
+
+A viewset opts in with ``PublicCacheMixin`` and a ``public_cache_namespace``
+naming the content it serves. Each namespace has a content version kept in
+the cache: it is derived from the underlying tables (max id, row count and
+``updated_at`` where there is one) the first time it is needed and bumped by
+save signals afterwards. Cached bodies and ETags embed that version, so a
+hit, including a ``304 Not Modified``, touches neither the view nor the
+database. Concurrent misses for the same page render it once (see
+``core.singleflight``), and while the database is saturated the last body
+rendered is served instead (see ``core.degrade``).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+
+from accounts.models import User
+from courses.models import Course, Program
+
+from . import degrade, metrics
+from .cache_versions import bump_versions
+from .models import NewsAndEvents
+from .singleflight import Flight
+
+
+def _table_state(queryset, *fields):
+    aggregates = {"count": Count("pk"), "max_id": Max("pk")}
+    aggregates.update({f"max_{field}": Max(field) for field in fields})
+    return queryset.order_by().aggregate(**aggregates)
+
+
+NAMESPACES = {
+    "courses": lambda: [
+        _table_state(Course.objects.all()),
+        _table_state(Program.objects.all()),
+        _table_state(Course.students.through.objects.all()),
+    ],
+    "news": lambda: [_table_state(NewsAndEvents.objects.all(), "updated_at")],
+}
+
+
+def version_key(namespace):
+    return f"http-cache:version:{namespace}"
+
+
+def content_version(namespace):
+    version = cache.get(version_key(namespace))
+    if version is None:
+        state = repr(NAMESPACES[namespace]()).encode()
+        # an integer so bump_versions() can increment it
+        cache.add(version_key(namespace), int(hashlib.md5(state).hexdigest()[:15], 16), None)
+        version = cache.get(version_key(namespace))
+    return version
+
+
+def invalidate(*namespaces):
+    bump_versions(version_key(namespace) for namespace in namespaces)
+
+
+def _fingerprint(request):
+    raw = f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _is_cacheable(request):
+    return request.method in ("GET", "HEAD") and "HTTP_AUTHORIZATION" not in request.META
+
+
+def _finish(response, etag):
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=getattr(settings, "PUBLIC_CACHE_MAX_AGE", 60))
+    patch_vary_headers(response, ("Accept", "Authorization"))
+    return response
+
+
+class PublicCacheMixin:
+    """
+    Serves anonymous GETs for ``public_cache_actions`` from the response
+    cache, keyed by path, query string and Accept header.
+    """
+
+    public_cache_namespace = None
+    public_cache_actions = ("list", "retrieve")
+    available_when_degraded = True
+
+    def dispatch(self, request, *args, **kwargs):
+        action = getattr(self, "action_map", {}).get(request.method.lower())
+        timeout = getattr(settings, "PUBLIC_CACHE_TIMEOUT", 300)
+        if not timeout or action not in self.public_cache_actions or not _is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        version = content_version(self.public_cache_namespace)
+        fingerprint = _fingerprint(request)
+        etag = f'"{self.public_cache_namespace}-{version}-{fingerprint[:16]}"'
+        # weak comparison: compression marks the ETag as weak
+        if etag in {tag.removeprefix("W/") for tag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))}:
+            metrics.record_cache_lookup("public_http", hit=True)
+            return _finish(HttpResponseNotModified(), etag)
+
+        key = f"http-cache:{self.public_cache_namespace}:{version}:{fingerprint}"
+        cached = cache.get(key)
+        metrics.record_cache_lookup("public_http", hit=cached is not None)
+        if cached is not None:
+            content, content_type = cached
+            return _finish(HttpResponse(content, content_type=content_type), etag)
+
+        stale_key = f"http-cache:{self.public_cache_namespace}:stale:{fingerprint}"
+        stale = degrade.serve_stale(stale_key)
+        if stale is not None:
+            content, content_type = stale
+            # no ETag: it would validate the stale body against the current version
+            return HttpResponse(content, content_type=content_type)
+
+        # a cold page is rendered once while concurrent requests for it wait
+        with Flight(key, "public_http") as flight:
+            if not flight.leader:
+                content, content_type = flight.value
+                return _finish(HttpResponse(content, content_type=content_type), etag)
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            response.render()
+            cache.set(key, (response.content, response["Content-Type"]), timeout)
+            degrade.store_stale(stale_key, (response.content, response["Content-Type"]))
+        return _finish(response, etag)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Program)
+@receiver(post_delete, sender=Program)
+def catalogue_changed(sender, **kwargs):
+    invalidate("courses")
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def catalogue_enrollment_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate("courses")
+
+
+# the user fields the course catalogue shows for instructors and rosters
+CATALOGUE_USER_FIELDS = ("username", "first_name", "last_name")
+
+
+@receiver(pre_save, sender=User)
+def catalogue_user_saving(sender, instance, update_fields=None, **kwargs):
+    fields = [f for f in CATALOGUE_USER_FIELDS if update_fields is None or f in update_fields]
+    if instance._state.adding or not fields:
+        instance._catalogue_names_changed = False
+        return
+    before = User.objects.filter(pk=instance.pk).values_list(*fields).first()
+    instance._catalogue_names_changed = before != tuple(getattr(instance, f) for f in fields)
+
+
+@receiver(post_save, sender=User)
+def catalogue_user_changed(sender, instance, created, **kwargs):
+    # a new user is on no course yet; password rehashes and logins change no name
+    if created or not instance.__dict__.pop("_catalogue_names_changed", False):
+        return
+    if Course.objects.filter(Q(instructor=instance) | Q(students=instance)).exists():
+        invalidate("courses")
+
+
+@receiver(post_save, sender=NewsAndEvents)
+@receiver(post_delete, sender=NewsAndEvents)
+def news_changed(sender, **kwargs):
+    invalidate("news")
@@ -0,0 +1,111 @@
+"""
+``Idempotency-Key`` support for mutating endpoints.
+
+A client retrying a request sends the same ``Idempotency-Key`` header. The
+first request with a key records itself as in flight, runs, and stores its
+response for ``IDEMPOTENCY_TTL`` seconds; later requests with the same key,
+user and endpoint get that response replayed (marked ``Idempotent-Replayed:
+true``) without running the view. A duplicate arriving while the first is
+still running gets ``409 Conflict`` with ``Retry-After``, and reusing a key
+with a different body gets ``422``. Server errors are not stored, so the
+request can be retried for real.
+"""
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = "HTTP_IDEMPOTENCY_KEY"
+
+
+def _request_hash(request):
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    return hashlib.md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _error(detail, status_code, **headers):
+    response = Response({"detail": detail}, status=status_code)
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+def _claim(request, key, endpoint, request_hash):
+    """The stored row for a duplicate, or None once this request owns the key."""
+    now = timezone.now()
+    lock_timeout = timedelta(seconds=getattr(settings, "IDEMPOTENCY_LOCK_SECONDS", 60))
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                IdempotencyKey.objects.create(
+                    user=request.user, key=key, endpoint=endpoint, request_hash=request_hash,
+                    expires_at=now + timedelta(seconds=getattr(settings, "IDEMPOTENCY_TTL", 86400)),
+                )
+            # keeps the table to the keys of the last TTL
+            IdempotencyKey.objects.filter(user=request.user, expires_at__lte=now).delete()
+            return None
+        except IntegrityError:
+            pass
+        existing = IdempotencyKey.objects.filter(user=request.user, key=key, endpoint=endpoint).first()
+        if existing is None:
+            continue
+        abandoned = existing.status_code is None and existing.created_at < now - lock_timeout
+        if existing.expires_at > now and not abandoned:
+            return existing
+        # expired, or its request died without finishing: start over
+        existing.delete()
+    return None
+
+
+def idempotent(view_method):
+    """Decorator for viewset actions; requests without the header run as usual."""
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.META.get(HEADER)
+        if not key or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > 255:
+            return _error("Idempotency-Key is too long.", status.HTTP_400_BAD_REQUEST)
+
+        endpoint = f"{type(self).__name__}.{self.action}:{request.path}"[:255]
+        request_hash = _request_hash(request)
+        stored = _claim(request, key, endpoint, request_hash)
+        if stored is not None:
+            if stored.request_hash != request_hash:
+                return _error(
+                    "Idempotency-Key was already used with a different request.",
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            if stored.status_code is None:
+                return _error(
+                    "A request with this Idempotency-Key is in progress.", status.HTTP_409_CONFLICT,
+                    **{"Retry-After": "1"},
+                )
+            response = Response(stored.response, status=stored.status_code)
+            response["Idempotent-Replayed"] = "true"
+            return response
+
+        stored = IdempotencyKey.objects.filter(user=request.user, key=key, endpoint=endpoint)
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except BaseException:
+            stored.delete()
+            raise
+        if response.status_code >= 500:
+            stored.delete()
+        else:
+            stored.update(status_code=response.status_code, response=response.data)
+        return response
+
+    return wrapper
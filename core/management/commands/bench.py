@@ -0,0 +1,96 @@
+import json
+import random
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+
+from benchmarks import BENCH_PASSWORD
+from benchmarks import data as bench_data
+from benchmarks import runner
+from benchmarks.scenarios import SCENARIOS
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Benchmark the exam-day critical path against a freshly seeded test database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(bench_data.SCALES), default="small")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--scenario", action="append", choices=sorted(SCENARIOS),
+            help="Run only these scenarios (repeatable).",
+        )
+        parser.add_argument("--output", help="Defaults to benchmarks/results/<commit>.json")
+        parser.add_argument("--compare", help="Earlier results file to compare against.")
+        parser.add_argument("--tolerance", type=float, default=0.2)
+        parser.add_argument("--fail-on-regression", action="store_true")
+        parser.add_argument(
+            "--seed-only", action="store_true",
+            help="Seed the configured database (for benchmarks.loadgen) and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed_only"]:
+            bench_data.seed(options["scale"], seed=options["seed"])
+            self.stdout.write(
+                f"Seeded '{options['scale']}' dataset; log in as student_{options['seed']}_<n> / {BENCH_PASSWORD}"
+            )
+            return
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            # the scenarios replay a few users far beyond any throttle rate
+            with override_settings(THROTTLE_ENABLED=False):
+                report = self.run_benchmarks(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = Path(options["output"] or Path(settings.BASE_DIR) / "benchmarks" / "results" / f"{report['meta']['commit']}.json")
+        runner.save_report(report, output)
+        self.stdout.write(f"Results written to {output}")
+
+        if options["compare"]:
+            with open(options["compare"]) as fh:
+                baseline = json.load(fh)
+            lines, regressions = runner.compare(baseline, report, options["tolerance"])
+            for line in lines:
+                self.stdout.write(line)
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"Regressions in: {', '.join(regressions)}")
+
+    def run_benchmarks(self, options):
+        rng = random.Random(options["seed"])
+        data = bench_data.seed(options["scale"], seed=options["seed"])
+        users = list(User.objects.filter(pk__in=rng.sample(data.student_ids, min(50, len(data.student_ids)))))
+
+        def client_factory(user):
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(user=user)
+            return client
+
+        results = {}
+        for name in options["scenario"] or SCENARIOS:
+            run = SCENARIOS[name](client_factory, users, data, rng)
+            results[name] = runner.measure(run, iterations=options["iterations"], warmup=options["warmup"])
+            stats = results[name]
+            self.stdout.write(
+                f"{name:15} p50 {stats['p50_ms']:8.2f}ms  p95 {stats['p95_ms']:8.2f}ms  "
+                f"{stats['throughput_rps']:8.1f} req/s  queries {stats['queries_mean']:6.1f}  errors {stats['errors']}"
+            )
+        return runner.build_report(
+            results, scale=options["scale"], seed=options["seed"], iterations=options["iterations"],
+            password_hasher=get_hasher().algorithm,
+        )
@@ -0,0 +1,29 @@
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from benchmarks import caches
+
+
+class Command(BaseCommand):
+    help = "Compare the shared-memory cache backend with locmem and the file-based cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000)
+        parser.add_argument("--payload-size", type=int, default=1024)
+        parser.add_argument("--keys", type=int, default=200)
+        parser.add_argument("--workers", type=int, default=4)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            for name, cache in caches.backends(directory).items():
+                results = caches.time_operations(cache, options["iterations"], options["payload_size"])
+                for operation, stats in results.items():
+                    self.stdout.write(
+                        f"{name:10} {operation:5} p50 {stats['p50_ms'] * 1000:8.1f}us  "
+                        f"p95 {stats['p95_ms'] * 1000:8.1f}us  {stats['throughput_rps']:10.0f} ops/s"
+                    )
+                builds = caches.count_builds(cache, options["keys"], options["workers"])
+                self.stdout.write(
+                    f"{name:10} {options['workers']} workers built {builds} values for {options['keys']} keys"
+                )
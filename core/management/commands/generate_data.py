@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from benchmarks import datagen
+
+SIZE_OPTIONS = (
+    ("students", int),
+    ("instructors", int),
+    ("programs", int),
+    ("courses", int),
+    ("offerings_per_course", int),
+    ("quizzes_per_course", int),
+    ("questions_per_quiz", int),
+    ("choices_per_question", int),
+    ("courses_per_student", int),
+    ("attempt_rate", float),
+)
+
+
+class Command(BaseCommand):
+    help = "Generate a reproducible synthetic dataset for scale testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--preset", choices=sorted(datagen.PRESETS), default="tiny")
+        for name, cast in SIZE_OPTIONS:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=cast, help="Overrides the preset.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--emit-copy",
+            metavar="DIR",
+            help="Write PostgreSQL COPY scripts to DIR instead of inserting into the database.",
+        )
+
+    def handle(self, *args, **options):
+        sizes = dict(datagen.PRESETS[options["preset"]])
+        sizes.update({name: options[name] for name, _ in SIZE_OPTIONS if options[name] is not None})
+
+        if options["emit_copy"]:
+            writer = datagen.CopyWriter(options["emit_copy"], batch_size=options["batch_size"])
+        else:
+            writer = datagen.DatabaseWriter(batch_size=options["batch_size"])
+
+        start = time.perf_counter()
+        generator = datagen.generate(writer, seed=options["seed"], **sizes)
+        elapsed = time.perf_counter() - start
+
+        for model, count in generator.counts.items():
+            self.stdout.write(f"{model:35} {count:>12,}")
+        self.stdout.write(f"{sum(generator.counts.values()):,} rows in {elapsed:.1f}s")
+        if options["emit_copy"]:
+            self.stdout.write(f"Load with: cat {options['emit_copy']}/*.sql | psql --single-transaction $DATABASE_URL")
+        self.stdout.write(f"Users log in as student_{options['seed']}_<n> / {datagen.DEFAULT_PASSWORD}")
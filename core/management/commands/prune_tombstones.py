@@ -0,0 +1,12 @@
+from core import sync
+from core.management.periodic import PeriodicCommand
+
+
+class Command(PeriodicCommand):
+    help = "Delete sync tombstones older than SYNC_TOMBSTONE_DAYS."
+    default_interval = 3600.0
+
+    def run_once(self, **options):
+        deleted = sync.prune_tombstones()
+        if deleted:
+            self.stdout.write(f"Pruned {deleted} tombstone(s).")
@@ -0,0 +1,44 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+from core import tasks
+from core.management.periodic import PeriodicCommand
+
+
+class Command(PeriodicCommand):
+    help = (
+        "Run queued background tasks. Start several processes for more "
+        "throughput; they never claim the same task."
+    )
+    default_interval = 1.0
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--batch-size", type=int, default=20)
+        parser.add_argument("--concurrency", type=int, default=4, help="Threads running tasks in this process.")
+
+    def handle(self, *args, **options):
+        self.token = uuid.uuid4().hex
+        if options["concurrency"] <= 1:
+            self.map = map
+            return super().handle(*args, **options)
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            self.map = pool.map
+            super().handle(*args, **options)
+
+    def run_once(self, **options):
+        claimed = tasks.claim(options["batch_size"], token=self.token)
+        results = list(self.map(self.run_task, claimed))
+        if results:
+            self.stdout.write(
+                ", ".join(f"{results.count(result)} {result}" for result in ("success", "retry", "failed"))
+            )
+        return len(claimed) == options["batch_size"]
+
+    def run_task(self, claimed):
+        try:
+            return tasks.run(claimed)
+        finally:
+            close_old_connections()
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class PeriodicCommand(BaseCommand):
+    """
+    Command running ``run_once()`` a single time or, with ``--loop``, every
+    ``--interval`` seconds until stopped. A truthy return value from
+    ``run_once()`` means more work is waiting and skips the sleep.
+    """
+
+    default_interval = 5.0
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and repeat every --interval seconds.",
+        )
+        parser.add_argument("--interval", type=float, default=self.default_interval)
+
+    def handle(self, *args, **options):
+        while True:
+            busy = self.run_once(**options)
+            if not options["loop"]:
+                break
+            if not busy:
+                time.sleep(options["interval"])
+
+    def run_once(self, **options):
+        raise NotImplementedError
@@ -0,0 +1,232 @@
+"""
+Minimal Prometheus-compatible metrics.
+
+Values live in process memory. When ``METRICS_MULTIPROC_DIR`` is set every
+worker also dumps its values to ``<dir>/<pid>.json`` and the ``/metrics/``
+view sums the files of all workers, so gunicorn deployments report one
+consistent set of series without any external service.
+
+The view answers clients in ``METRICS_ALLOWED_IPS`` (by ``REMOTE_ADDR``)
+and requests bearing ``Authorization: Bearer <METRICS_TOKEN>``; anyone else
+gets ``403``.
+"""
+import glob
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_metrics = {}
+_values = {}
+_last_flush = 0.0
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        _metrics[name] = self
+
+    def _key(self, labels):
+        return json.dumps([self.name, [str(labels[n]) for n in self.labelnames]])
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with _lock:
+            _values[key] = _values.get(key, 0) + amount
+        _maybe_flush()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with _lock:
+            state = _values.get(key)
+            if state is None:
+                state = _values[key] = [0] * len(self.buckets) + [0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += 1
+            state[-1] += value
+        _maybe_flush()
+
+
+def _multiproc_dir():
+    return getattr(settings, "METRICS_MULTIPROC_DIR", None)
+
+
+def _maybe_flush(force=False):
+    global _last_flush
+    directory = _multiproc_dir()
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - _last_flush < getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0):
+        return
+    _last_flush = now
+    with _lock:
+        payload = json.dumps(_values)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as fh:
+        fh.write(payload)
+    os.replace(tmp_path, os.path.join(directory, f"{os.getpid()}.json"))
+
+
+def collect():
+    """
+    Values of every series summed across all worker processes.
+    """
+    directory = _multiproc_dir()
+    if not directory:
+        with _lock:
+            return {key: list(value) if isinstance(value, list) else value for key, value in _values.items()}
+
+    _maybe_flush(force=True)
+    merged = {}
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            with open(path) as fh:
+                values = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        for key, value in values.items():
+            if key not in merged:
+                merged[key] = value
+            elif isinstance(value, list):
+                merged[key] = [a + b for a, b in zip(merged[key], value)]
+            else:
+                merged[key] += value
+    return merged
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def render_text():
+    series = {}
+    for key, value in collect().items():
+        name, labelvalues = json.loads(key)
+        series.setdefault(name, []).append((labelvalues, value))
+
+    lines = []
+    for name, metric in sorted(_metrics.items()):
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for labelvalues, value in sorted(series.get(name, []), key=lambda item: item[0]):
+            pairs = list(zip(metric.labelnames, labelvalues))
+            if metric.kind == "counter":
+                lines.append(f"{name}{_format_labels(pairs)} {value}")
+                continue
+            for bound, count in zip(metric.buckets, value):
+                lines.append(f"{name}_bucket{_format_labels(pairs + [('le', bound)])} {count}")
+            lines.append(f"{name}_bucket{_format_labels(pairs + [('le', '+Inf')])} {value[-2]}")
+            lines.append(f"{name}_count{_format_labels(pairs)} {value[-2]}")
+            lines.append(f"{name}_sum{_format_labels(pairs)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _values.clear()
+
+
+REQUESTS = Counter(
+    "openlearn_http_requests_total", "HTTP requests handled.", ("view", "method", "status")
+)
+ERRORS = Counter(
+    "openlearn_http_request_errors_total", "Requests that failed with a 5xx status.", ("view",)
+)
+LATENCY = Histogram(
+    "openlearn_http_request_duration_seconds", "Request latency.", ("view",)
+)
+DB_QUERIES = Histogram(
+    "openlearn_db_queries_per_request", "Database queries issued per request.", ("view",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+CACHE_LOOKUPS = Counter(
+    "openlearn_cache_lookups_total", "Application cache lookups by outcome.", ("cache", "result")
+)
+
+SINGLE_FLIGHT = Counter(
+    "openlearn_singleflight_total", "Single-flight cache fills by outcome (hit, miss, wait).", ("cache", "result")
+)
+
+TASKS = Counter(
+    "openlearn_tasks_total", "Background tasks run, by outcome (success, retry, failed).", ("task", "result")
+)
+TASK_DURATION = Histogram(
+    "openlearn_task_duration_seconds", "Background task run time.", ("task",)
+)
+
+SHARED_CACHE_EVICTIONS = Counter(
+    "openlearn_shared_cache_evictions_total", "Live entries evicted from the shared cache, by slot size.", ("slot",)
+)
+SHARED_CACHE_OVERSIZED = Counter(
+    "openlearn_shared_cache_oversized_total",
+    "Values not cached because they exceed the largest shared cache slot, by key class.",
+    ("key",),
+)
+
+BREAKER_TRIPS = Counter(
+    "openlearn_db_breaker_trips_total", "Times database latency tripped the circuit breaker into stale-only mode."
+)
+SHED_REQUESTS = Counter(
+    "openlearn_shed_requests_total", "Reads refused while the database circuit breaker was open.", ("view",)
+)
+
+THROTTLED = Counter(
+    "openlearn_throttled_total", "Requests refused by a throttle scope.", ("scope",)
+)
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_single_flight(cache, result):
+    SINGLE_FLIGHT.inc(cache=cache, result=result)
+
+
+def _may_scrape(request):
+    if request.META.get("REMOTE_ADDR") in getattr(settings, "METRICS_ALLOWED_IPS", ()):
+        return True
+    token = getattr(settings, "METRICS_TOKEN", "")
+    scheme, _, credentials = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+    return bool(token) and scheme.lower() == "bearer" and hmac.compare_digest(credentials.encode(), token.encode())
+
+
+def metrics_view(request):
+    if not _may_scrape(request):
+        return HttpResponseForbidden("Forbidden", content_type="text/plain")
+    return HttpResponse(render_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# monitoring keeps working while the database circuit breaker refuses reads
+metrics_view.available_when_degraded = True
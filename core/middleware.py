@@ -0,0 +1,281 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+from . import degrade, metrics, replicas
+from .utils import view_label
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST_RE = re.compile(r"\(\s*%s(?:\s*,\s*%s)+\s*\)")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryStats:
+    """
+    ``connection.execute_wrapper`` callable collecting query count, total
+    database time and how often each SQL shape was executed.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[_IN_LIST_RE.sub("(%s, ...)", sql)] += 1
+
+    def repeated(self, threshold):
+        return {sql: n for sql, n in self.shapes.items() if n >= threshold}
+
+
+def declared_budget(view_func, method):
+    """
+    Budget declared on a view through ``query_budget``: either an int or a
+    dict keyed by viewset action / lowercased HTTP method.
+    """
+    cls = getattr(view_func, "cls", None)
+    budget = getattr(cls, "query_budget", None)
+    if isinstance(budget, dict):
+        actions = getattr(view_func, "actions", None) or {}
+        key = actions.get(method.lower(), method.lower())
+        return budget.get(key)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts queries and DB time per request, reports them in a
+    ``Server-Timing`` header and logs requests that exceed their budget or
+    repeat the same SQL shape (N+1). With ``QUERY_BUDGET_STRICT`` enabled the
+    offending request raises ``QueryBudgetExceeded`` instead, which makes
+    tests fail.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        request.query_stats = stats
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        response.query_stats = stats
+        response["Server-Timing"] = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+        self.check_budget(request, stats)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget_label = view_label(view_func, request.method)
+        request.query_budget = declared_budget(view_func, request.method)
+
+    def check_budget(self, request, stats):
+        label = getattr(request, "query_budget_label", request.path)
+        budget = getattr(request, "query_budget", None)
+        if budget is None:
+            budget = getattr(settings, "QUERY_BUDGET_DEFAULT", None)
+        threshold = getattr(settings, "QUERY_N_PLUS_ONE_THRESHOLD", 5)
+
+        problems = []
+        if budget is not None and stats.count > budget:
+            problems.append(f"{stats.count} queries (budget {budget})")
+        for sql, n in stats.repeated(threshold).items():
+            problems.append(f"N+1 suspect, {n}x: {sql[:200]}")
+        if not problems:
+            return
+
+        message = f"{label} {request.method} {request.path}: " + "; ".join(problems)
+        if getattr(settings, "QUERY_BUDGET_STRICT", False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class MetricsMiddleware:
+    """
+    Records request count, latency, 5xx errors and per-request query counts
+    labelled by the view (``QuizAttemptViewSet.complete``). Should sit above
+    ``QueryBudgetMiddleware`` so query stats are available on the way out.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        label = getattr(request, "metrics_label", "unresolved")
+        metrics.REQUESTS.inc(view=label, method=request.method, status=response.status_code)
+        metrics.LATENCY.observe(elapsed, view=label)
+        if response.status_code >= 500:
+            metrics.ERRORS.inc(view=label)
+        stats = getattr(request, "query_stats", None)
+        if stats is not None:
+            metrics.DB_QUERIES.observe(stats.count, view=label)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics_label = view_label(view_func, request.method)
+
+
+class DegradedModeMiddleware:
+    """
+    Feeds each request's mean query time to the database circuit breaker
+    (``core.degrade``), refuses safe requests to views that are not
+    ``available_when_degraded`` while it is open, and marks responses built
+    from stale cache entries. Should sit above ``QueryBudgetMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = degrade.begin_request()
+        response = self.get_response(request)
+        stats = getattr(request, "query_stats", None)
+        if stats is not None and stats.count:
+            degrade.observe(stats.duration / stats.count)
+        return degrade.end_request(token, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        return degrade.shed(request, view_func)
+
+    def process_exception(self, request, exception):
+        degrade.observe_exception(exception)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serves safe requests for ``REPLICA_ROUTED_VIEWS`` from a replica (see
+    ``core.replicas``) and marks users sticky to ``default`` after a
+    successful write.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with replicas.read_from(None):
+            response = self.get_response(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            user_id = replicas.request_user_id(request)
+            if user_id is not None:
+                replicas.mark_sticky(user_id)
+        if replicas.replica_aliases():
+            response["X-Read-Database"] = getattr(request, "read_database", None) or "default"
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        alias = replicas.choose_read_alias(request, view_label(view_func, request.method))
+        request.read_database = alias
+        replicas.set_read_alias(alias)
+
+
+def accepted_encodings(header):
+    """Content codings from an ``Accept-Encoding`` header that are not refused with q=0."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _brotli_stream(chunks, quality):
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in chunks:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compresses textual responses of at least ``RESPONSE_COMPRESSION_MIN_SIZE``
+    bytes, and all streaming ones, with brotli when the client accepts it and
+    the ``brotli`` package is installed, otherwise gzip.
+    """
+
+    compressible_types = ("application/json", "application/msgpack", "text/", "application/javascript")
+    # random gzip filename padding against BREACH, as django.middleware.gzip does
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header("Content-Encoding") or getattr(response, "is_async", False):
+            return response
+        if not response.get("Content-Type", "").startswith(self.compressible_types):
+            return response
+        if not response.streaming and len(response.content) < getattr(settings, "RESPONSE_COMPRESSION_MIN_SIZE", 1024):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        accepted = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            return response
+
+        quality = getattr(settings, "RESPONSE_BROTLI_QUALITY", 4)
+        if response.streaming:
+            if encoding == "br":
+                response.streaming_content = _brotli_stream(response.streaming_content, quality)
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, max_random_bytes=self.max_random_bytes,
+                )
+            del response.headers["Content-Length"]
+        else:
+            if encoding == "br":
+                compressed = brotli.compress(response.content, quality=quality)
+            else:
+                compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # the representation changed, so a strong ETag no longer matches it
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
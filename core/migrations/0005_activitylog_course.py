@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_tombstone'),
+        ('courses', '0003_sync_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='course',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='courses.course'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['course', '-created_at', '-id'], name='activity_feed_idx'),
+        ),
+    ]
@@ -1,9 +1,14 @@
 from django.db import models, transaction
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from functools import lru_cache
+
+from .cache_versions import bump_versions, current_version
+from .singleflight import get_or_build
 
 
 class PostType(models.TextChoices):
@@ -54,6 +59,7 @@ class NewsAndEvents(models.Model):
         indexes = [
             models.Index(fields=["posted_as"]),
             models.Index(fields=["-created_at"]),
+            models.Index(fields=["updated_at", "id"], name="news_sync_idx"),
         ]
         verbose_name = _("News / Event")
         verbose_name_plural = _("News / Events")
@@ -62,6 +68,20 @@ class NewsAndEvents(models.Model):
         return self.title or f"NewsAndEvents {self.pk}"
 
 
+def current_version_key(model):
+    return f"{model._meta.label_lower}:current:version"
+
+
+def cached_current(model):
+    """The current session/semester, shared through the cache until one is saved or deleted."""
+    key = f"{model._meta.label_lower}:current:{current_version(current_version_key(model))}"
+    timeout = getattr(settings, "CURRENT_TERM_CACHE_TIMEOUT", 600)
+    return get_or_build(
+        key, lambda: model.objects.filter(is_current=True).first(), timeout, "current_term",
+        stale_key=f"{model._meta.label_lower}:current:stale",
+    )
+
+
 class Session(models.Model):
     name = models.CharField(max_length=200, unique=True)
     is_current = models.BooleanField(default=False)
@@ -83,9 +103,8 @@ class Session(models.Model):
         super().save(*args, **kwargs)
 
     @classmethod
-    @lru_cache(maxsize=1)
     def get_current(cls):
-        return cls.objects.filter(is_current=True).first()
+        return cached_current(cls)
 
 
 class Semester(models.Model):
@@ -127,9 +146,16 @@ class Semester(models.Model):
         super().save(*args, **kwargs)
 
     @classmethod
-    @lru_cache(maxsize=1)
     def get_current(cls):
-        return cls.objects.filter(is_current=True).first()
+        return cached_current(cls)
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def current_term_changed(sender, **kwargs):
+    bump_versions([current_version_key(sender)])
 
 
 class ActivityLog(models.Model):
@@ -145,14 +171,104 @@ class ActivityLog(models.Model):
 
     message = models.TextField()
     level = models.CharField(max_length=10, choices=LEVEL_CHOICES, default=INFO)
+    # the course the entry is about, for students' feeds (core.feed); no
+    # constraint since the log outlives the course
+    course = models.ForeignKey(
+        "courses.Course", null=True, blank=True, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+",
+    )
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
         ordering = ("-created_at",)
-        indexes = [models.Index(fields=["-created_at"]), models.Index(fields=["level"])]
+        indexes = [
+            models.Index(fields=["-created_at"]),
+            models.Index(fields=["level"]),
+            models.Index(fields=["course", "-created_at", "-id"], name="activity_feed_idx"),
+        ]
 
     def __str__(self) -> str:
         ts = timezone.localtime(self.created_at).strftime("%Y-%m-%d %H:%M:%S") if self.created_at else ""
         return f"[{ts}] ({self.level.upper()}) {self.message[:200]}"
 
 
+
+
+class Task(models.Model):
+    """A unit of deferred work, run by ``manage.py run_tasks`` (see ``core.tasks``)."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, _("Pending")),
+        (RUNNING, _("Running")),
+        (DONE, _("Done")),
+        (FAILED, _("Failed")),
+    ]
+
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("run_at",)
+        indexes = [
+            models.Index(fields=["run_at"], name="task_pending_idx", condition=Q(status="pending")),
+            models.Index(fields=["locked_until"], name="task_running_idx", condition=Q(status="running")),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """First response to a request carrying an ``Idempotency-Key`` (see ``core.idempotency``)."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    key = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=32)
+    # both null while the first request is still running
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key", "endpoint"], name="idempotency_key_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.endpoint} {self.key}"
+
+
+class Tombstone(models.Model):
+    """
+    A deleted row of a model served by the delta sync API (see ``core.sync``),
+    or, with ``user``, a change of that user's enrollment in course
+    ``object_id``.
+    """
+
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.CASCADE, related_name="+",
+    )
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["model", "deleted_at", "id"], name="tombstone_sync_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.model} {self.object_id}"
@@ -0,0 +1,96 @@
+"""
+Read-replica routing. ``ReplicaRoutingMiddleware`` picks a replica for
+safe-method requests to the views listed in ``REPLICA_ROUTED_VIEWS`` and
+``ReplicaRouter`` sends that request's reads to it. Writes always go to
+``default``, and a user who just wrote reads from ``default`` for
+``REPLICA_STICKY_SECONDS`` so they see their own changes despite lag.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import AUTH_HEADER_TYPES
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+_read_alias = ContextVar("replica_read_alias", default=None)
+
+
+def replica_aliases():
+    return list(getattr(settings, "REPLICA_DATABASES", []))
+
+
+@contextmanager
+def read_from(alias):
+    """Route reads in the block to ``alias``; ``None`` means ``default``."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def set_read_alias(alias):
+    """Route the rest of the current ``read_from`` block to ``alias``."""
+    _read_alias.set(alias)
+
+
+def is_routed(label):
+    """``label`` is ``ViewSet.action``; settings list either that or the whole viewset."""
+    routed = getattr(settings, "REPLICA_ROUTED_VIEWS", ())
+    return label in routed or label.split(".", 1)[0] in routed
+
+
+def sticky_key(user_id):
+    return f"replica:sticky:{user_id}"
+
+
+def mark_sticky(user_id):
+    cache.set(sticky_key(user_id), True, getattr(settings, "REPLICA_STICKY_SECONDS", 5))
+
+
+def is_sticky(user_id):
+    return user_id is not None and cache.get(sticky_key(user_id)) is not None
+
+
+def request_user_id(request):
+    """
+    User id from the bearer token, without verifying it. Only used to pick
+    a database; authentication still verifies the token in the view.
+    """
+    header = request.META.get("HTTP_AUTHORIZATION", "").split()
+    if len(header) != 2 or header[0] not in AUTH_HEADER_TYPES:
+        return None
+    try:
+        return AccessToken(header[1], verify=False).get(api_settings.USER_ID_CLAIM)
+    except TokenError:
+        return None
+
+
+def choose_read_alias(request, label):
+    replicas = replica_aliases()
+    if not replicas or request.method not in ("GET", "HEAD", "OPTIONS") or not is_routed(label):
+        return None
+    if is_sticky(request_user_id(request)):
+        return None
+    return random.choice(replicas)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # explicit, otherwise Django would write instances back to the
+        # replica they were read from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
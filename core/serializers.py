@@ -1,4 +1,7 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
+from quizzes.models import Quiz, QuizAttempt
 from .models import NewsAndEvents, Session, Semester, ActivityLog
 
 class NewsAndEventsSerializer(serializers.ModelSerializer):
@@ -48,5 +51,54 @@ class SemesterSerializer(serializers.ModelSerializer):
 class ActivityLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = ActivityLog
-        fields = ['id', 'message', 'created_at']
-        read_only_fields = ['created_at']
\ No newline at end of file
+        fields = ['id', 'message', 'course', 'created_at']
+        read_only_fields = ['course', 'created_at']
+
+
+class DashboardQuizSerializer(serializers.ModelSerializer):
+    course = serializers.PrimaryKeyRelatedField(read_only=True)
+    latest_score = serializers.DecimalField(max_digits=6, decimal_places=2, read_only=True, allow_null=True)
+    latest_completed_at = serializers.DateTimeField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = Quiz
+        fields = ['id', 'title', 'course', 'time_limit', 'pass_mark', 'single_attempt', 'created_at', 'latest_score', 'latest_completed_at']
+
+
+class FeedQuizSerializer(serializers.ModelSerializer):
+    course = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta:
+        model = Quiz
+        fields = ['id', 'title', 'course', 'opens_at', 'closes_at', 'published_at']
+
+
+class FeedAttemptSerializer(serializers.ModelSerializer):
+    quiz = serializers.PrimaryKeyRelatedField(read_only=True)
+    quiz_title = serializers.CharField(source='quiz.title', read_only=True)
+
+    class Meta:
+        model = QuizAttempt
+        fields = ['id', 'quiz', 'quiz_title', 'attempt_number', 'score', 'completed_at']
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=["GET"], default="GET")
+    path = serializers.CharField(max_length=2000)
+
+    def validate_path(self, path):
+        if not path.startswith("/api/"):
+            raise serializers.ValidationError("Must be a path under /api/.")
+        if path.split("?", 1)[0] == reverse("batch"):
+            raise serializers.ValidationError("Batches cannot be nested.")
+        return path
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, requests):
+        limit = getattr(settings, "BATCH_MAX_REQUESTS", 20)
+        if len(requests) > limit:
+            raise serializers.ValidationError(f"At most {limit} requests per batch.")
+        return requests
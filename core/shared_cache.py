@@ -0,0 +1,287 @@
+"""
+Cache backend shared by the worker processes of one host.
+
+Entries live in a memory-mapped file (``LOCATION``) that every process maps,
+so a value built by one gunicorn worker is a hit in all the others and a
+delete or version bump is seen by all of them at once, without running a
+cache server. The file has a fixed size (``MAX_SIZE`` bytes) split evenly
+between size classes of ``SLOT_SIZES`` bytes. Within a class a key hashes to
+one set of ``WAYS`` slots and takes a free or expired slot there, else the
+set's least recently used one, so every operation touches a handful of
+slots. Values that do not fit the largest slot are not cached; they are
+counted in ``openlearn_shared_cache_oversized_total`` and logged once per
+key class, a sign that ``SLOT_SIZES`` needs a larger class.
+
+Each set is guarded by a thread lock and an ``fcntl`` byte-range lock, so
+``add`` and ``incr`` are atomic across threads and processes (single-flight
+leases and version counters rely on that). POSIX only.
+"""
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+STRIPES = 16
+_MAGIC = b"OLSHMC01"
+_FILE_HEADER_SIZE = 4096
+_LOCK_BASE = 1024  # byte-range lock offsets: 0 guards (re)initialisation, _LOCK_BASE + n stripe n
+# key digest, expires at, last used at, key length, value length
+_SLOT = struct.Struct("<16sddII")
+_NEVER = float("inf")
+
+_tables = {}
+_tables_lock = threading.Lock()
+_oversized_logged = set()
+
+
+class _Table:
+    def __init__(self, path, max_size, slot_sizes, ways):
+        self.ways = ways
+        self.classes = []  # (slot size, sets, offset)
+        offset = _FILE_HEADER_SIZE
+        share = max_size // len(slot_sizes)
+        for slot_size in sorted(slot_sizes):
+            # whole multiples of STRIPES, so keys sharing a set share a stripe lock
+            sets = max(STRIPES, share // (slot_size * ways) // STRIPES * STRIPES)
+            self.classes.append((slot_size, sets, offset))
+            offset += sets * ways * slot_size
+        self.size = offset
+        self.thread_locks = [threading.Lock() for _ in range(STRIPES)]
+
+        layout = _MAGIC + struct.pack(f"<QI{len(slot_sizes)}I", self.size, ways, *sorted(slot_sizes))
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, 0)
+        try:
+            if os.fstat(self.fd).st_size != self.size or os.pread(self.fd, len(layout), 0) != layout:
+                # new file, or one laid out by another configuration: start
+                # empty (workers still mapping the old layout must be restarted)
+                os.ftruncate(self.fd, 0)
+                os.ftruncate(self.fd, self.size)
+                os.pwrite(self.fd, layout, 0)
+            self.mm = mmap.mmap(self.fd, self.size)
+        finally:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, 0)
+
+    @contextmanager
+    def locked(self, stripe):
+        # lockf excludes other processes only, the thread lock the rest of this one
+        with self.thread_locks[stripe]:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, _LOCK_BASE + stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, _LOCK_BASE + stripe)
+
+    def slots(self, slot_size, sets, offset, h):
+        start = offset + (h % sets) * self.ways * slot_size
+        return range(start, start + self.ways * slot_size, slot_size)
+
+    def find(self, h, digest, key, now):
+        """Offset and header of ``key``'s live slot, or ``(None, None)``."""
+        mm = self.mm
+        for slot_size, sets, offset in self.classes:
+            for slot in self.slots(slot_size, sets, offset, h):
+                if mm[slot:slot + 16] != digest:
+                    continue
+                header = _SLOT.unpack_from(mm, slot)
+                if not header[3] or mm[slot + _SLOT.size:slot + _SLOT.size + header[3]] != key:
+                    continue
+                if header[1] <= now:
+                    self.free(slot)
+                    return None, None
+                return slot, header
+        return None, None
+
+    def free(self, slot):
+        self.mm[slot:slot + _SLOT.size] = bytes(_SLOT.size)
+
+    def value(self, slot, header):
+        start = slot + _SLOT.size + header[3]
+        return self.mm[start:start + header[4]]
+
+    def store(self, h, digest, key, value, expires, now):
+        """Write under the stripe lock, after the caller freed any old slot of ``key``."""
+        needed = _SLOT.size + len(key) + len(value)
+        for slot_size, sets, offset in self.classes:
+            if needed <= slot_size:
+                break
+        else:
+            return False
+        victim, oldest = None, _NEVER
+        for slot in self.slots(slot_size, sets, offset, h):
+            _, slot_expires, used, key_length, _ = _SLOT.unpack_from(self.mm, slot)
+            if not key_length or slot_expires <= now:
+                victim, oldest = slot, None
+                break
+            if used < oldest:
+                victim, oldest = slot, used
+        if oldest is not None:
+            metrics.SHARED_CACHE_EVICTIONS.inc(slot=str(slot_size))
+        start = victim + _SLOT.size
+        self.mm[start:start + len(key)] = key
+        self.mm[start + len(key):start + len(key) + len(value)] = value
+        _SLOT.pack_into(self.mm, victim, digest, expires, now, len(key), len(value))
+        return True
+
+    def clear(self):
+        for stripe in range(STRIPES):
+            with self.locked(stripe):
+                for slot_size, sets, offset in self.classes:
+                    for set_index in range(stripe, sets, STRIPES):
+                        for slot in self.slots(slot_size, sets, offset, set_index):
+                            self.free(slot)
+
+
+def key_class(key):
+    """``quiz:payload:12:3`` -> ``quiz:payload``: the key up to its first numeric part."""
+    parts = []
+    for part in str(key).split(":"):
+        if part.isdigit():
+            break
+        parts.append(part)
+    return ":".join(parts)
+
+
+def _table(path, max_size, slot_sizes, ways):
+    # one mapping per file, layout and process, shared by the per-thread cache instances
+    ident = (path, max_size, slot_sizes, ways, os.getpid())
+    with _tables_lock:
+        table = _tables.get(ident)
+        if table is None:
+            table = _tables[ident] = _Table(path, max_size, slot_sizes, ways)
+        return table
+
+
+class SharedMemoryCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._location = location
+        self._max_size = options.get("MAX_SIZE", 64 * 1024 * 1024)
+        self._slot_sizes = tuple(options.get("SLOT_SIZES", (256, 4096, 65536)))
+        self._ways = options.get("WAYS", 8)
+        self._pid = None
+
+    @property
+    def _table(self):
+        if self._pid != os.getpid():
+            self._mapped = _table(self._location, self._max_size, self._slot_sizes, self._ways)
+            self._pid = os.getpid()
+        return self._mapped
+
+    def _locate(self, key, version):
+        # keys of any length and characters are fine here, so skip memcached's key checks
+        key = self.make_key(key, version=version).encode()
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h = int.from_bytes(digest[:8], "little")
+        return key, digest, h
+
+    def _expiry(self, timeout):
+        expires = self.get_backend_timeout(timeout)
+        return _NEVER if expires is None else expires
+
+    def get(self, key, default=None, version=None):
+        key, digest, h = self._locate(key, version)
+        table = self._table
+        now = time.time()
+        with table.locked(h % STRIPES):
+            slot, header = table.find(h, digest, key, now)
+            if slot is None:
+                return default
+            struct.pack_into("<d", table.mm, slot + 24, now)
+            data = table.value(slot, header)
+        return pickle.loads(data)
+
+    def _set(self, key, value, timeout, version, only_new):
+        name = key
+        key, digest, h = self._locate(key, version)
+        data = pickle.dumps(value, self.pickle_protocol)
+        expires = self._expiry(timeout)
+        table = self._table
+        now = time.time()
+        with table.locked(h % STRIPES):
+            slot, _ = table.find(h, digest, key, now)
+            if slot is not None:
+                if only_new:
+                    return False
+                table.free(slot)
+            if expires <= now:
+                return True
+            stored = table.store(h, digest, key, data, expires, now)
+        if not stored:
+            self._oversized(name, len(data))
+        return stored
+
+    def _oversized(self, key, size):
+        kind = key_class(key)
+        metrics.SHARED_CACHE_OVERSIZED.inc(key=kind)
+        if kind not in _oversized_logged:
+            _oversized_logged.add(kind)
+            logger.warning(
+                "Shared cache: a %s value of %d bytes does not fit the largest slot (%d bytes) and is not cached; "
+                "add a larger class to SHARED_CACHE_SLOT_SIZES.",
+                kind or key, size, max(self._slot_sizes),
+            )
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._set(key, value, timeout, version, only_new=False)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._set(key, value, timeout, version, only_new=True)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key, digest, h = self._locate(key, version)
+        table = self._table
+        with table.locked(h % STRIPES):
+            slot, _ = table.find(h, digest, key, time.time())
+            if slot is None:
+                return False
+            struct.pack_into("<d", table.mm, slot + 16, self._expiry(timeout))
+            return True
+
+    def delete(self, key, version=None):
+        key, digest, h = self._locate(key, version)
+        table = self._table
+        with table.locked(h % STRIPES):
+            slot, _ = table.find(h, digest, key, time.time())
+            if slot is None:
+                return False
+            table.free(slot)
+            return True
+
+    def has_key(self, key, version=None):
+        key, digest, h = self._locate(key, version)
+        table = self._table
+        with table.locked(h % STRIPES):
+            return table.find(h, digest, key, time.time())[0] is not None
+
+    def incr(self, key, delta=1, version=None):
+        name = key
+        key, digest, h = self._locate(key, version)
+        table = self._table
+        now = time.time()
+        with table.locked(h % STRIPES):
+            slot, header = table.find(h, digest, key, now)
+            if slot is None:
+                raise ValueError(f"Key '{name}' not found")
+            value = pickle.loads(table.value(slot, header)) + delta
+            table.free(slot)
+            table.store(h, digest, key, pickle.dumps(value, self.pickle_protocol), header[1], now)
+        return value
+
+    def clear(self):
+        self._table.clear()
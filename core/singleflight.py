@@ -0,0 +1,141 @@
+"""
+Single-flight cache fills.
+
+When a popular entry is missing (a quiz that just opened, an evicted
+catalogue page) every concurrent request would otherwise rebuild it with the
+same queries. ``get_or_build`` lets one caller rebuild it while the others
+wait for its result: threads of a process queue on a local lock, and
+processes coordinate through a short lease taken with ``cache.add``. A
+waiter that outlives ``SINGLE_FLIGHT_WAIT`` builds the value itself, and a
+crashed leader's lease simply expires after ``SINGLE_FLIGHT_LEASE``.
+
+Outcomes are counted in ``openlearn_singleflight_total``: ``hit`` (found in
+the cache), ``miss`` (this caller built it), ``wait`` (another caller
+built it while this one waited) and ``stale`` (an old value was served in
+degraded mode).
+"""
+import threading
+import time
+import uuid
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import degrade, metrics
+
+MISSING = object()
+POLL_INTERVAL = 0.05
+
+_locks = weakref.WeakValueDictionary()
+_locks_guard = threading.Lock()
+
+
+def _local_lock(key):
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = threading.Lock()
+        return lock
+
+
+def lookup(key, name):
+    """``cache.get`` that counts hits; returns ``MISSING`` on a miss."""
+    value = cache.get(key, MISSING)
+    if value is not MISSING:
+        metrics.record_single_flight(name, "hit")
+    return value
+
+
+class Flight:
+    """
+    Context manager around one cache fill. On entry either ``value`` holds
+    what another caller stored while this one waited, or ``leader`` is true
+    and the block is expected to build and store the value::
+
+        with Flight(key, "quiz") as f:
+            if not f.leader:
+                return f.value
+            value = build()
+            cache.set(key, value, timeout)
+    """
+
+    def __init__(self, key, name):
+        self.key = key
+        self.name = name
+        self.lease_key = f"{key}:lease"
+        self.value = MISSING
+        self.leader = False
+        self._token = None
+
+    def __enter__(self):
+        deadline = time.monotonic() + getattr(settings, "SINGLE_FLIGHT_WAIT", 5)
+        self._lock = _local_lock(self.key)
+        self._locked = self._lock.acquire(blocking=False)
+        waited = not self._locked
+        if waited:
+            # a stalled leader in this process holds no one past the deadline
+            self._locked = self._lock.acquire(timeout=max(0, deadline - time.monotonic()))
+        try:
+            self._join(waited, deadline)
+        except BaseException:
+            self._release()
+            raise
+        return self
+
+    def _join(self, waited, deadline):
+        lease = getattr(settings, "SINGLE_FLIGHT_LEASE", 10)
+        while True:
+            # filled by a thread that held the local lock, or by another process
+            value = cache.get(self.key, MISSING)
+            if value is not MISSING:
+                self.value = value
+                metrics.record_single_flight(self.name, "wait" if waited else "hit")
+                return
+            token = uuid.uuid4().hex
+            if cache.add(self.lease_key, token, lease):
+                self._token = token
+                break
+            if time.monotonic() >= deadline:
+                break
+            waited = True
+            time.sleep(POLL_INTERVAL)
+        self.leader = True
+        metrics.record_single_flight(self.name, "miss")
+
+    def __exit__(self, *exc_info):
+        try:
+            if self._token is not None and cache.get(self.lease_key) == self._token:
+                cache.delete(self.lease_key)
+        finally:
+            self._release()
+
+    def _release(self):
+        if self._locked:
+            self._locked = False
+            self._lock.release()
+
+
+def get_or_build(key, build, timeout, name, stale_key=None):
+    """
+    Cached value of ``key``, calling ``build()`` in at most one caller at a
+    time to fill it. With a ``stale_key`` (unversioned, unlike ``key``) the
+    last value built is kept there too and served instead of rebuilding
+    while the database circuit breaker is open (see ``core.degrade``).
+    """
+    value = lookup(key, name)
+    if value is not MISSING:
+        return value
+    if stale_key is not None:
+        value = degrade.serve_stale(stale_key)
+        if value is not None:
+            metrics.record_single_flight(name, "stale")
+            return value
+    with Flight(key, name) as f:
+        if not f.leader:
+            return f.value
+        value = build()
+        cache.set(key, value, timeout)
+        if stale_key is not None:
+            degrade.store_stale(stale_key, value)
+        return value
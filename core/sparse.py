@@ -0,0 +1,185 @@
+"""
+Sparse fieldsets: ``?fields=`` and ``?expand=`` on read requests.
+
+``?fields=id,title,instructor.username`` keeps only the listed fields, with
+dotted paths selecting inside nested serializers. ``?expand=`` names the
+nested relations to include: on its own it keeps every plain field plus the
+listed relations, and with ``?fields=`` it adds to the selection. Without
+either parameter responses are unchanged.
+
+``SparseFieldsMixin`` prunes the serializer and the queryset to match: joins
+come from the selected fields only and, when every selected field maps to a
+column, the query loads just those columns with ``only()``.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+
+def _split(value):
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _tree(paths):
+    """``["a", "b.c", "b.d"]`` -> ``{"a": None, "b": {"c": None, "d": None}}``; None means the whole field."""
+    grouped = {}
+    for path in paths:
+        head, _, rest = path.partition(".")
+        if not rest:
+            grouped[head] = None
+        elif grouped.get(head, []) is not None:
+            grouped.setdefault(head, []).append(rest)
+    return {name: None if rest is None else _tree(rest) for name, rest in grouped.items()}
+
+
+def _fields_of(serializer):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    return serializer.fields
+
+
+def _is_nested(field):
+    return isinstance(field, serializers.BaseSerializer)
+
+
+def requested_tree(query_params, serializer):
+    """Selection tree for ``serializer`` from the query string, or None to keep everything."""
+    fields = query_params.get("fields")
+    expand = query_params.get("expand")
+    if fields is None and expand is None:
+        return None
+    expanded = _split(expand or "")
+    if fields is not None:
+        return _tree(_split(fields) + expanded)
+    plain = [name for name, field in _fields_of(serializer).items() if not _is_nested(field)]
+    return _tree(plain + expanded)
+
+
+def prune_serializer(serializer, tree):
+    fields = _fields_of(serializer)
+    for name in list(fields):
+        if name not in tree:
+            fields.pop(name)
+        elif tree[name] and _is_nested(fields[name]):
+            prune_serializer(fields[name], tree[name])
+
+
+class _Opaque(Exception):
+    """A selected field reads something that cannot be mapped to columns."""
+
+
+class _Plan:
+    def __init__(self, annotations):
+        self.annotations = annotations
+        self.columns = set()
+        self.select = set()
+        self.prefetch = set()
+        self.columns_known = True
+
+    def walk(self, serializer, tree, model, prefix="", prefetched=False):
+        """
+        Collect what the selected fields of ``serializer`` read. Below a
+        many relation everything is fetched by ``prefetch_related`` and
+        column pruning stops.
+        """
+        for name, field in _fields_of(serializer).items():
+            if tree is not None and name not in tree:
+                continue
+            if field.source == "*" or isinstance(field, serializers.SerializerMethodField):
+                raise _Opaque(name)
+            self.walk_source(field, None if tree is None else tree[name], model, prefix, prefetched)
+
+    def walk_source(self, field, subtree, model, prefix, prefetched):
+        path = prefix
+        hops = field.source.split(".")
+        for position, attr in enumerate(hops):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                if not path and attr in self.annotations:
+                    return
+                # a property or method: it may read any column
+                raise _Opaque(attr)
+            path = f"{path}{attr}"
+            last = position == len(hops) - 1
+            # a primary key relation only reads the foreign key column
+            pk_only = (
+                last and model_field.concrete and (model_field.many_to_one or model_field.one_to_one)
+                and isinstance(field, serializers.PrimaryKeyRelatedField)
+            )
+            if not model_field.is_relation or pk_only:
+                if not prefetched:
+                    self.columns.add(path)
+                return
+            model = model_field.related_model
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetched = True
+            if prefetched:
+                self.prefetch.add(path)
+            else:
+                self.select.add(path)
+                if model_field.concrete:
+                    self.columns.add(path)
+                else:
+                    # reverse one-to-one, which only() cannot name
+                    self.columns_known = False
+            if last and _is_nested(field):
+                self.walk(field, subtree, model, f"{path}__", prefetched)
+            path = f"{path}__"
+
+
+def prune_queryset(queryset, serializer, tree):
+    """Drop joins the selection does not need and restrict columns when possible."""
+    if not isinstance(queryset, QuerySet) or not isinstance(serializer, serializers.ModelSerializer):
+        return queryset
+    plan = _Plan(set(queryset.query.annotations))
+    try:
+        plan.walk(serializer, tree, queryset.model)
+    except _Opaque:
+        return queryset
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if plan.select:
+        queryset = queryset.select_related(*sorted(plan.select))
+    if plan.prefetch:
+        queryset = queryset.prefetch_related(*sorted(plan.prefetch))
+    if plan.columns_known:
+        queryset = queryset.only(*sorted(plan.columns) or ["pk"])
+    return queryset
+
+
+class SparseFieldsMixin:
+    """
+    Viewset mixin applying ``?fields=`` and ``?expand=`` to GET and HEAD
+    requests; writes always use the full serializer. ``list`` and
+    ``retrieve`` prune their queryset in ``filter_queryset()``; custom
+    actions building their own queryset can pass it to ``sparse_queryset()``.
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    def sparse_tree(self):
+        request = getattr(self, "request", None)
+        if request is None or request.method not in ("GET", "HEAD"):
+            return None
+        if not hasattr(self, "_sparse_tree"):
+            self._sparse_tree = requested_tree(request.query_params, self.get_serializer_class()())
+        return self._sparse_tree
+
+    def sparse_queryset(self, queryset):
+        tree = self.sparse_tree()
+        if tree is None:
+            return queryset
+        return prune_queryset(queryset, self.get_serializer_class()(context=self.get_serializer_context()), tree)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        tree = self.sparse_tree()
+        if tree is not None:
+            prune_serializer(serializer, tree)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in self.sparse_actions:
+            queryset = self.sparse_queryset(queryset)
+        return queryset
@@ -0,0 +1,235 @@
+"""
+Delta sync for offline clients: ``GET /api/sync/<resource>/?since=<cursor>``.
+
+Changed rows are read in ``(updated_at, id)`` order after the cursor through
+an index on those columns, and deletions from ``Tombstone`` rows written by
+``post_delete`` receivers, so a sync costs in proportion to what changed
+since the cursor rather than to the size of the table. Each answer carries
+``changed`` (serialized rows), ``deleted`` (ids), the ``cursor`` for the next
+call and ``has_more`` when ``SYNC_PAGE_SIZE`` cut the page short.
+
+Rows the user can no longer see are reported as deleted: quizzes that are
+not open (drafts, and quizzes before ``opens_at`` or after ``closes_at``) and
+the quizzes and resources of a course the user left. Quizzes whose
+``opens_at`` or ``closes_at`` passed since the cursor are sent again, as
+that changes their visibility without a write, and so are the quizzes and
+resources of a course the user joined.
+
+Without ``since`` the client pages through the whole resource. Changes
+younger than ``SYNC_SETTLE_SECONDS`` are left for the next call, so a
+transaction that commits shortly after stamping ``updated_at`` is not
+skipped. Tombstones are kept ``SYNC_TOMBSTONE_DAYS`` (``prune_tombstones``);
+an older cursor gets ``410 Gone`` and the client starts over.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from courses.models import Course, CourseOffering, Resource
+from courses.serializers import CourseOfferingSerializer, CourseSyncSerializer, ResourceSerializer
+from quizzes.models import Choice, Question, Quiz
+from quizzes.serializers import QuizSyncSerializer
+
+from .models import NewsAndEvents, Tombstone
+from .serializers import NewsAndEventsSerializer
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+# Tombstone.model of the enrollment changes of a user (Tombstone.user)
+ENROLLMENT = "courses.enrollment"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorExpired(Exception):
+    pass
+
+
+class SyncResource:
+    def __init__(
+        self, model, serializer_class, enrolled=False, hidden=None, schedule=(), related=(), prefetch=(),
+    ):
+        self.model = model
+        self.serializer_class = serializer_class
+        # rows of the courses the user is enrolled in only
+        self.enrolled = enrolled
+        # hidden(row, now): rows the user may not see, reported as deleted
+        self.hidden = hidden
+        # datetime fields whose passing changes what ``hidden`` says
+        self.schedule = schedule
+        self.related = related
+        self.prefetch = prefetch
+
+    @property
+    def label(self):
+        return self.model._meta.label_lower
+
+    def queryset(self, user):
+        queryset = self.model.objects.select_related(*self.related).prefetch_related(*self.prefetch)
+        return queryset.filter(course__students=user) if self.enrolled else queryset
+
+
+RESOURCES = {
+    "courses": SyncResource(Course, CourseSyncSerializer, related=("instructor",)),
+    "offerings": SyncResource(CourseOffering, CourseOfferingSerializer),
+    "resources": SyncResource(Resource, ResourceSerializer, enrolled=True),
+    "quizzes": SyncResource(
+        Quiz, QuizSyncSerializer,
+        enrolled=True,
+        hidden=lambda quiz, now: not quiz.is_open(now),
+        schedule=("opens_at", "closes_at"),
+        prefetch=("questions__choices",),
+    ),
+    "news": SyncResource(NewsAndEvents, NewsAndEventsSerializer),
+}
+
+
+def _micros(moment):
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def encode_cursor(changed, deleted, scheduled):
+    raw = json.dumps([_micros(changed[0]), changed[1], _micros(deleted[0]), deleted[1], _micros(scheduled)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    The ``(changed_at, pk)`` and ``(deleted_at, pk)`` positions and the
+    ``scheduled`` time encoded in ``cursor``.
+    """
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        changed_us, changed_pk, deleted_us, deleted_pk, scheduled_us = (int(value) for value in raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor(cursor) from None
+    return (
+        (EPOCH + timedelta(microseconds=changed_us), changed_pk),
+        (EPOCH + timedelta(microseconds=deleted_us), deleted_pk),
+        EPOCH + timedelta(microseconds=scheduled_us),
+    )
+
+
+def _after(queryset, field, position):
+    at, pk = position
+    return queryset.filter(Q(**{f"{field}__gt": at}) | Q(**{field: at, "pk__gt": pk}))
+
+
+def _scheduled(resource, user, since, now):
+    """Rows whose schedule fields passed between ``since`` and ``now``."""
+    if not resource.schedule:
+        return []
+    window = Q()
+    for field in resource.schedule:
+        window |= Q(**{f"{field}__gt": since, f"{field}__lte": now})
+    return list(resource.queryset(user).filter(window))
+
+
+def changes(name, user, since=None):
+    resource = RESOURCES[name]
+    limit = getattr(settings, "SYNC_PAGE_SIZE", 500)
+    now = timezone.now()
+    until = now - timedelta(seconds=getattr(settings, "SYNC_SETTLE_SECONDS", 5))
+    if since is None:
+        # a full listing: earlier deletions and schedules are of no interest
+        changed_from, deleted_from, scheduled_from = (EPOCH, 0), (until, 0), now
+    else:
+        changed_from, deleted_from, scheduled_from = decode_cursor(since)
+        if deleted_from[0] < now - timedelta(days=getattr(settings, "SYNC_TOMBSTONE_DAYS", 30)):
+            raise CursorExpired(since)
+
+    rows = list(
+        _after(resource.queryset(user).filter(updated_at__lte=until), "updated_at", changed_from)
+        .order_by("updated_at", "pk")[:limit + 1]
+    )
+    gone = Q(model=resource.label, user__isnull=True)
+    if resource.enrolled:
+        gone |= Q(model=ENROLLMENT, user=user)
+    tombstones = list(
+        _after(Tombstone.objects.filter(gone, deleted_at__lte=until), "deleted_at", deleted_from)
+        .order_by("deleted_at", "pk")
+        .values_list("deleted_at", "pk", "model", "object_id")[:limit + 1]
+    )
+    more_changed, rows = len(rows) > limit, rows[:limit]
+    more_deleted, tombstones = len(tombstones) > limit, tombstones[:limit]
+    # a stream read to the end resumes from `until`: nothing older can turn up any more
+    changed_to = (rows[-1].updated_at, rows[-1].pk) if more_changed else (until, 0)
+    deleted_to = tombstones[-1][:2] if more_deleted else (until, 0)
+
+    deleted = [object_id for _, _, model, object_id in tombstones if model == resource.label]
+    courses = {object_id for _, _, model, object_id in tombstones if model == ENROLLMENT}
+    if courses:
+        # joined courses send their rows, left ones delete them
+        enrolled = list(resource.queryset(user).filter(course_id__in=courses))
+        kept = {row.pk for row in enrolled}
+        rows += enrolled
+        deleted += [
+            pk for pk in resource.model.objects.filter(course_id__in=courses).values_list("pk", flat=True)
+            if pk not in kept
+        ]
+    rows += _scheduled(resource, user, scheduled_from, now)
+
+    visible, hidden = {}, {}
+    for row in rows:
+        (hidden if resource.hidden and resource.hidden(row, now) else visible)[row.pk] = row
+    return {
+        "changed": resource.serializer_class(list(visible.values()), many=True).data,
+        "deleted": list(dict.fromkeys(deleted + list(hidden))),
+        "cursor": encode_cursor(
+            max(changed_from, changed_to), max(deleted_from, deleted_to), max(scheduled_from, now),
+        ),
+        "has_more": more_changed or more_deleted,
+    }
+
+
+def prune_tombstones(now=None):
+    cutoff = (now or timezone.now()) - timedelta(days=getattr(settings, "SYNC_TOMBSTONE_DAYS", 30))
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
+
+
+def record_deletion(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+for _resource in RESOURCES.values():
+    post_delete.connect(record_deletion, sender=_resource.model, dispatch_uid=f"sync-tombstone-{_resource.label}")
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def enrollment_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # clear() does not report the removed rows, read them beforehand
+        owner, other = ("user_id", "course_id") if reverse else ("course_id", "user_id")
+        instance._sync_cleared = set(sender.objects.filter(**{owner: instance.pk}).values_list(other, flat=True))
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_sync_cleared", set())
+    elif action not in ("post_add", "post_remove"):
+        return
+    Tombstone.objects.bulk_create([
+        Tombstone(model=ENROLLMENT, object_id=pk, user_id=instance.pk) if reverse
+        else Tombstone(model=ENROLLMENT, object_id=instance.pk, user_id=pk)
+        for pk in pk_set
+    ])
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, **kwargs):
+    # questions are part of the quiz's sync representation
+    Quiz.objects.filter(pk=instance.quiz_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def choice_changed(sender, instance, **kwargs):
+    Quiz.objects.filter(questions=instance.question_id).update(updated_at=timezone.now())
@@ -0,0 +1,113 @@
+"""
+Background tasks stored in the project database.
+
+A function decorated with ``@task`` is queued with ``func.enqueue(**kwargs)``
+(JSON-serialisable keyword arguments) and run by ``manage.py run_tasks``.
+Queuing inside a transaction is atomic with it: workers only see committed
+rows. Workers claim batches with ``SELECT ... FOR UPDATE SKIP LOCKED`` where
+the database supports it; elsewhere (SQLite) claims are settled by a
+conditional UPDATE tagged with the worker's token, so two workers never run
+the same task either way. A claim is a lease of ``TASK_LEASE_SECONDS``:
+tasks of a worker that died are picked up again once it expires.
+
+Failures are retried with exponential backoff until ``max_attempts``. With
+``TASKS_EAGER`` (development) tasks run in-process right after commit.
+"""
+import logging
+import time
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import metrics
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(func):
+    """Register ``func`` as a task named ``<module>.<function>`` and give it ``enqueue()``."""
+    name = f"{func.__module__}.{func.__name__}"
+    _registry[name] = func
+    func.task_name = name
+    func.enqueue = lambda **kwargs: enqueue(name, **kwargs)
+    return func
+
+
+def enqueue(name, *, run_at=None, max_attempts=None, **kwargs):
+    if name not in _registry:
+        raise KeyError(f"Unknown task {name!r}")
+    if getattr(settings, "TASKS_EAGER", False):
+        transaction.on_commit(lambda: _registry[name](**kwargs))
+        return None
+    return Task.objects.create(
+        name=name,
+        kwargs=kwargs,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or getattr(settings, "TASK_MAX_ATTEMPTS", 5),
+    )
+
+
+def _claimable(now):
+    return Task.objects.filter(
+        Q(status=Task.PENDING, run_at__lte=now) | Q(status=Task.RUNNING, locked_until__lt=now)
+    )
+
+
+def claim(batch_size, token=None):
+    """Lease up to ``batch_size`` due tasks to ``token``; returns them."""
+    token = token or uuid.uuid4().hex
+    now = timezone.now()
+    lease = timedelta(seconds=getattr(settings, "TASK_LEASE_SECONDS", 300))
+    with transaction.atomic():
+        candidates = _claimable(now).order_by("run_at")
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return []
+        # re-checks the conditions, so a row another worker took meanwhile is skipped
+        _claimable(now).filter(pk__in=ids).update(
+            status=Task.RUNNING, locked_by=token, locked_until=now + lease, attempts=F("attempts") + 1,
+        )
+    return list(Task.objects.filter(pk__in=ids, status=Task.RUNNING, locked_by=token))
+
+
+def backoff(attempts):
+    base = getattr(settings, "TASK_RETRY_BACKOFF", 10)
+    return min(base * 2 ** (attempts - 1), getattr(settings, "TASK_RETRY_BACKOFF_MAX", 3600))
+
+
+def run(claimed):
+    """Run one claimed task and record its outcome; returns ``success``, ``retry`` or ``failed``."""
+    func = _registry.get(claimed.name)
+    started = time.perf_counter()
+    try:
+        if func is None:
+            raise KeyError(f"Unknown task {claimed.name!r}")
+        func(**claimed.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Task %s (%s) failed on attempt %s", claimed.pk, claimed.name, claimed.attempts)
+        if claimed.attempts >= claimed.max_attempts:
+            result, changes = "failed", {"status": Task.FAILED, "finished_at": timezone.now()}
+        else:
+            run_at = timezone.now() + timedelta(seconds=backoff(claimed.attempts))
+            result, changes = "retry", {"status": Task.PENDING, "run_at": run_at}
+        changes["last_error"] = error
+    else:
+        result, changes = "success", {"status": Task.DONE, "finished_at": timezone.now(), "last_error": ""}
+    metrics.TASK_DURATION.observe(time.perf_counter() - started, task=claimed.name)
+    metrics.TASKS.inc(task=claimed.name, result=result)
+    # the lease may have expired and been taken over; leave the row to the new owner then
+    Task.objects.filter(pk=claimed.pk, locked_by=claimed.locked_by).update(
+        locked_by="", locked_until=None, **changes
+    )
+    return result
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.authentication import CachedJWTAuthentication
+from accounts.views import get_tokens_for_user
+from courses.models import Course, Program
+from quizzes.models import Quiz
+
+User = get_user_model()
+
+
+class BatchEndpointTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username="student", password="pass")
+        program = Program.objects.create(title="Program")
+        cls.course = Course.objects.create(
+            title="Course", code="C-1", program=program, level="bachelor", semester="fall", instructor=cls.student,
+        )
+        cls.course.students.add(cls.student)
+        cls.quiz = Quiz.objects.create(course=cls.course, title="Quiz")
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.student)['access']}")
+        self.url = reverse("batch")
+
+    def test_runs_each_request_with_one_authentication(self):
+        paths = [
+            reverse("dashboard"),
+            reverse("course-detail", args=[self.course.pk]),
+            reverse("quiz-list") + "?fields=id,title",
+            "/api/nowhere/",
+            reverse("user-list"),
+        ]
+        original = CachedJWTAuthentication.get_validated_token
+        with mock.patch.object(
+            CachedJWTAuthentication, "get_validated_token", autospec=True, side_effect=original
+        ) as validated:
+            res = self.client.post(self.url, {"requests": [{"path": path} for path in paths]}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(validated.call_count, 1)
+
+        responses = res.json()["responses"]
+        self.assertEqual([r["path"] for r in responses], paths)
+        self.assertEqual([r["status"] for r in responses], [200, 200, 200, 404, 403])
+        self.assertEqual(responses[0]["body"], self.client.get(reverse("dashboard")).json())
+        self.assertEqual(responses[1]["body"]["title"], "Course")
+        self.assertEqual(responses[2]["body"], [{"id": self.quiz.pk, "title": "Quiz"}])
+
+    def test_rejects_invalid_batches(self):
+        for requests in (
+            [],
+            [{"path": "/admin/"}],
+            [{"path": self.url}],
+            [{"method": "POST", "path": reverse("dashboard")}],
+            [{"path": reverse("dashboard")}] * 21,
+        ):
+            with self.subTest(requests=requests[:1]):
+                res = self.client.post(self.url, {"requests": requests}, format="json")
+                self.assertEqual(res.status_code, 400)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        res = self.client.post(self.url, {"requests": [{"path": reverse("dashboard")}]}, format="json")
+        self.assertEqual(res.status_code, 401)
@@ -0,0 +1,41 @@
+from django.test import SimpleTestCase
+
+from benchmarks import runner
+
+
+class BenchRunnerTest(SimpleTestCase):
+    def test_summarize_reports_percentiles(self):
+        stats = runner.summarize([i / 1000 for i in range(1, 101)], [3] * 100, errors=2)
+        self.assertEqual(stats["p50_ms"], 50.0)
+        self.assertEqual(stats["p95_ms"], 95.0)
+        self.assertEqual(stats["queries_max"], 3)
+        self.assertEqual(stats["errors"], 2)
+
+    def test_compare_flags_latency_and_query_regressions(self):
+        baseline = {"scenarios": {
+            "answer": {"p95_ms": 10.0, "queries_max": 7},
+            "complete": {"p95_ms": 20.0, "queries_max": 12},
+        }}
+        current = {"scenarios": {
+            "answer": {"p95_ms": 10.5, "queries_max": 9},
+            "complete": {"p95_ms": 30.0, "queries_max": 12},
+            "enroll": {"p95_ms": 5.0, "queries_max": 3},
+        }}
+        lines, regressions = runner.compare(baseline, current, tolerance=0.2)
+        self.assertEqual(regressions, ["answer", "complete"])
+        self.assertIn("enroll: new scenario", lines[-1])
+
+    def test_measure_runs_setup_outside_the_timed_call(self):
+        class Response:
+            status_code = 200
+
+        calls = []
+
+        def run(opened):
+            calls.append(opened)
+            return Response()
+        run.setup = lambda: len(calls)
+
+        stats = runner.measure(run, iterations=3, warmup=1)
+        self.assertEqual(calls, [0, 1, 2, 3])
+        self.assertEqual(stats["iterations"], 3)
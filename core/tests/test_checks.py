@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase
+
+from core.checks import database_connection_messages
+
+POSTGRES = "django.db.backends.postgresql"
+
+
+class DatabaseConnectionCheckTest(SimpleTestCase):
+    def ids(self, databases, debug=False):
+        return [message.id for message in database_connection_messages(databases, debug=debug)]
+
+    def test_reports_pool_settings(self):
+        messages = database_connection_messages(
+            {"default": {"ENGINE": POSTGRES, "CONN_MAX_AGE": 0, "OPTIONS": {"pool": {"max_size": 20}}}}
+        )
+        self.assertEqual([m.id for m in messages], ["core.I001"])
+        self.assertIn("psycopg pool (max_size=20)", messages[0].msg)
+
+    def test_warns_about_per_request_connections_outside_debug(self):
+        databases = {"default": {"ENGINE": POSTGRES, "CONN_MAX_AGE": 0}}
+        self.assertEqual(self.ids(databases), ["core.I001", "core.W001"])
+        self.assertEqual(self.ids(databases, debug=True), ["core.I001"])
+
+    def test_warns_about_persistent_connections_without_health_checks(self):
+        databases = {"default": {"ENGINE": POSTGRES, "CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": False}}
+        self.assertEqual(self.ids(databases), ["core.I001", "core.W002"])
+
+    def test_ignores_other_backends(self):
+        self.assertEqual(self.ids({"default": {"ENGINE": "django.db.backends.sqlite3"}}), [])
@@ -0,0 +1,75 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.models import Session
+from courses.models import Course, Program
+from quizzes.models import Quiz, QuizAttempt
+
+User = get_user_model()
+
+
+class DashboardTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(username="student", password="pass")
+        instructor = User.objects.create_user(username="instr", password="pass")
+        program = Program.objects.create(title="Program")
+        Session.objects.create(name="2025/2026", is_current=True)
+        self.courses = []
+        for i in range(3):
+            course = Course.objects.create(
+                title=f"Course {i}", code=f"C-{i}", program=program, level="bachelor",
+                semester="fall", instructor=instructor,
+            )
+            course.students.add(self.student)
+            Quiz.objects.create(course=course, title=f"Quiz {i}")
+            Quiz.objects.create(course=course, title=f"Draft {i}", draft=True)
+            self.courses.append(course)
+        self.extra = Course.objects.create(
+            title="Extra", code="C-X", program=program, level="bachelor", semester="fall", instructor=instructor,
+        )
+        self.client.force_authenticate(user=self.student)
+        self.url = reverse("dashboard")
+
+    def test_dashboard_uses_fixed_queries_and_is_cached(self):
+        with self.assertNumQueries(4):
+            res = self.client.get(self.url)
+        data = res.json()
+        self.assertEqual(data["username"], "student")
+        self.assertEqual(data["session"]["name"], "2025/2026")
+        self.assertEqual(len(data["courses"]), 3)
+        self.assertEqual(sorted(q["title"] for q in data["quizzes"]), ["Quiz 0", "Quiz 1", "Quiz 2"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).json(), data)
+
+    def test_enrollment_invalidates_cache(self):
+        self.client.get(self.url)
+        self.extra.students.add(self.student)
+        self.assertEqual(len(self.client.get(self.url).json()["courses"]), 4)
+
+    def test_completed_attempt_shows_latest_score(self):
+        self.client.get(self.url)
+        quiz = Quiz.objects.get(title="Quiz 1")
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=quiz)
+        attempt.score = Decimal("75.00")
+        attempt.completed_at = timezone.now()
+        attempt.save()
+        quizzes = {q["title"]: q for q in self.client.get(self.url).json()["quizzes"]}
+        self.assertEqual(quizzes["Quiz 1"]["latest_score"], "75.00")
+        self.assertIsNone(quizzes["Quiz 0"]["latest_score"])
+
+    def test_bulk_expiry_invalidates_cache(self):
+        quiz = Quiz.objects.get(title="Quiz 2")
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=quiz)
+        QuizAttempt.objects.filter(pk=attempt.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.client.get(self.url)
+        QuizAttempt.objects.complete_expired()
+        quizzes = {q["title"]: q for q in self.client.get(self.url).json()["quizzes"]}
+        self.assertEqual(quizzes["Quiz 2"]["latest_score"], "0.00")
@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+from django.test import TestCase
+
+from benchmarks import datagen
+from core.models import ActivityLog
+from courses.models import Course
+from quizzes.models import Answer, Quiz, QuizAttempt
+
+SIZES = {
+    "students": 30, "instructors": 3, "programs": 2, "courses": 5,
+    "offerings_per_course": 1, "quizzes_per_course": 1, "questions_per_quiz": 5,
+    "choices_per_question": 3, "courses_per_student": 2, "attempt_rate": 0.8,
+}
+
+
+class DataGeneratorTest(TestCase):
+    def test_generates_consistent_rows_without_signals(self):
+        generator = datagen.generate(datagen.DatabaseWriter(batch_size=7), seed=3, **SIZES)
+        self.assertEqual(Course.objects.count(), 5)
+        self.assertEqual(Course.students.through.objects.count(), generator.counts["Course_students"])
+        self.assertEqual(Answer.objects.count(), generator.counts["Answer"])
+        self.assertFalse(ActivityLog.objects.exists())
+        # in students' feeds although Quiz.save never ran
+        self.assertFalse(Quiz.objects.filter(published_at__isnull=True).exists())
+
+        attempt = QuizAttempt.objects.filter(completed_at__isnull=False).first()
+        self.assertEqual(QuizAttempt.objects.bulk_scores([attempt.pk])[attempt.pk], float(attempt.score))
+
+    def test_same_seed_gives_same_dataset(self):
+        first = datagen.Generator(datagen.DatabaseWriter(), seed=5, **SIZES)
+        with tempfile.TemporaryDirectory() as directory:
+            second = datagen.Generator(datagen.CopyWriter(directory), seed=5, **SIZES)
+            first.run()
+            second.run()
+            with open(os.path.join(directory, "05_courses_course.sql")) as fh:
+                self.assertTrue(fh.readline().startswith('COPY "courses_course" ("id", "slug"'))
+        self.assertEqual(first.counts, second.counts)
+        self.assertEqual(
+            [len(v) for v in first.courses_by_student.values()],
+            [len(v) for v in second.courses_by_student.values()],
+        )
@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.views import get_tokens_for_user
+from core import degrade, metrics
+from core.singleflight import get_or_build
+from courses.models import Course, Program
+
+User = get_user_model()
+
+
+class BreakerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        degrade.reset()
+        self.addCleanup(degrade.reset)
+        metrics.reset()
+
+    def test_slow_queries_trip_it_and_fast_probes_close_it(self):
+        degrade.observe(0.001)
+        self.assertEqual(degrade.state(), degrade.CLOSED)
+        for _ in range(5):
+            degrade.observe(2.0)
+        self.assertEqual(degrade.state(), degrade.OPEN)
+        self.assertIn("openlearn_db_breaker_trips_total 1", metrics.render_text())
+
+        with override_settings(DEGRADE_OPEN_SECONDS=0):
+            self.assertEqual(degrade.state(), degrade.HALF_OPEN)
+            degrade.observe(2.0)  # still slow: trips again
+            self.assertIn("openlearn_db_breaker_trips_total 2", metrics.render_text())
+            for _ in range(20):
+                degrade.observe(0.001)
+            self.assertEqual(degrade.state(), degrade.CLOSED)
+
+    def test_cached_reads_serve_the_last_value_while_open(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return len(builds)
+
+        self.assertEqual(get_or_build("thing:v1", build, 60, "test", stale_key="thing:stale"), 1)
+        degrade.trip()
+        # the entry was invalidated (new version) but the database is saturated
+        self.assertEqual(get_or_build("thing:v2", build, 60, "test", stale_key="thing:stale"), 1)
+        self.assertEqual(get_or_build("thing:v2", build, 60, "test", stale_key="thing:stale"), 1)
+        self.assertEqual(len(builds), 1)
+        # without a stale copy there is nothing else to do than to build
+        self.assertEqual(get_or_build("other", build, 60, "test", stale_key="other:stale"), 2)
+
+        with override_settings(DEGRADE_OPEN_SECONDS=0):
+            # half-open: one caller refreshes the entry, the others keep the stale value meanwhile
+            self.assertEqual(get_or_build("thing:v3", build, 60, "test", stale_key="thing:stale"), 3)
+            cache.delete("thing:v3")
+            self.assertEqual(get_or_build("thing:v3", build, 60, "test", stale_key="thing:stale"), 3)
+            self.assertEqual(len(builds), 3)
+
+
+class DegradedRequestsTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="alice", password="pass", is_staff=True, is_superuser=True)
+        program = Program.objects.create(title="Program")
+        cls.course = Course.objects.create(
+            title="Course", code="C-1", program=program, level="bachelor", semester="fall", instructor=cls.user,
+        )
+
+    def setUp(self):
+        cache.clear()
+        degrade.reset()
+        self.addCleanup(degrade.reset)
+
+    def test_open_breaker_serves_stale_catalogue_and_sheds_other_reads(self):
+        url = reverse("course-list")
+        self.assertEqual(self.client.get(url).json()[0]["title"], "Course")
+        self.course.title = "Renamed"
+        self.course.save()
+        degrade.trip()
+
+        stale = self.client.get(url)
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.json()[0]["title"], "Course")
+        self.assertEqual(stale["Warning"], '110 - "Response is Stale"')
+        self.assertIn("Age", stale)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['access']}")
+        shed = self.client.get(reverse("user-list"))
+        self.assertEqual(shed.status_code, 503)
+        self.assertEqual(shed["Retry-After"], "30")
+        # writes still go through
+        res = self.client.post(reverse("course-enroll", args=[self.course.pk]))
+        self.assertEqual(res.status_code, 201)
+
+        degrade.reset()
+        fresh = self.client.get(reverse("user-list"))
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotIn("Warning", fresh)
@@ -0,0 +1,97 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from core.fastpath import FastSerializer
+from courses.models import Course, Program
+from courses.serializers import EnrolledCourseSerializer, FastEnrolledCourseSerializer
+from quizzes.models import Answer, Choice, Question, Quiz, QuizAttempt
+from quizzes.serializers import AttemptSerializer, FastAttemptSerializer, FastQuizSerializer, QuizSerializer
+
+User = get_user_model()
+
+
+class FastSerializerEquivalenceTest(TestCase):
+    """The fast path must render exactly the bytes of the serializer it replaces."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username="stüdent", password="pass")
+        instructor = User.objects.create_user(username="instr", password="pass")
+        programs = [Program.objects.create(title="Anatomy"), Program.objects.create(title="Physiology")]
+        for i in range(3):
+            course = Course.objects.create(
+                title=f"Course {i} ✓", code=f"C-{i}", program=programs[i % 2], level="bachelor",
+                semester="fall", instructor=instructor, summary="" if i else "Bones   and joints",
+            )
+            course.students.add(cls.student)
+            quiz = Quiz.objects.create(course=course, title=f"Quiz {i}", time_limit=30 if i else None)
+            for q in range(3):
+                question = Question.objects.create(
+                    quiz=quiz, text=f"Question {q} «long text»", order=q,
+                    type=Question.ANATOMICAL if q == 2 else Question.MULTIPLE_CHOICE,
+                )
+                for c in range(2 if q < 2 else 0):
+                    Choice.objects.create(question=question, text=f"Choice {c}", is_correct=c == 0)
+        Quiz.objects.create(course=course, title="Empty quiz")
+
+        quiz = Quiz.objects.get(title="Quiz 0")
+        questions = list(quiz.questions.all())
+        done = QuizAttempt.objects.start_attempt(user=cls.student, quiz=quiz)
+        Answer.objects.create(attempt=done, question=questions[0], selected_choice=questions[0].choices.first())
+        Answer.objects.create(attempt=done, question=questions[2], free_response="The femur")
+        done.score = Decimal("66.666")
+        done.completed_at = timezone.now() + timedelta(microseconds=123)
+        done.save()
+        QuizAttempt.objects.start_attempt(user=cls.student, quiz=quiz)
+
+    def assertSameBytes(self, fast, slow):
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(slow))
+
+    def test_quiz(self):
+        qs = Quiz.objects.all()
+        self.assertSameBytes(
+            FastQuizSerializer(qs).data,
+            QuizSerializer(qs.prefetch_related("questions__choices"), many=True).data,
+        )
+
+    def test_attempt(self):
+        qs = QuizAttempt.objects.all()
+        self.assertSameBytes(FastAttemptSerializer(qs).data, AttemptSerializer(qs, many=True).data)
+
+    def test_enrolled_course(self):
+        qs = Course.objects.filter(students=self.student)
+        self.assertSameBytes(FastEnrolledCourseSerializer(qs).data, EnrolledCourseSerializer(qs, many=True).data)
+
+    def test_single_object(self):
+        quiz = Quiz.objects.filter(questions__isnull=False).first()
+        self.assertSameBytes(
+            FastQuizSerializer(Quiz.objects.filter(pk=quiz.pk), many=False).data, QuizSerializer(quiz).data
+        )
+
+    def test_fixed_query_count(self):
+        with self.assertNumQueries(3):  # quizzes, questions, choices
+            FastQuizSerializer(Quiz.objects.all()).data
+
+    def test_unsupported_fields_must_be_declared(self):
+        class CountSerializer(serializers.ModelSerializer):
+            n = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Quiz
+                fields = ("id", "n")
+
+            def get_n(self, obj):
+                return 1
+
+        class FastCountSerializer(FastSerializer):
+            serializer_class = CountSerializer
+
+        with self.assertRaises(ImproperlyConfigured):
+            FastCountSerializer.plan()
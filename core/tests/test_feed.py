@@ -0,0 +1,107 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.views import get_tokens_for_user
+from core.models import ActivityLog, NewsAndEvents
+from courses.models import Course, Program
+from merged_sorted_lists import merge_sorted_lists
+from quizzes.models import Quiz, QuizAttempt
+
+User = get_user_model()
+
+
+class MergeSortedListsTest(SimpleTestCase):
+    def test_merges_sorted_inputs(self):
+        self.assertEqual(list(merge_sorted_lists([[1, 4, 7], [], [2, 5], [3, 6, 8]])), [1, 2, 3, 4, 5, 6, 7, 8])
+        self.assertEqual(
+            list(merge_sorted_lists([[9, 3], [8, 7, 1]], reverse=True, limit=4)), [9, 8, 7, 3],
+        )
+
+    def test_keeps_input_order_for_equal_keys_and_reads_lazily(self):
+        pairs = list(merge_sorted_lists([[(1, "a")], [(1, "b"), (2, "c")]], key=lambda pair: pair[0]))
+        self.assertEqual(pairs, [(1, "a"), (1, "b"), (2, "c")])
+
+        def endless():
+            n = 0
+            while True:
+                yield n
+                n += 2
+
+        self.assertEqual(list(merge_sorted_lists([endless(), [1, 3]], limit=5)), [0, 1, 2, 3, 4])
+
+
+class FeedEndpointTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username="student", password="pass")
+        program = Program.objects.create(title="Program")
+        cls.course = Course.objects.create(
+            title="Course", code="C-1", program=program, level="bachelor", semester="fall", instructor=cls.student,
+        )
+        cls.course.students.add(cls.student)
+        cls.other = Course.objects.create(
+            title="Other", code="C-2", program=program, level="bachelor", semester="fall", instructor=cls.student,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.student)['access']}")
+        ActivityLog.objects.all().delete()
+        now = timezone.now()
+        self.news = NewsAndEvents.objects.create(title="News")
+        NewsAndEvents.objects.filter(pk=self.news.pk).update(created_at=now - timedelta(hours=4))
+        self.log = ActivityLog.objects.create(message="Course updated", course=self.course)
+        ActivityLog.objects.filter(pk=self.log.pk).update(created_at=now - timedelta(hours=3))
+        ActivityLog.objects.create(message="Not mine", course=self.other)
+        self.quiz = Quiz.objects.create(course=self.course, title="Quiz")
+        Quiz.objects.filter(pk=self.quiz.pk).update(published_at=now - timedelta(hours=2))
+        Quiz.objects.create(course=self.course, title="Draft", draft=True)
+        Quiz.objects.create(course=self.other, title="Not enrolled")
+        self.attempt = QuizAttempt.objects.create(
+            quiz=self.quiz, user=self.student, started_at=now, completed_at=now - timedelta(hours=1),
+            score=Decimal("75.00"),
+        )
+
+    def test_merges_sources_newest_first(self):
+        res = self.client.get(reverse("feed"))
+        self.assertEqual(res.status_code, 200)
+        items = res.json()["results"]
+        self.assertEqual(
+            [(item["type"], item["id"]) for item in items],
+            [("attempt", self.attempt.pk), ("quiz", self.quiz.pk), ("activity", self.log.pk), ("news", self.news.pk)],
+        )
+        self.assertEqual(items[0]["data"]["quiz_title"], "Quiz")
+        self.assertIsNone(res.json()["next"])
+
+    def test_pages_with_the_cursor(self):
+        same_time = timezone.now() - timedelta(hours=3)
+        extra = NewsAndEvents.objects.create(title="Same time as the log")
+        NewsAndEvents.objects.filter(pk=extra.pk).update(created_at=same_time)
+        ActivityLog.objects.filter(pk=self.log.pk).update(created_at=same_time)
+
+        seen = []
+        # the authenticated user, the enrollments and one query per source
+        with override_settings(FEED_PAGE_SIZE=2), self.assertNumQueries(6):
+            page = self.client.get(reverse("feed")).json()
+        seen += page["results"]
+        with override_settings(FEED_PAGE_SIZE=2):
+            while page["next"]:
+                page = self.client.get(reverse("feed"), {"cursor": page["next"]}).json()
+                seen += page["results"]
+        self.assertEqual(
+            [(item["type"], item["id"]) for item in seen],
+            [
+                ("attempt", self.attempt.pk), ("quiz", self.quiz.pk),
+                ("activity", self.log.pk), ("news", extra.pk), ("news", self.news.pk),
+            ],
+        )
+
+    def test_rejects_invalid_cursor(self):
+        self.assertEqual(self.client.get(reverse("feed"), {"cursor": "nope"}).status_code, 400)
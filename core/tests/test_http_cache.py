@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.views import get_tokens_for_user
+from core.models import NewsAndEvents
+from courses.models import Course, Program
+
+User = get_user_model()
+
+
+class PublicCacheTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user(username="instr", password="pass")
+        cls.program = Program.objects.create(title="Program")
+        cls.course = Course.objects.create(
+            title="Course", code="C-1", program=cls.program, level="bachelor", semester="fall",
+            instructor=cls.instructor,
+        )
+        NewsAndEvents.objects.create(title="Exam week")
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("course-list")
+
+    def test_anonymous_list_is_served_from_cache_with_etag(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("public", first["Cache-Control"])
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_conditional_get_returns_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+    def test_query_string_is_part_of_the_key(self):
+        self.assertNotEqual(self.client.get(self.url)["ETag"], self.client.get(self.url + "?page=1")["ETag"])
+
+    def test_saves_and_enrollment_invalidate(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.course.title = "Renamed"
+        self.course.save()
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()[0]["title"], "Renamed")
+
+        etag = res["ETag"]
+        self.course.students.add(self.instructor)
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.json()[0]["students_count"], 1)
+
+    def test_only_renamed_instructors_and_students_invalidate(self):
+        etag = self.client.get(self.url)["ETag"]
+        outsider = User.objects.create_user(username="outsider", password="pass")
+        outsider.first_name = "Out"
+        outsider.save()
+        self.instructor.email = "instr@example.com"
+        self.instructor.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.instructor.first_name = "Ada"
+        self.instructor.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_news_has_its_own_version(self):
+        url = reverse("news-events-list")
+        news_etag = self.client.get(url)["ETag"]
+        self.course.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=news_etag).status_code, 304)
+        NewsAndEvents.objects.create(title="Results")
+        self.assertEqual(len(self.client.get(url, HTTP_IF_NONE_MATCH=news_etag).json()), 2)
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        access = get_tokens_for_user(self.instructor)["access"]
+        self.client.get(self.url)
+        res = self.client.get(self.url, HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.assertNotIn("ETag", res)
@@ -0,0 +1,85 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.views import get_tokens_for_user
+from core.models import IdempotencyKey
+from courses.models import Course, Program
+from quizzes.models import Choice, Question, Quiz, QuizAttempt
+
+User = get_user_model()
+
+
+class IdempotencyKeyTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username="student", password="pass")
+        program = Program.objects.create(title="Program")
+        cls.course = Course.objects.create(
+            title="Course", code="C-1", program=program, level="bachelor", semester="fall", instructor=cls.student,
+        )
+        cls.course.students.add(cls.student)
+        cls.quiz = Quiz.objects.create(course=cls.course, title="Quiz")
+        question = Question.objects.create(quiz=cls.quiz, text="2+2?", order=1)
+        Choice.objects.create(question=question, text="4", is_correct=True)
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.student)['access']}")
+        self.url = reverse("attempt-list")
+
+    def test_retried_create_is_replayed_without_a_second_attempt(self):
+        first = self.client.post(self.url, {"quiz": self.quiz.pk}, HTTP_IDEMPOTENCY_KEY="abc")
+        self.assertEqual(first.status_code, 201)
+        retry = self.client.post(self.url, {"quiz": self.quiz.pk}, HTTP_IDEMPOTENCY_KEY="abc")
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(QuizAttempt.objects.count(), 1)
+
+        self.client.post(self.url, {"quiz": self.quiz.pk}, HTTP_IDEMPOTENCY_KEY="other")
+        self.assertEqual(QuizAttempt.objects.count(), 2)
+
+    def test_requests_without_a_key_are_not_recorded(self):
+        self.client.post(self.url, {"quiz": self.quiz.pk})
+        self.client.post(self.url, {"quiz": self.quiz.pk})
+        self.assertEqual(QuizAttempt.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_duplicate_in_flight_gets_conflict(self):
+        body = {"quiz": self.quiz.pk}
+        IdempotencyKey.objects.create(
+            user=self.student, key="abc", endpoint=f"QuizAttemptViewSet.create:{self.url}",
+            request_hash=hashlib.md5(json.dumps(body).encode()).hexdigest(),
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+        res = self.client.post(self.url, body, HTTP_IDEMPOTENCY_KEY="abc", format="json")
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual(res["Retry-After"], "1")
+        self.assertFalse(QuizAttempt.objects.exists())
+
+        # the first request died: after IDEMPOTENCY_LOCK_SECONDS the key is free again
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+        res = self.client.post(self.url, body, HTTP_IDEMPOTENCY_KEY="abc", format="json")
+        self.assertEqual(res.status_code, 201)
+
+    def test_key_reuse_with_another_body_is_rejected(self):
+        self.client.post(self.url, {"quiz": self.quiz.pk}, HTTP_IDEMPOTENCY_KEY="abc")
+        res = self.client.post(self.url, {"quiz": self.quiz.pk, "note": "x"}, HTTP_IDEMPOTENCY_KEY="abc")
+        self.assertEqual(res.status_code, 422)
+
+    def test_enroll_and_expiry(self):
+        other = Course.objects.create(
+            title="Other", code="C-2", program=self.course.program, level="bachelor", semester="fall",
+            instructor=self.student,
+        )
+        url = reverse("course-enroll", args=[other.pk])
+        self.assertEqual(self.client.post(url, HTTP_IDEMPOTENCY_KEY="k").status_code, 201)
+        self.assertEqual(self.client.post(url, HTTP_IDEMPOTENCY_KEY="k").status_code, 201)
+
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.client.post(url, HTTP_IDEMPOTENCY_KEY="k").status_code, 400)  # already enrolled
@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import metrics
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_requests_are_labelled_by_viewset_action(self):
+        self.client.get(reverse("quiz-list"))
+        body = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn(
+            'openlearn_http_requests_total{view="QuizViewSet.list",method="GET",status="401"} 1', body
+        )
+        self.assertIn('openlearn_http_request_duration_seconds_count{view="QuizViewSet.list"} 1', body)
+        self.assertIn("# TYPE openlearn_db_queries_per_request histogram", body)
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"], METRICS_TOKEN="s3cret")
+    def test_access_is_restricted(self):
+        url = reverse("metrics")
+        self.assertEqual(url, "/metrics/")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION="Bearer s3cret").status_code, 200)
+        self.assertEqual(self.client.get(url, REMOTE_ADDR="10.0.0.1").status_code, 200)
+        # X-Forwarded-For is not trusted
+        self.assertEqual(self.client.get(url, HTTP_X_FORWARDED_FOR="10.0.0.1").status_code, 403)
+
+    def test_cache_lookups_are_counted(self):
+        metrics.record_cache_lookup("quiz", hit=True)
+        metrics.record_cache_lookup("quiz", hit=False)
+        metrics.record_cache_lookup("quiz", hit=True)
+        body = metrics.render_text()
+        self.assertIn('openlearn_cache_lookups_total{cache="quiz",result="hit"} 2', body)
+        self.assertIn('openlearn_cache_lookups_total{cache="quiz",result="miss"} 1', body)
+
+    def test_multiprocess_mode_sums_worker_files(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_MULTIPROC_DIR=directory):
+            metrics.ERRORS.inc(view="QuizAttemptViewSet.complete")
+            key = json.dumps(["openlearn_http_request_errors_total", ["QuizAttemptViewSet.complete"]])
+            with open(os.path.join(directory, "999999.json"), "w") as fh:
+                json.dump({key: 4}, fh)
+            body = metrics.render_text()
+        self.assertIn('openlearn_http_request_errors_total{view="QuizAttemptViewSet.complete"} 5', body)
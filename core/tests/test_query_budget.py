@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.middleware import QueryBudgetExceeded, QueryBudgetMiddleware
+from core.models import ActivityLog
+from courses.models import Course, Program
+from quizzes.models import Choice, Question, Quiz
+
+User = get_user_model()
+
+
+def n_plus_one_view(request):
+    for pk in range(6):
+        ActivityLog.objects.filter(pk=pk).first()
+    return HttpResponse("ok")
+
+
+class QueryBudgetMiddlewareTest(TestCase):
+    def run_view(self, view):
+        middleware = QueryBudgetMiddleware(lambda request: view(request))
+        request = RequestFactory().get("/probe/")
+        middleware.process_view(request, view, (), {})
+        return middleware(request)
+
+    def test_counts_queries_and_sets_server_timing(self):
+        response = self.run_view(n_plus_one_view)
+        self.assertEqual(response.query_stats.count, 6)
+        self.assertIn('desc="6 queries"', response["Server-Timing"])
+
+    @override_settings(QUERY_BUDGET_STRICT=True, QUERY_N_PLUS_ONE_THRESHOLD=5)
+    def test_repeated_sql_shape_fails_in_strict_mode(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "N+1 suspect, 6x"):
+            self.run_view(n_plus_one_view)
+
+    @override_settings(QUERY_BUDGET_STRICT=True, QUERY_BUDGET_DEFAULT=2, QUERY_N_PLUS_ONE_THRESHOLD=100)
+    def test_default_budget_applies_to_undeclared_views(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "6 queries (budget 2)"):
+            self.run_view(n_plus_one_view)
+
+    @override_settings(QUERY_N_PLUS_ONE_THRESHOLD=5)
+    def test_offenders_are_logged_otherwise(self):
+        with self.assertLogs("core.middleware", level="WARNING"):
+            self.run_view(n_plus_one_view)
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class QuizEndpointBudgetTest(APITestCase):
+    def setUp(self):
+        instructor = User.objects.create_user(username="instr", password="pass")
+        self.student = User.objects.create_user(username="student", password="pass")
+        course = Course.objects.create(
+            title="Course", code="C-1", program=Program.objects.create(title="P"),
+            level="bachelor", semester="fall", instructor=instructor,
+        )
+        course.students.add(self.student)
+        self.quiz = Quiz.objects.create(course=course, title="Quiz")
+        for order in range(10):
+            question = Question.objects.create(quiz=self.quiz, text=f"Q{order}", order=order)
+            Choice.objects.create(question=question, text="A", is_correct=True)
+            Choice.objects.create(question=question, text="B")
+        self.client.force_authenticate(user=self.student)
+
+    def test_quiz_retrieve_stays_within_budget(self):
+        res = self.client.get(reverse("quiz-detail", args=[self.quiz.pk]))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()["questions"]), 10)
+
+    def test_quiz_list_stays_within_budget(self):
+        for number in range(4):
+            quiz = Quiz.objects.create(course=self.quiz.course, title=f"Quiz {number}")
+            Question.objects.create(quiz=quiz, text="Q", order=0)
+        # the list's budget is 4, and it does not grow with the number of quizzes
+        with self.assertNumQueries(3):
+            res = self.client.get(reverse("quiz-list"))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.json()), 5)
+        self.assertIn('desc="3 queries"', res["Server-Timing"])
@@ -0,0 +1,95 @@
+import gzip
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from core import middleware, renderers
+from core.middleware import accepted_encodings
+from courses.models import Course, Program
+
+User = get_user_model()
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def test_output_matches_json_renderer(self):
+        data = {
+            "text": "Quiz   ünïcode",
+            "when": datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+            "score": Decimal("87.50"),
+            "label": gettext_lazy("Student"),
+            "nested": [{"id": 1, "ok": True, "none": None}],
+            3: "int key",
+        }
+        self.assertEqual(renderers.ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_falls_back(self):
+        data = {"a": [1, 2]}
+        self.assertEqual(
+            renderers.ORJSONRenderer().render(data, "application/json; indent=2"),
+            JSONRenderer().render(data, "application/json; indent=2"),
+        )
+
+
+class AcceptEncodingTest(SimpleTestCase):
+    def test_parses_codings_and_drops_refused_ones(self):
+        self.assertEqual(accepted_encodings("gzip, deflate, br;q=0"), {"gzip", "deflate"})
+        self.assertEqual(accepted_encodings("br;q=0.5, GZIP"), {"br", "gzip"})
+        self.assertEqual(accepted_encodings(""), set())
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_SIZE=200)
+class NegotiationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        instructor = User.objects.create_user(username="instr", password="pass")
+        program = Program.objects.create(title="Program")
+        for i in range(20):
+            Course.objects.create(
+                title=f"Course {i}", code=f"C-{i}", program=program, level="bachelor", semester="fall",
+                instructor=instructor, summary="A fairly long course summary " * 3,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("course-list")
+
+    def test_gzip_when_accepted(self):
+        plain = self.client.get(self.url)
+        res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res["Vary"])
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+
+    @unittest.skipIf(middleware.brotli is None, "brotli is not installed")
+    def test_brotli_preferred_when_available(self):
+        plain = self.client.get(self.url)
+        res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(res["Content-Encoding"], "br")
+        self.assertEqual(middleware.brotli.decompress(res.content), plain.content)
+
+    def test_small_responses_are_not_compressed(self):
+        with self.settings(RESPONSE_COMPRESSION_MIN_SIZE=10**6):
+            res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+    def test_compressed_etag_still_revalidates(self):
+        etag = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+        res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+    @unittest.skipIf(renderers.msgpack is None, "msgpack is not installed")
+    def test_msgpack_on_request(self):
+        res = self.client.get(self.url, HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        data = renderers.msgpack.unpackb(res.content)
+        self.assertEqual(len(data), 20)
+        self.assertEqual(data[0]["title"], self.client.get(self.url).json()[0]["title"])
@@ -0,0 +1,63 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.views import get_tokens_for_user
+from core.replicas import ReplicaRouter, is_routed, is_sticky, read_from
+from courses.models import Course, Program
+
+User = get_user_model()
+
+
+class ReplicaRouterTest(SimpleTestCase):
+    def test_reads_follow_the_selected_alias_and_writes_stay_on_default(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Course))
+        with read_from("replica_1"):
+            self.assertEqual(router.db_for_read(Course), "replica_1")
+            self.assertEqual(router.db_for_write(Course), "default")
+        self.assertIsNone(router.db_for_read(Course))
+
+    @override_settings(REPLICA_ROUTED_VIEWS=["CourseViewSet.list", "QuizViewSet"])
+    def test_routed_views_match_actions_or_whole_viewsets(self):
+        self.assertTrue(is_routed("CourseViewSet.list"))
+        self.assertFalse(is_routed("CourseViewSet.enroll"))
+        self.assertTrue(is_routed("QuizViewSet.retrieve"))
+
+
+# The test database has no separate replica; reads stay on default and the
+# X-Read-Database header shows where they would have gone.
+@override_settings(REPLICA_DATABASES=["replica_1"])
+@mock.patch("core.replicas.ReplicaRouter.db_for_read", return_value=None)
+class ReplicaRoutingMiddlewareTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username="student", password="pass")
+        instructor = User.objects.create_user(username="instr", password="pass")
+        cls.course = Course.objects.create(
+            title="Course", code="C-1", program=Program.objects.create(title="Program"),
+            level="bachelor", semester="fall", instructor=instructor,
+        )
+
+    def setUp(self):
+        cache.clear()
+        access = get_tokens_for_user(self.student)["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_safe_requests_to_routed_views_use_a_replica(self, db_for_read):
+        self.assertEqual(self.client.get(reverse("course-list"))["X-Read-Database"], "replica_1")
+        self.assertEqual(self.client.get(reverse("course-my-courses"))["X-Read-Database"], "default")
+
+    def test_user_reads_from_default_after_a_write(self, db_for_read):
+        res = self.client.post(reverse("course-enroll", args=[self.course.pk]))
+        self.assertEqual(res.status_code, 201)
+        self.assertTrue(is_sticky(self.student.pk))
+        self.assertEqual(self.client.get(reverse("course-list"))["X-Read-Database"], "default")
+
+    def test_failed_writes_do_not_stick(self, db_for_read):
+        self.client.post(reverse("course-enroll", args=[self.course.pk + 100]))
+        self.assertFalse(is_sticky(self.student.pk))
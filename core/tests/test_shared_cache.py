@@ -0,0 +1,110 @@
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from core import metrics, shared_cache
+from core.shared_cache import SharedMemoryCache, key_class
+
+
+def _increment(cache, times):
+    for _ in range(times):
+        cache.incr("counter")
+
+
+class SharedMemoryCacheTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = str(Path(directory.name) / "cache.mmap")
+        self.cache = self.make_cache()
+
+    def make_cache(self, **options):
+        options = {"MAX_SIZE": 1024 * 1024, **options}
+        return SharedMemoryCache(self.path, {"OPTIONS": options})
+
+    def test_cache_api(self):
+        cache = self.cache
+        self.assertIsNone(cache.get("missing"))
+        cache.set("quiz", {"id": 1, "questions": [1, 2]})
+        self.assertEqual(cache.get("quiz"), {"id": 1, "questions": [1, 2]})
+        self.assertFalse(cache.add("quiz", "other"))
+        self.assertTrue(cache.add("new", "value"))
+
+        cache.set("version", 1)
+        self.assertEqual(cache.incr("version"), 2)
+        self.assertEqual(cache.get("version"), 2)
+        with self.assertRaises(ValueError):
+            cache.incr("missing")
+
+        cache.set("quiz", "x" * 10000)  # moves to a larger slot class
+        self.assertEqual(cache.get("quiz"), "x" * 10000)
+        self.assertTrue(cache.delete("quiz"))
+        self.assertFalse(cache.has_key("quiz"))
+
+        cache.set("key", "v1", version=1)
+        cache.set("key", "v2", version=2)
+        self.assertEqual((cache.get("key", version=1), cache.get("key", version=2)), ("v1", "v2"))
+
+        cache.clear()
+        self.assertIsNone(cache.get("new"))
+
+    def test_expiry(self):
+        self.cache.set("short", 1, timeout=0.05)
+        self.cache.set("forever", 1, timeout=None)
+        self.cache.set("gone", 1, timeout=0)
+        self.assertFalse(self.cache.has_key("gone"))
+        self.assertTrue(self.cache.touch("forever", timeout=0.05))
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get("short"))
+        self.assertIsNone(self.cache.get("forever"))
+
+    def test_values_too_large_for_a_slot_are_not_cached(self):
+        metrics.reset()
+        shared_cache._oversized_logged.clear()
+        self.cache.set("big", "x")
+        with self.assertLogs("core.shared_cache", "WARNING") as logs:
+            self.cache.set("big", "x" * 100000)
+            self.assertIsNone(self.cache.get("big"))
+            self.assertFalse(self.cache.add("big", "x" * 100000))
+            self.cache.set("quiz:payload:1:7", "x" * 100000)
+            self.cache.set("quiz:payload:2:7", "x" * 100000)
+        # once per key class
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("quiz:payload", logs.output[1])
+        self.assertIn('openlearn_shared_cache_oversized_total{key="quiz:payload"} 2', metrics.render_text())
+        self.assertEqual(key_class("auth:user:5:17"), "auth:user")
+
+    def test_full_sets_evict_their_least_recently_used_entry(self):
+        cache = self.make_cache(SLOT_SIZES=[256], WAYS=2)
+        [(_, sets, _)] = cache._table.classes
+        target = cache._locate("k0", None)[2] % sets
+        keys = (f"k{n}" for n in range(20000))
+        first, second, third = [key for key in keys if cache._locate(key, None)[2] % sets == target][:3]
+        cache.set(first, 1)
+        cache.set(second, 2)
+        cache.get(first)
+        cache.set(third, 3)
+        self.assertEqual((cache.get(first), cache.get(second), cache.get(third)), (1, None, 3))
+
+    def test_entries_are_shared_between_processes(self):
+        context = multiprocessing.get_context("fork")
+        writer = context.Process(target=self.cache.set, args=("from-child", "hello"))
+        writer.start()
+        writer.join()
+        self.assertEqual(self.cache.get("from-child"), "hello")
+
+        self.cache.set("counter", 0)
+        workers = [context.Process(target=_increment, args=(self.cache, 200)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(self.cache.get("counter"), 800)
+
+    def test_a_new_layout_starts_empty(self):
+        self.cache.set("key", 1)
+        self.assertEqual(self.make_cache().get("key"), 1)
+        self.assertIsNone(self.make_cache(WAYS=4).get("key"))
@@ -0,0 +1,139 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.views import get_tokens_for_user
+from core import metrics
+from core.models import Session
+from core.singleflight import get_or_build
+from courses.models import Course, Program
+from quizzes.caching import answer_key, enrolled_user_ids, roster_version_key
+from quizzes.models import Choice, Question, Quiz
+
+User = get_user_model()
+
+
+class SingleFlightTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+
+    def test_concurrent_misses_build_once(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": 42}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_build("sf:test", build, 60, "test")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"value": 42}] * 8)
+        body = metrics.render_text()
+        self.assertIn('openlearn_singleflight_total{cache="test",result="miss"} 1', body)
+        self.assertIn('openlearn_singleflight_total{cache="test",result="wait"} 7', body)
+
+        get_or_build("sf:test", build, 60, "test")
+        self.assertIn('openlearn_singleflight_total{cache="test",result="hit"} 1', metrics.render_text())
+
+    def test_waits_for_a_lease_held_by_another_process(self):
+        cache.add("sf:remote:lease", "other-process", 10)
+        threading.Timer(0.1, lambda: cache.set("sf:remote", "theirs", 60)).start()
+        self.assertEqual(get_or_build("sf:remote", lambda: "ours", 60, "test"), "theirs")
+        self.assertIn('openlearn_singleflight_total{cache="test",result="wait"} 1', metrics.render_text())
+
+    @override_settings(SINGLE_FLIGHT_WAIT=0.1)
+    def test_builds_itself_when_the_leader_takes_too_long(self):
+        cache.add("sf:stuck:lease", "other-process", 10)
+        self.assertEqual(get_or_build("sf:stuck", lambda: "ours", 60, "test"), "ours")
+
+    @override_settings(SINGLE_FLIGHT_WAIT=0.1)
+    def test_builds_itself_when_a_leader_in_this_process_stalls(self):
+        release = threading.Event()
+        leader = threading.Thread(target=lambda: get_or_build("sf:stalled", release.wait, 60, "test"))
+        leader.start()
+        self.addCleanup(leader.join)
+        self.addCleanup(release.set)
+        time.sleep(0.05)
+        started = time.monotonic()
+        self.assertEqual(get_or_build("sf:stalled", lambda: "ours", 60, "test"), "ours")
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_none_is_cached(self):
+        calls = []
+        for _ in range(2):
+            self.assertIsNone(get_or_build("sf:none", lambda: calls.append(1), 60, "test"))
+        self.assertEqual(len(calls), 1)
+
+
+class CachedReadsTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username="student", password="pass")
+        program = Program.objects.create(title="Program")
+        course = Course.objects.create(
+            title="Course", code="C-1", program=program, level="bachelor", semester="fall", instructor=cls.student,
+        )
+        course.students.add(cls.student)
+        cls.quiz = Quiz.objects.create(course=course, title="Quiz")
+        cls.question = Question.objects.create(quiz=cls.quiz, text="2+2?", order=1)
+        cls.right = Choice.objects.create(question=cls.question, text="4", is_correct=True)
+        Choice.objects.create(question=cls.question, text="5")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_quiz_payload_is_cached_and_invalidated(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.student)['access']}")
+        url = reverse("quiz-detail", args=[self.quiz.pk])
+        first = self.client.get(url).json()
+        self.assertEqual(len(first["questions"][0]["choices"]), 2)
+        with self.assertNumQueries(1):  # the quiz row for the permission check
+            self.assertEqual(self.client.get(url).json(), first)
+
+        Choice.objects.create(question=self.question, text="6")
+        self.assertEqual(len(self.client.get(url).json()["questions"][0]["choices"]), 3)
+
+    def test_answer_key(self):
+        self.assertEqual(answer_key(self.quiz.pk), {self.question.pk: {self.right.pk}})
+        with self.assertNumQueries(0):
+            answer_key(self.quiz.pk)
+        Question.objects.create(quiz=self.quiz, text="Describe", type=Question.ANATOMICAL)
+        Question.objects.create(quiz=self.quiz, text="1+1?", order=2)
+        self.assertEqual(len(answer_key(self.quiz.pk)), 2)
+
+    def test_evicted_version_does_not_revive_old_entries(self):
+        course = self.quiz.course
+        self.assertEqual(enrolled_user_ids(course.pk), {self.student.pk})
+        course.students.remove(self.student)
+        self.assertEqual(enrolled_user_ids(course.pk), frozenset())
+        cache.delete(roster_version_key(course.pk))  # evicted
+        self.assertEqual(enrolled_user_ids(course.pk), frozenset())
+
+
+class CurrentTermTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_get_current_is_cached_until_a_save(self):
+        self.assertIsNone(Session.get_current())
+        current = Session.objects.create(name="2026/2027", is_current=True)
+        self.assertEqual(Session.get_current(), current)
+        with self.assertNumQueries(0):
+            Session.get_current()
+        current.delete()
+        self.assertIsNone(Session.get_current())
@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import Student
+from accounts.views import get_tokens_for_user
+from courses.models import Course, Program
+from quizzes.models import Choice, Question, Quiz
+
+User = get_user_model()
+
+
+@override_settings(PUBLIC_CACHE_TIMEOUT=0)
+class SparseFieldsTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user(username="instr", password="pass", first_name="Ada")
+        cls.student = User.objects.create_user(username="student", password="pass")
+        Student.objects.get_or_create(user=cls.student)
+        cls.program = Program.objects.create(title="Program")
+        cls.course = Course.objects.create(
+            title="Course", code="C-1", program=cls.program, level="bachelor", semester="fall",
+            instructor=cls.instructor,
+        )
+        cls.course.students.add(cls.student)
+        cls.quiz = Quiz.objects.create(course=cls.course, title="Quiz", draft=False)
+        question = Question.objects.create(quiz=cls.quiz, text="2+2?", order=1)
+        Choice.objects.create(question=question, text="4", is_correct=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def auth(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(user)['access']}")
+
+    def test_without_parameters_output_is_unchanged(self):
+        res = self.client.get(reverse("course-detail", args=[self.course.pk]))
+        self.assertIn("students", res.json())
+        self.assertEqual(res.json()["instructor"]["first_name"], "Ada")
+
+    def test_fields_prune_output_and_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(reverse("course-list") + "?fields=id,title")
+        self.assertEqual(res.json(), [{"id": self.course.pk, "title": "Course"}])
+        sql = ctx.captured_queries[-1]["sql"]
+        self.assertNotIn("JOIN", sql)
+        self.assertNotIn('"summary"', sql)
+
+    def test_dotted_fields_select_inside_nested_serializers(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(reverse("course-list") + "?fields=title,instructor.username")
+        self.assertEqual(res.json(), [{"title": "Course", "instructor": {"username": "instr"}}])
+        sql = ctx.captured_queries[-1]["sql"]
+        self.assertIn("JOIN", sql)
+        self.assertNotIn('"first_name"', sql)
+
+    def test_expand_keeps_plain_fields_and_named_relations(self):
+        res = self.client.get(reverse("course-detail", args=[self.course.pk]) + "?expand=instructor")
+        body = res.json()
+        self.assertIn("title", body)
+        self.assertIn("students_count", body)
+        self.assertIn("instructor", body)
+        self.assertNotIn("students", body)
+
+    def test_nested_many_relations_are_prefetched_only_when_selected(self):
+        self.auth(self.student)
+        url = reverse("quiz-list")
+        # the authenticated user, then the quizzes
+        with self.assertNumQueries(2):
+            res = self.client.get(url + "?fields=id,title")
+        self.assertEqual(res.json(), [{"id": self.quiz.pk, "title": "Quiz"}])
+
+        res = self.client.get(url + "?fields=id,questions.text,questions.choices.text")
+        self.assertEqual(res.json(), [{"id": self.quiz.pk, "questions": [{"text": "2+2?", "choices": [{"text": "4"}]}]}])
+
+    def test_my_courses_and_me(self):
+        self.auth(self.student)
+        res = self.client.get(reverse("course-my-courses") + "?fields=title,instructor")
+        self.assertEqual(res.json(), [{"title": "Course", "instructor": "instr"}])
+
+        res = self.client.get(reverse("user-me") + "?fields=username,student_profile.level")
+        self.assertEqual(set(res.json()), {"username", "student_profile"})
+        self.assertEqual(set(res.json()["student_profile"]), {"level"})
+
+    def test_writes_ignore_the_selection(self):
+        self.auth(self.student)
+        res = self.client.patch(reverse("user-detail", args=[self.student.pk]) + "?fields=id", {"first_name": "Bo"})
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("username", res.json())
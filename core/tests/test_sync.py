@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.views import get_tokens_for_user
+from core import sync
+from core.models import NewsAndEvents, Tombstone
+from courses.models import Course, Program
+from quizzes.models import Choice, Question, Quiz
+
+User = get_user_model()
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncEndpointTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(username="student", password="pass")
+        program = Program.objects.create(title="Program")
+        cls.course = Course.objects.create(
+            title="Course", code="C-1", program=program, level="bachelor", semester="fall", instructor=cls.student,
+        )
+        cls.course.students.add(cls.student)
+        cls.other = Course.objects.create(
+            title="Other", code="C-2", program=program, level="bachelor", semester="fall", instructor=cls.student,
+        )
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.student)['access']}")
+
+    def sync(self, resource, since=None):
+        params = {"since": since} if since else {}
+        res = self.client.get(reverse("sync", args=[resource]), params)
+        self.assertEqual(res.status_code, 200, res.content)
+        return res.json()
+
+    def test_returns_only_what_changed_since_the_cursor(self):
+        first = NewsAndEvents.objects.create(title="First")
+        second = NewsAndEvents.objects.create(title="Second")
+        initial = self.sync("news")
+        self.assertEqual([item["id"] for item in initial["changed"]], [first.pk, second.pk])
+        self.assertEqual(initial["deleted"], [])
+        self.assertFalse(initial["has_more"])
+
+        self.assertEqual(self.sync("news", initial["cursor"])["changed"], [])
+        first.title = "First, edited"
+        first.save()
+        second_id = second.pk
+        second.delete()
+        delta = self.sync("news", initial["cursor"])
+        self.assertEqual([item["title"] for item in delta["changed"]], ["First, edited"])
+        self.assertEqual(delta["deleted"], [second_id])
+
+        after = self.sync("news", delta["cursor"])
+        self.assertEqual((after["changed"], after["deleted"]), ([], []))
+
+    def test_pages_through_large_changes(self):
+        created = [NewsAndEvents.objects.create(title=f"News {i}").pk for i in range(5)]
+        seen, cursor = [], None
+        with override_settings(SYNC_PAGE_SIZE=2):
+            while True:
+                page = self.sync("news", cursor)
+                seen += [item["id"] for item in page["changed"]]
+                cursor = page["cursor"]
+                if not page["has_more"]:
+                    break
+        self.assertEqual(seen, created)
+
+    def test_quizzes_are_scoped_and_follow_their_questions(self):
+        quiz = Quiz.objects.create(course=self.course, title="Quiz")
+        Quiz.objects.create(course=self.other, title="Not enrolled")
+        initial = self.sync("quizzes")
+        self.assertEqual([item["id"] for item in initial["changed"]], [quiz.pk])
+
+        question = Question.objects.create(quiz=quiz, text="Why?")
+        choice = Choice.objects.create(question=question, text="Because", is_correct=True)
+        delta = self.sync("quizzes", initial["cursor"])
+        self.assertEqual(delta["changed"][0]["questions"][0]["text"], "Why?")
+        # no answer key
+        self.assertEqual(delta["changed"][0]["questions"][0]["choices"], [{"id": choice.pk, "text": "Because"}])
+
+        quiz.draft = True
+        quiz.save()
+        hidden = self.sync("quizzes", delta["cursor"])
+        self.assertEqual((hidden["changed"], hidden["deleted"]), ([], [quiz.pk]))
+
+    def test_unopened_quizzes_are_sent_once_they_open(self):
+        quiz = Quiz.objects.create(course=self.course, title="Exam", opens_at=timezone.now() + timedelta(days=2))
+        Choice.objects.create(question=Question.objects.create(quiz=quiz, text="Why?"), text="Because", is_correct=True)
+        initial = self.sync("quizzes")
+        self.assertEqual((initial["changed"], initial["deleted"]), ([], [quiz.pk]))
+
+        # opening does not write the quiz
+        Quiz.objects.filter(pk=quiz.pk).update(opens_at=timezone.now())
+        opened = self.sync("quizzes", initial["cursor"])
+        self.assertEqual([item["id"] for item in opened["changed"]], [quiz.pk])
+        self.assertEqual(self.sync("quizzes", opened["cursor"])["changed"], [])
+
+        Quiz.objects.filter(pk=quiz.pk).update(closes_at=timezone.now())
+        closed = self.sync("quizzes", opened["cursor"])
+        self.assertEqual((closed["changed"], closed["deleted"]), ([], [quiz.pk]))
+
+    def test_enrollment_changes_send_or_delete_course_rows(self):
+        quiz = Quiz.objects.create(course=self.other, title="Other quiz")
+        initial = self.sync("quizzes")
+        self.assertEqual(initial["changed"], [])
+
+        self.other.students.add(self.student)
+        joined = self.sync("quizzes", initial["cursor"])
+        self.assertEqual([item["id"] for item in joined["changed"]], [quiz.pk])
+
+        self.student.courses_enrolled.remove(self.other)
+        left = self.sync("quizzes", joined["cursor"])
+        self.assertEqual((left["changed"], left["deleted"]), ([], [quiz.pk]))
+
+    def test_initial_sync_skips_old_deletions(self):
+        NewsAndEvents.objects.create(title="Gone").delete()
+        self.assertEqual(Tombstone.objects.filter(model="core.newsandevents").count(), 1)
+        self.assertEqual(self.sync("news")["deleted"], [])
+
+    def test_rejects_bad_and_expired_cursors(self):
+        url = reverse("sync", args=["news"])
+        self.assertEqual(self.client.get(url, {"since": "not a cursor"}).status_code, 400)
+        old = timezone.now() - timedelta(days=31)
+        expired = sync.encode_cursor((old, 0), (old, 0), old)
+        self.assertEqual(self.client.get(url, {"since": expired}).status_code, 410)
+        self.assertEqual(self.client.get(reverse("sync", args=["users"])).status_code, 404)
+
+    def test_prunes_old_tombstones(self):
+        Tombstone.objects.all().delete()
+        NewsAndEvents.objects.create(title="Gone").delete()
+        self.assertEqual(sync.prune_tombstones(), 0)
+        self.assertEqual(sync.prune_tombstones(now=timezone.now() + timedelta(days=31)), 1)
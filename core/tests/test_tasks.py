@@ -0,0 +1,108 @@
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from core import metrics, tasks
+from core.models import Task
+
+User = get_user_model()
+
+calls = []
+
+
+@tasks.task
+def record(value):
+    calls.append(value)
+
+
+@tasks.task
+def explode():
+    raise RuntimeError("boom")
+
+
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+        metrics.reset()
+
+    def run_worker(self):
+        call_command("run_tasks", "--concurrency", "1", stdout=StringIO())
+
+    def test_enqueued_tasks_run_in_the_worker(self):
+        record.enqueue(value=1)
+        record.enqueue(value=2, run_at=timezone.now() + timedelta(hours=1))
+        self.assertEqual(calls, [])
+
+        self.run_worker()
+        self.assertEqual(calls, [1])
+        done = Task.objects.get(status=Task.DONE)
+        self.assertEqual((done.attempts, done.locked_by), (1, ""))
+        self.assertTrue(Task.objects.filter(status=Task.PENDING).exists())
+        body = metrics.render_text()
+        self.assertIn('openlearn_tasks_total{task="core.tests.test_tasks.record",result="success"} 1', body)
+        self.assertIn('openlearn_task_duration_seconds_count{task="core.tests.test_tasks.record"} 1', body)
+
+    @override_settings(TASK_RETRY_BACKOFF=10)
+    def test_failures_back_off_then_give_up(self):
+        queued = explode.enqueue(max_attempts=2)
+        self.run_worker()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.PENDING, 1))
+        self.assertGreater(queued.run_at, timezone.now() + timedelta(seconds=5))
+        self.assertIn("RuntimeError: boom", queued.last_error)
+
+        Task.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        self.run_worker()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.FAILED, 2))
+
+    def test_claims_are_exclusive_until_the_lease_expires(self):
+        record.enqueue(value=1)
+        self.assertEqual(len(tasks.claim(10, token="a")), 1)
+        self.assertEqual(tasks.claim(10, token="b"), [])
+
+        Task.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        [reclaimed] = tasks.claim(10, token="b")
+        self.assertEqual(reclaimed.attempts, 2)
+        # the first worker finishing late does not overwrite the new owner's row
+        Task.objects.filter(pk=reclaimed.pk).update(locked_by="b")
+        stale = Task.objects.get(pk=reclaimed.pk)
+        stale.locked_by = "a"
+        tasks.run(stale)
+        self.assertEqual(Task.objects.get(pk=reclaimed.pk).status, Task.RUNNING)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.enqueue(value=3)
+        self.assertEqual(calls, [3])
+        self.assertFalse(Task.objects.exists())
+
+    def test_profile_pictures_are_thumbnailed_in_the_background(self):
+        buffer = BytesIO()
+        Image.new("RGB", (800, 600)).save(buffer, "PNG")
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            user = User.objects.create_user(username="pic", password="pass")
+            self.assertFalse(Task.objects.exists())  # the default picture
+
+            user.picture = SimpleUploadedFile("me.png", buffer.getvalue(), content_type="image/png")
+            user.save()
+            with Image.open(user.picture.path) as img:
+                self.assertEqual(img.size, (800, 600))
+
+            self.run_worker()
+            with Image.open(user.picture.path) as img:
+                self.assertEqual(img.size, (300, 225))
+
+            # saving the user again leaves the picture alone
+            queued = Task.objects.count()
+            user.first_name = "Pic"
+            user.save()
+            self.assertEqual(Task.objects.count(), queued)
@@ -0,0 +1,83 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.views import get_tokens_for_user
+from core import metrics
+from core.throttling import BucketStore, parse_rate
+
+User = get_user_model()
+
+
+class BucketStoreTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = BucketStore(str(Path(directory.name) / "throttle.sqlite3"))
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/min"), (10, 10 / 60))
+        self.assertEqual(parse_rate("2/s"), (2, 2))
+
+    def test_bursts_up_to_capacity_then_refills_at_rate(self):
+        self.assertEqual(self.store.take("k", 2, 1, now=100), (True, 0.0))
+        self.assertEqual(self.store.take("k", 2, 1, now=100), (True, 0.0))
+        allowed, wait = self.store.take("k", 2, 1, now=100.25)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 0.75)
+        # a refused request does not use up the partial refill
+        self.assertEqual(self.store.take("k", 2, 1, now=101)[0], True)
+        self.assertEqual(self.store.take("other", 2, 1, now=101)[0], True)
+        # a long pause refills to capacity, not beyond
+        self.assertEqual([self.store.take("k", 2, 1, now=200)[0] for _ in range(3)], [True, True, False])
+
+    def test_buckets_are_shared_between_connections(self):
+        other = BucketStore(self.store.path)
+        self.assertTrue(self.store.take("k", 1, 1, now=100)[0])
+        self.assertFalse(other.take("k", 1, 1, now=100)[0])
+
+
+class ThrottledEndpointTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="alice", password="pass", is_staff=True, is_superuser=True)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        rates = {"login": "2/min", "search": "1/min"}
+        overrides = override_settings(
+            THROTTLE_ENABLED=True,
+            THROTTLE_STORE_PATH=str(Path(directory.name) / "throttle.sqlite3"),
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        metrics.reset()
+
+    def test_login_is_throttled_per_ip(self):
+        url = reverse("token_obtain_pair")
+        credentials = {"username": "alice", "password": "pass"}
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, credentials, format="json").status_code, 200)
+        # a forged X-Forwarded-For does not get a fresh bucket
+        refused = self.client.post(url, credentials, format="json", HTTP_X_FORWARDED_FOR="2.2.2.2")
+        self.assertEqual(refused.status_code, 429)
+        self.assertIn(refused["Retry-After"], ("29", "30"))
+        self.assertIn('openlearn_throttled_total{scope="login"} 1', metrics.render_text())
+
+        other_ip = self.client.post(url, credentials, format="json", REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(other_ip.status_code, 200)
+
+    def test_search_is_throttled_per_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['access']}")
+        url = reverse("user-list")
+        self.assertEqual(self.client.get(url, {"search": "al"}).status_code, 200)
+        self.assertEqual(self.client.get(url, {"search": "al"}).status_code, 429)
+        # plain listing has no scope
+        self.assertEqual(self.client.get(url).status_code, 200)
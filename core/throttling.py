@@ -0,0 +1,141 @@
+"""
+Token-bucket throttling shared by all worker processes on a host.
+
+Buckets live in a small SQLite database in WAL mode (``THROTTLE_STORE_PATH``)
+instead of the Django cache: a check is one ``INSERT ... ON CONFLICT DO
+UPDATE ... RETURNING`` statement that refills the bucket for the time since
+its last use, takes a token if there is one and reports the outcome, so it is
+atomic across workers without a read-modify-write round trip. Each bucket is
+one row, whatever the rate.
+
+Rates are DRF's ``DEFAULT_THROTTLE_RATES`` (``"10/min"``: bursts of up to 10,
+refilled at 10 per minute). Authenticated requests get a bucket per user,
+anonymous ones per client IP. Refused requests get ``429`` with
+``Retry-After`` set to when the next token is due.
+"""
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from . import metrics
+
+_DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# tokens available at :now, before this request takes one
+_REFILL = "min(:capacity, bucket.tokens + max(:now - bucket.updated, 0) * :rate)"
+
+_TAKE = f"""
+INSERT INTO bucket (key, tokens, updated, full_at, allowed)
+VALUES (:key, :capacity - 1, :now, :now + 1 / :rate, 1)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = {_REFILL} - ({_REFILL} >= 1),
+    full_at = :now + (:capacity - {_REFILL} + ({_REFILL} >= 1)) / :rate,
+    allowed = {_REFILL} >= 1,
+    updated = :now
+RETURNING allowed, tokens
+"""
+
+# fraction of checks that also drop buckets that have refilled completely
+_PRUNE_PROBABILITY = 0.001
+
+
+def parse_rate(rate):
+    """``"10/min"`` -> ``(10, 10 / 60)``: bucket capacity and tokens per second."""
+    num, period = rate.split("/")
+    capacity = int(num)
+    return capacity, capacity / _DURATIONS[period[0]]
+
+
+class BucketStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS bucket ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL,"
+                " full_at REAL NOT NULL, allowed INTEGER NOT NULL) WITHOUT ROWID"
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def take(self, key, capacity, rate, now=None):
+        """Take a token from ``key``'s bucket; returns ``(allowed, seconds until the next token)``."""
+        now = time.time() if now is None else now
+        conn = self._connection()
+        allowed, tokens = conn.execute(
+            _TAKE, {"key": key, "capacity": capacity, "rate": rate, "now": now}
+        ).fetchone()
+        if random.random() < _PRUNE_PROBABILITY:
+            conn.execute("DELETE FROM bucket WHERE full_at < ?", (now,))
+        return bool(allowed), 0.0 if allowed else (1 - tokens) / rate
+
+    def clear(self):
+        self._connection().execute("DELETE FROM bucket")
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None or _store.path != settings.THROTTLE_STORE_PATH:
+        _store = BucketStore(settings.THROTTLE_STORE_PATH)
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttles views by their ``throttle_scope`` (set on the class or per
+    ``@action``); views without a scope, or whose scope has no rate, are
+    not throttled.
+    """
+
+    scope = None
+
+    def get_scope(self, request, view):
+        return self.scope or getattr(view, "throttle_scope", None)
+
+    def allow_request(self, request, view):
+        if not settings.THROTTLE_ENABLED:
+            return True
+        scope = self.get_scope(request, view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        if rate is None:
+            return True
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        allowed, self._wait = get_store().take(f"{scope}:{ident}", *parse_rate(rate))
+        if not allowed:
+            metrics.THROTTLED.inc(scope=scope)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class LoginThrottle(TokenBucketThrottle):
+    scope = "login"
+
+
+class SearchThrottle(TokenBucketThrottle):
+    """Applies the ``search`` scope to any request with a ``?search=`` query."""
+
+    scope = "search"
+
+    def get_scope(self, request, view):
+        return self.scope if request.query_params.get("search") else None
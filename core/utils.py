@@ -1,4 +1,16 @@
 import uuid
 
 def unique_slug_generator(instance):
-    return str(uuid.uuid4())[:8]
\ No newline at end of file
+    return str(uuid.uuid4())[:8]
+
+
+def view_label(view_func, method):
+    """
+    Human readable name of the view handling a request, e.g.
+    ``QuizAttemptViewSet.complete`` for DRF viewsets or ``SomeView.get``.
+    """
+    cls = getattr(view_func, "cls", None)
+    if cls is None:
+        return getattr(view_func, "__qualname__", repr(view_func))
+    actions = getattr(view_func, "actions", None) or {}
+    return f"{cls.__name__}.{actions.get(method.lower(), method.lower())}"
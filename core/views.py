@@ -1,16 +1,25 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from . import sync
+from .batch import run_batch
+from .dashboard import get_dashboard
+from .feed import InvalidCursor, get_feed
+from .http_cache import PublicCacheMixin
+from .sparse import SparseFieldsMixin
 from .models import NewsAndEvents, Session, Semester, ActivityLog
 from .serializers import (
     NewsAndEventsSerializer,
     SessionSerializer, 
     SemesterSerializer,
-    ActivityLogSerializer
+    ActivityLogSerializer,
+    BatchSerializer,
 )
 
-class NewsAndEventsViewSet(viewsets.ModelViewSet):
+class NewsAndEventsViewSet(PublicCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    public_cache_namespace = "news"
     queryset = NewsAndEvents.objects.all().order_by("-created_at")
     serializer_class = NewsAndEventsSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
@@ -29,7 +38,7 @@ class NewsAndEventsViewSet(viewsets.ModelViewSet):
             qs = qs.filter(posted_as=post_type)
         return qs
 
-class SessionViewSet(viewsets.ModelViewSet):
+class SessionViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Session.objects.all().order_by("-created_at")
     serializer_class = SessionSerializer 
     permission_classes = [permissions.IsAdminUser]
@@ -47,7 +56,7 @@ class SessionViewSet(viewsets.ModelViewSet):
             return Response({"detail": "No current session set."}, status=status.HTTP_404_NOT_FOUND)
         return Response(self.get_serializer(current).data, status=status.HTTP_200_OK)
 
-class SemesterViewSet(viewsets.ModelViewSet):
+class SemesterViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Semester.objects.all().order_by("-created_at")
     serializer_class = SemesterSerializer
     permission_classes = [permissions.IsAdminUser]
@@ -64,7 +73,66 @@ class SemesterViewSet(viewsets.ModelViewSet):
             return Response({"detail": "No current semester set."}, status=status.HTTP_404_NOT_FOUND)
         return Response(self.get_serializer(current).data, status=status.HTTP_200_OK)
 
-class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
+class ActivityLogViewSet(SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ActivityLog.objects.all().order_by("-created_at")
     serializer_class = ActivityLogSerializer
     permission_classes = [permissions.IsAdminUser]
+
+
+class DashboardView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = 6
+
+    def get(self, request):
+        return Response(get_dashboard(request.user))
+
+
+class BatchView(APIView):
+    """
+    /api/batch/: runs several GET requests for the authenticated user in one
+    round trip (see ``core.batch``).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        paths = [item["path"] for item in serializer.validated_data["requests"]]
+        return Response({"responses": run_batch(request, paths)})
+
+
+class SyncView(APIView):
+    """
+    /api/sync/<resource>/?since=<cursor>: what changed in ``resource`` since
+    the cursor of the previous call (see ``core.sync``).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, resource):
+        if resource not in sync.RESOURCES:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return Response(sync.changes(resource, request.user, request.query_params.get("since")))
+        except sync.InvalidCursor:
+            return Response({"since": ["Invalid sync cursor."]}, status=status.HTTP_400_BAD_REQUEST)
+        except sync.CursorExpired:
+            return Response(
+                {"detail": "The sync cursor has expired; sync again without `since`."}, status=status.HTTP_410_GONE,
+            )
+
+
+class FeedView(APIView):
+    """
+    /api/feed/?cursor=<cursor>: the authenticated student's activity feed,
+    newest first (see ``core.feed``).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            return Response(get_feed(request.user, request.query_params.get("cursor")))
+        except InvalidCursor:
+            return Response({"cursor": ["Invalid feed cursor."]}, status=status.HTTP_400_BAD_REQUEST)
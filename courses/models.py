@@ -81,11 +81,15 @@ class Course(models.Model):
     instructor = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="courses_taught"
     )
+    students = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name="courses_enrolled", blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     objects = CourseManager()
 
     class Meta:
         ordering = ("-id",)
+        # delta sync keyset (core.sync)
+        indexes = [models.Index(fields=["updated_at", "id"], name="course_sync_idx")]
 
     def __str__(self):
         return f"{self.title} ({self.code})"
@@ -103,7 +107,7 @@ def course_pre_save(sender, instance, **kwargs):
 @receiver(post_save, sender=Course)
 def log_course_save(sender, instance, created, **kwargs):
     verb = "created" if created else "updated"
-    ActivityLog.objects.create(message=_(f"The course '{instance}' has been {verb}."))
+    ActivityLog.objects.create(message=_(f"The course '{instance}' has been {verb}."), course=instance)
 
 
 @receiver(post_delete, sender=Course)
@@ -121,10 +125,15 @@ class CourseOffering(models.Model):
     is_elective = models.BooleanField(default=False)
     capacity = models.PositiveIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ("-created_at",)
-        indexes = [models.Index(fields=["session", "semester"]), models.Index(fields=["course"])]
+        indexes = [
+            models.Index(fields=["session", "semester"]),
+            models.Index(fields=["course"]),
+            models.Index(fields=["updated_at", "id"], name="offering_sync_idx"),
+        ]
 
     def __str__(self):
         session_label = str(self.session) if self.session else "NoSession"
@@ -167,6 +176,10 @@ class Resource(models.Model):
     file = models.FileField(upload_to="course_resources/")
     summary = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["updated_at", "id"], name="resource_sync_idx")]
 
     def __str__(self):
         return self.title
@@ -189,12 +202,14 @@ def resource_pre_save(sender, instance, **kwargs):
 def log_resource_save(sender, instance, created, **kwargs):
     verb = "uploaded" if created else "updated"
     ActivityLog.objects.create(
-        message=_(f"The {instance.resource_type} '{instance.title}' has been {verb} to course '{instance.course}'.")
+        message=_(f"The {instance.resource_type} '{instance.title}' has been {verb} to course '{instance.course}'."),
+        course_id=instance.course_id,
     )
 
 
 @receiver(post_delete, sender=Resource)
 def log_resource_delete(sender, instance, **kwargs):
     ActivityLog.objects.create(
-        message=_(f"The {instance.resource_type} '{instance.title}' of course '{instance.course}' has been deleted.")
+        message=_(f"The {instance.resource_type} '{instance.title}' of course '{instance.course}' has been deleted."),
+        course_id=instance.course_id,
     )
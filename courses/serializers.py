@@ -1,9 +1,11 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from .models import Course
+from core.fastpath import FastSerializer
 
-User = get_user_model
+from .models import Course, CourseOffering, Resource
+
+User = get_user_model()
 
 
 class SimpleUserSerializer(serializers.ModelSerializer):
@@ -21,30 +23,78 @@ class CourseSerializer(serializers.ModelSerializer):
     instructor = SimpleUserSerializer(read_only=True)
     students = SimpleUserSerializer(many=True, read_only=True)
     students_count = serializers.SerializerMethodField(read_only=True)
-    category = CategoryField(read_only=True)
 
     class Meta:
         model = Course
         fields = [
             "id",
+            "slug",
             "title",
-            "description",
-            "category",
+            "code",
+            "credit",
+            "summary",
+            "program",
+            "level",
+            "year",
+            "semester",
+            "is_elective",
             "instructor",
             "students",
             "students_count",
-            "created_at",
-            "updated_at",
         ]
-        read_only_fields = ["instructor", "students", "students_count", "created_at", "updated_at"]
+        read_only_fields = ["slug", "instructor", "students", "students_count"]
 
     def get_students_count(self, obj):
+        annotated = getattr(obj, "students_count", None)
+        if annotated is not None:
+            return annotated
         return obj.students.count()
+
+
+class CourseListSerializer(CourseSerializer):
+    """
+    Catalogue representation: no roster, ``students_count`` comes from the
+    queryset annotation (see ``CourseViewSet.get_queryset``).
+    """
+    students_count = serializers.IntegerField(read_only=True)
+
+    class Meta(CourseSerializer.Meta):
+        fields = [f for f in CourseSerializer.Meta.fields if f != "students"]
+
+
+class CourseSyncSerializer(CourseSerializer):
+    """
+    Delta sync representation (``core.sync``): no roster or count, which
+    change without touching the course's ``updated_at``.
+    """
+
+    class Meta(CourseSerializer.Meta):
+        fields = [f for f in CourseSerializer.Meta.fields if f not in ("students", "students_count")] + ["updated_at"]
+
     
 class EnrolledCourseSerializer(serializers.ModelSerializer):
     instructor = serializers.CharField(source="instructor.username", read_only=True)
-    category = CategoryField(read_only=True)
+    program = CategoryField(read_only=True)
 
     class Meta:
         model = Course
-        fields = ["id", "title", "description", "category", "instructor"]
+        fields = ["id", "title", "summary", "program", "instructor"]
+
+
+class FastEnrolledCourseSerializer(FastSerializer):
+    serializer_class = EnrolledCourseSerializer
+    custom = {
+        "program": (("program_id", "program__title"), lambda pk, title: {"id": pk, "title": title}),
+    }
+
+
+class CourseOfferingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CourseOffering
+        fields = ["id", "course", "session", "semester", "instructor", "is_elective", "capacity", "created_at", "updated_at"]
+
+
+class ResourceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Resource
+        fields = ["id", "title", "slug", "course", "resource_type", "file", "summary", "created_at", "updated_at"]
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from courses.models import Course, Program
+
+User = get_user_model()
+
+
+# PUBLIC_CACHE_TIMEOUT=0: measure the views, not the anonymous response cache
+@override_settings(QUERY_BUDGET_STRICT=True, PUBLIC_CACHE_TIMEOUT=0)
+class CourseCatalogueTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user(username="instr", password="pass")
+        cls.program = Program.objects.create(title="Program")
+        cls.students = [User.objects.create_user(username=f"s{i}", password="pass") for i in range(7)]
+        cls.courses = []
+        for i in range(5):
+            course = Course.objects.create(
+                title=f"Course {i}", code=f"C-{i}", program=cls.program, level="bachelor",
+                semester="fall", instructor=cls.instructor,
+            )
+            course.students.add(*cls.students[: i + 1])
+            cls.courses.append(course)
+
+    def test_list_annotates_counts_and_omits_roster(self):
+        with self.assertNumQueries(1):
+            res = self.client.get(reverse("course-list"))
+        self.assertEqual(res.status_code, 200)
+        counts = {row["id"]: row["students_count"] for row in res.json()}
+        self.assertEqual(counts, {c.pk: i + 1 for i, c in enumerate(self.courses)})
+        self.assertNotIn("students", res.json()[0])
+        self.assertEqual(res.json()[0]["instructor"]["username"], "instr")
+
+    def test_retrieve_keeps_roster(self):
+        res = self.client.get(reverse("course-detail", args=[self.courses[2].pk]))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["students_count"], 3)
+        self.assertEqual(len(res.json()["students"]), 3)
+
+    def test_roster_sub_resource_is_paginated(self):
+        self.client.force_authenticate(user=self.instructor)
+        url = reverse("course-students", args=[self.courses[4].pk])
+        res = self.client.get(url, {"page_size": 2})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["count"], 5)
+        self.assertEqual([u["username"] for u in res.json()["results"]], ["s0", "s1"])
+
+    def test_roster_requires_authentication(self):
+        res = self.client.get(reverse("course-students", args=[self.courses[0].pk]))
+        self.assertEqual(res.status_code, 401)
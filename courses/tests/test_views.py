@@ -5,7 +5,7 @@ from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 
-from .models import Course, Enrollment, Lesson, UserLessonProgress
+from ..models import Course, Enrollment, Lesson, UserLessonProgress
 
 User = get_user_model()
 
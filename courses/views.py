@@ -1,24 +1,80 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.contrib.auth import get_user_model
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 
+from core.http_cache import PublicCacheMixin
+from core.idempotency import idempotent
+from core.sparse import SparseFieldsMixin
+
 from .models import Course
-from .serializers import CourseSerializer, EnrolledCourseSerializer
+from .serializers import (
+    CourseListSerializer,
+    CourseSerializer,
+    EnrolledCourseSerializer,
+    FastEnrolledCourseSerializer,
+    SimpleUserSerializer,
+)
 from .permissions import IsAdminOrInstructorOwnerOrReadOnly
 
+User = get_user_model()
+
+LIST_COLUMNS = (
+    "id", "slug", "title", "code", "credit", "summary", "program_id", "level", "year",
+    "semester", "is_elective", "instructor__id", "instructor__username",
+    "instructor__first_name", "instructor__last_name",
+)
+
+
+def students_count_subquery():
+    enrollments = (
+        Course.students.through.objects.filter(course_id=OuterRef("pk"))
+        .order_by()
+        .values("course_id")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(enrollments, output_field=IntegerField()), 0)
+
 
-class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.all().select_related("category", "instructor").prefetch_related("students")
+class RosterPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class CourseViewSet(PublicCacheMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    queryset = Course.objects.all().select_related("program", "instructor")
+    public_cache_namespace = "courses"
     serializer_class = CourseSerializer
+    query_budget = {"list": 2, "retrieve": 3, "students": 4}
+
+    def get_queryset(self):
+        qs = super().get_queryset().annotate(students_count=students_count_subquery())
+        if self.action == "list":
+            return qs.only(*LIST_COLUMNS)
+        if self.action == "retrieve":
+            return qs.prefetch_related("students")
+        return qs
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return CourseListSerializer
+        if self.action == "my_courses":
+            return EnrolledCourseSerializer
+        return CourseSerializer
 
     def get_permissions(self):
         if self.action == 'create':
             return [permissions.IsAdminUser()]
         if self.action in ['update', 'partial_update', 'destroy']:
             return [permissions.IsAuthenticated(), IsAdminOrInstructorOwnerOrReadOnly()]
-        if self.action in ['enroll', 'unenroll', 'my_courses']:
+        if self.action in ['enroll', 'unenroll', 'my_courses', 'students']:
             return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
 
@@ -26,10 +82,11 @@ class CourseViewSet(viewsets.ModelViewSet):
         serializer.save(instructor=self.request.user)
 
     @action(detail=True, methods=['post'])
+    @idempotent
     def enroll(self, request, pk=None):
         course = self.get_object()
         user = request.user
-        if course.students.filter(pk=user.pk).exists:
+        if course.students.filter(pk=user.pk).exists():
             return Response({"detail": "You are already enrolled."}, status=status.HTTP_400_BAD_REQUEST)
         course.students.add(user)
         return Response({"message": f"Successfully enrolled in {course.title}."},status=status.HTTP_201_CREATED)
@@ -45,7 +102,19 @@ class CourseViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def my_courses(self, request):
-        qs = Course.objects.filter(students=request.user).select_related("category", "instructor")
-        serializer = EnrolledCourseSerializer(qs, many=True, context={"request": request})
-        return Response(serializer.data)
+        qs = Course.objects.filter(students=request.user)
+        if self.sparse_tree() is None:
+            return Response(FastEnrolledCourseSerializer(qs).data)
+        qs = self.sparse_queryset(qs.select_related("program", "instructor"))
+        return Response(self.get_serializer(qs, many=True).data)
+
+    @action(detail=True, methods=["get"])
+    def students(self, request, pk=None):
+        course = get_object_or_404(Course.objects.only("id"), pk=pk)
+        roster = User.objects.filter(courses_enrolled=course).order_by("id").only(
+            "id", "username", "first_name", "last_name"
+        )
+        paginator = RosterPagination()
+        page = paginator.paginate_queryset(roster, request, view=self)
+        return paginator.get_paginated_response(SimpleUserSerializer(page, many=True).data)
 
@@ -0,0 +1,52 @@
+"""
+K-way merge of already sorted sequences.
+
+``merge_sorted_lists`` keeps one pending item per input in a heap, so
+merging ``k`` inputs costs ``O(log k)`` per item yielded and never reads
+further into an input than what it yields.
+"""
+import heapq
+
+
+class _Descending:
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+def merge_sorted_lists(lists, key=None, reverse=False, limit=None):
+    """
+    Yield the items of ``lists`` (iterables each sorted by ``key``, in
+    descending order with ``reverse``) as one sorted stream, at most
+    ``limit`` of them. Equal items come out in the order of their inputs.
+    """
+    if limit is not None and limit <= 0:
+        return
+    key = key or (lambda item: item)
+    wrap = _Descending if reverse else (lambda value: value)
+    heap = []
+    for index, iterable in enumerate(lists):
+        iterator = iter(iterable)
+        for item in iterator:
+            heap.append((wrap(key(item)), index, item, iterator))
+            break
+    heapq.heapify(heap)
+    yielded = 0
+    while heap:
+        _, index, item, iterator = heap[0]
+        yield item
+        yielded += 1
+        if yielded == limit:
+            return
+        for following in iterator:
+            heapq.heapreplace(heap, (wrap(key(following)), index, following, iterator))
+            break
+        else:
+            heapq.heappop(heap)
@@ -52,4 +52,11 @@ axiosInstance.interceptors.response.use(
   }
 );
 
+// Several GETs in one round trip through /api/batch/; resolves to one
+// { path, status, headers, body } entry per path, in order.
+export const batchGet = paths =>
+  axiosInstance
+    .post('/api/batch/', { requests: paths.map(path => ({ path })) })
+    .then(res => res.data.responses);
+
 export default axiosInstance;
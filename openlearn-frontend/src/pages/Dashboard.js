@@ -3,11 +3,13 @@ import axiosInstance from '../axiosInstance';
 
 function Dashboard() {
   const [message, setMessage] = useState('');
+  const [dashboard, setDashboard] = useState(null);
 
   useEffect(() => {
     axiosInstance.get('/api/dashboard/')
       .then(res => {
         setMessage(`👋 Welcome, ${res.data.username || 'User'}!`);
+        setDashboard(res.data);
       })
       .catch(err => {
         console.error(err);
@@ -26,6 +28,27 @@ function Dashboard() {
       <h2>Dashboard</h2>
       <p>{message}</p>
 
+      {dashboard && (
+        <>
+          {dashboard.session && <p>Session: {dashboard.session.name}</p>}
+          <h3>My courses</h3>
+          <ul>
+            {dashboard.courses.map(course => (
+              <li key={course.id}>{course.title}</li>
+            ))}
+          </ul>
+          <h3>Quizzes</h3>
+          <ul>
+            {dashboard.quizzes.map(quiz => (
+              <li key={quiz.id}>
+                {quiz.title}
+                {quiz.latest_score !== null && ` — last score ${quiz.latest_score}%`}
+              </li>
+            ))}
+          </ul>
+        </>
+      )}
+
       {localStorage.getItem('access') && (
         <button onClick={handleLogout} style={{ marginTop: '20px' }}>
           🚪 Logout
@@ -0,0 +1,131 @@
+"""
+Cached quiz payloads, answer keys and course rosters.
+
+All three are read by every student of a course within seconds of a quiz
+opening, so they are filled through ``core.singleflight`` (and pre-warmed
+by ``publish_quizzes``). Quiz entries embed a per-quiz version that any
+change to the quiz, its questions or its choices bumps; rosters a
+per-course version bumped on enrollment changes. Payloads keep a stale copy
+served while the database is saturated (``core.degrade``); answer keys and
+rosters never go stale, as scores and access depend on them.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache_versions import bump_versions, current_version
+from core.degrade import store_stale
+from core.singleflight import get_or_build
+from courses.models import Course
+
+from .models import Choice, Question, Quiz
+from .serializers import QuizSerializer
+
+
+def quiz_version_key(quiz_id):
+    return f"quiz:version:{quiz_id}"
+
+
+def _versioned_key(kind, quiz_id):
+    return f"quiz:{kind}:{quiz_id}:{current_version(quiz_version_key(quiz_id))}"
+
+
+def _stale_key(quiz_id):
+    return f"quiz:payload:{quiz_id}:stale"
+
+
+def quiz_payload(quiz_id):
+    """``QuizSerializer`` output for the quiz, questions and choices included."""
+
+    def build():
+        quiz = Quiz.objects.prefetch_related("questions__choices").get(pk=quiz_id)
+        return dict(QuizSerializer(quiz).data)
+
+    timeout = getattr(settings, "QUIZ_CACHE_TIMEOUT", 600)
+    return get_or_build(
+        _versioned_key("payload", quiz_id), build, timeout, "quiz_payload", stale_key=_stale_key(quiz_id)
+    )
+
+
+def answer_key(quiz_id):
+    """``{question_id: {correct choice ids}}`` for the multiple choice questions of the quiz."""
+
+    def build():
+        key = {
+            question_id: set()
+            for question_id in Question.objects.filter(quiz_id=quiz_id, type=Question.MULTIPLE_CHOICE)
+            .values_list("pk", flat=True)
+        }
+        correct = Choice.objects.filter(question_id__in=key, is_correct=True).values_list("question_id", "pk")
+        for question_id, choice_id in correct:
+            key[question_id].add(choice_id)
+        return key
+
+    timeout = getattr(settings, "QUIZ_CACHE_TIMEOUT", 600)
+    return get_or_build(_versioned_key("answer_key", quiz_id), build, timeout, "quiz_answer_key")
+
+
+def mark_published(quiz_id):
+    """
+    Flip ``draft`` in a pre-warmed payload after a queryset update published
+    the quiz; the update sends no signal, so the entry stays current.
+    """
+    key = _versioned_key("payload", quiz_id)
+    payload = cache.get(key)
+    if payload is not None:
+        payload = {**payload, "draft": False}
+        cache.set(key, payload, getattr(settings, "QUIZ_CACHE_TIMEOUT", 600))
+        store_stale(_stale_key(quiz_id), payload)
+
+
+def roster_version_key(course_id):
+    return f"course:roster:version:{course_id}"
+
+
+def enrolled_user_ids(course_id):
+    """Ids of the users enrolled in the course, as a frozenset."""
+
+    def build():
+        return frozenset(Course.students.through.objects.filter(course_id=course_id).values_list("user_id", flat=True))
+
+    key = f"course:roster:{course_id}:{current_version(roster_version_key(course_id))}"
+    return get_or_build(key, build, getattr(settings, "QUIZ_CACHE_TIMEOUT", 600), "course_roster")
+
+
+def invalidate_quizzes(quiz_ids):
+    bump_versions(quiz_version_key(quiz_id) for quiz_id in quiz_ids)
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def quiz_changed(sender, instance, **kwargs):
+    invalidate_quizzes([instance.pk])
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, **kwargs):
+    invalidate_quizzes([instance.quiz_id])
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def choice_changed(sender, instance, **kwargs):
+    quiz_id = Question.objects.filter(pk=instance.question_id).values_list("quiz_id", flat=True).first()
+    if quiz_id is not None:
+        invalidate_quizzes([quiz_id])
+
+
+@receiver(m2m_changed, sender=Course.students.through)
+def roster_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove"):
+        course_ids = pk_set if reverse else [instance.pk]
+    elif action == "post_clear" and not reverse:
+        course_ids = [instance.pk]
+    elif action == "pre_clear" and reverse:
+        # clear() does not report the courses left, read them beforehand
+        course_ids = Course.students.through.objects.filter(user_id=instance.pk).values_list("course_id", flat=True)
+    else:
+        return
+    bump_versions(roster_version_key(course_id) for course_id in course_ids)
@@ -0,0 +1,23 @@
+from core.management.periodic import PeriodicCommand
+from quizzes.models import QuizAttempt
+
+
+class Command(PeriodicCommand):
+    help = "Auto-complete quiz attempts whose time limit has passed."
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def run_once(self, **options):
+        completed = self.sweep(options["batch_size"])
+        if completed:
+            self.stdout.write(f"Completed {completed} expired attempt(s).")
+
+    def sweep(self, batch_size):
+        total = 0
+        while True:
+            completed = QuizAttempt.objects.complete_expired(batch_size=batch_size)
+            total += completed
+            if completed < batch_size:
+                return total
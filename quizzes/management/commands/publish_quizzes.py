@@ -0,0 +1,21 @@
+from core.management.periodic import PeriodicCommand
+from quizzes.scheduling import prewarm_upcoming, publish_due
+
+
+class Command(PeriodicCommand):
+    help = "Warm the caches of scheduled quizzes shortly before they open, then publish them."
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--lead",
+            type=int,
+            default=None,
+            help="Seconds before opens_at to warm caches (default: QUIZ_PREWARM_LEAD).",
+        )
+
+    def run_once(self, **options):
+        warmed = prewarm_upcoming(lead=options["lead"])
+        published = publish_due()
+        if warmed or published:
+            self.stdout.write(f"Warmed {warmed} and published {published} quiz(zes).")
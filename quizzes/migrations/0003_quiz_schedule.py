@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_students'),
+        ('quizzes', '0002_quiz_time_limit_quizattempt_expires_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='closes_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='opens_at',
+            field=models.DateTimeField(blank=True, help_text='Drafts are published at this time by the publish_quizzes command', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(condition=models.Q(('draft', False)), fields=['course', 'opens_at', 'closes_at'], name='quiz_course_schedule_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(condition=models.Q(('draft', True)), fields=['opens_at'], name='quiz_scheduled_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_sync_updated_at'),
+        ('quizzes', '0003_quiz_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['updated_at', 'id'], name='quiz_sync_idx'),
+        ),
+    ]
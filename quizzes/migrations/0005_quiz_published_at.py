@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_published_at(apps, schema_editor):
+    Quiz = apps.get_model('quizzes', 'Quiz')
+    Quiz.objects.filter(draft=False).update(published_at=Coalesce('opens_at', 'created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_sync_updated_at'),
+        ('quizzes', '0004_quiz_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='published_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(condition=models.Q(('draft', False)), fields=['course', '-published_at', '-id'], name='quiz_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(condition=models.Q(('completed_at__isnull', False)), fields=['user', '-completed_at', '-id'], name='qa_user_completed_idx'),
+        ),
+    ]
@@ -1,11 +1,32 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Case, Count, DecimalField, Q, Value, When
 from django.utils import timezone
 
+from .signals import attempts_completed
+
 USER_MODEL = settings.AUTH_USER_MODEL
 
 # --- QUIZZES ---
+class QuizQuerySet(models.QuerySet):
+    def open(self, now=None):
+        """Published quizzes inside their ``opens_at``/``closes_at`` window (both optional)."""
+        now = now or timezone.now()
+        return self.filter(
+            Q(opens_at__isnull=True) | Q(opens_at__lte=now),
+            Q(closes_at__isnull=True) | Q(closes_at__gt=now),
+            draft=False,
+        )
+
+    def due_to_open(self, until):
+        """Drafts scheduled to open at or before ``until``."""
+        return self.filter(draft=True, opens_at__lte=until)
+
+
 class Quiz(models.Model):
     course = models.ForeignKey(
         "courses.Course",
@@ -18,17 +39,58 @@ class Quiz(models.Model):
     single_attempt = models.BooleanField(default=False)
     pass_mark = models.PositiveSmallIntegerField(default=50)
     draft = models.BooleanField(default=False)
+    time_limit = models.PositiveIntegerField(null=True, blank=True, help_text="Time limit in minutes")
+    opens_at = models.DateTimeField(
+        null=True, blank=True, help_text="Drafts are published at this time by the publish_quizzes command",
+    )
+    closes_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # set when the quiz first leaves draft, for students' feeds (core.feed)
+    published_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # also bumped by question and choice changes (core.sync)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = QuizQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # open quizzes of a course: Quiz.objects.open().filter(course=...)
+            models.Index(
+                fields=["course", "opens_at", "closes_at"],
+                name="quiz_course_schedule_idx",
+                condition=Q(draft=False),
+            ),
+            models.Index(fields=["opens_at"], name="quiz_scheduled_idx", condition=Q(draft=True)),
+            # delta sync keyset (core.sync)
+            models.Index(fields=["updated_at", "id"], name="quiz_sync_idx"),
+            # newly published quizzes of a course, newest first (core.feed)
+            models.Index(
+                fields=["course", "-published_at", "-id"], name="quiz_feed_idx", condition=Q(draft=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({getattr(self.course, 'title', 'No course')})"
 
+    def save(self, *args, **kwargs):
+        if not self.draft and self.published_at is None:
+            self.published_at = timezone.now()
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "published_at"}
+        super().save(*args, **kwargs)
+
     def clean(self):
         if not (0 <= self.pass_mark <= 100):
             raise ValidationError("pass_mark must be between 0 and 100")
+        if self.opens_at and self.closes_at and self.closes_at <= self.opens_at:
+            raise ValidationError("closes_at must be after opens_at")
+
+    def is_open(self, now=None):
+        now = now or timezone.now()
+        if self.draft or (self.opens_at and now < self.opens_at):
+            return False
+        return not (self.closes_at and now >= self.closes_at)
 
     def max_score(self):
         return self.questions.filter(type=Question.MULTIPLE_CHOICE).count()
@@ -44,6 +106,13 @@ class Quiz(models.Model):
             return True
         return not self.user_has_completed_attempt(user)
 
+    def expiry_for(self, started_at):
+        """When an attempt started at ``started_at`` closes: the time limit, cut short by ``closes_at``."""
+        if not self.time_limit:
+            return self.closes_at
+        expires_at = started_at + timedelta(minutes=self.time_limit)
+        return min(expires_at, self.closes_at) if self.closes_at else expires_at
+
 
 # --- QUESTIONS & CHOICES ---
 class Question(models.Model):
@@ -77,19 +146,84 @@ class Choice(models.Model):
 
 
 # --- QUIZ ATTEMPTS ---
+def score_percentage(correct, total):
+    if not total:
+        return 0.0
+    return float(round((correct / total) * 100.0, 2))
+
+
 class QuizAttemptManager(models.Manager):
     def start_attempt(self, user, quiz):
         if not quiz.allow_new_attempt_for_user(user):
             raise ValidationError("User is not allowed another attempt for this quiz.")
         attempts_count = self.filter(user=user, quiz=quiz).count()
         attempt_number = attempts_count + 1
+        started_at = timezone.now()
         attempt = self.create(
             user=user,
             quiz=quiz,
             attempt_number=attempt_number,
-            started_at=timezone.now(),
+            started_at=started_at,
+            expires_at=quiz.expiry_for(started_at),
         )
+        return attempt
 
+    def expired(self, now=None):
+        now = now or timezone.now()
+        return self.filter(completed_at__isnull=True, expires_at__lte=now)
+
+    def bulk_scores(self, attempt_ids):
+        """
+        Return {attempt_id: score} for the given attempts using two aggregate
+        queries, whatever the number of attempts.
+        """
+        rows = (
+            self.filter(pk__in=attempt_ids)
+            .values("pk", "quiz_id")
+            .annotate(
+                correct=Count(
+                    "answers",
+                    filter=Q(
+                        answers__question__type=Question.MULTIPLE_CHOICE,
+                        answers__selected_choice__is_correct=True,
+                    ),
+                )
+            )
+        )
+        rows = list(rows)
+        totals = dict(
+            Question.objects.filter(
+                quiz_id__in={row["quiz_id"] for row in rows},
+                type=Question.MULTIPLE_CHOICE,
+            )
+            .values_list("quiz_id")
+            .annotate(total=Count("pk"))
+        )
+        return {
+            row["pk"]: score_percentage(row["correct"], totals.get(row["quiz_id"], 0))
+            for row in rows
+        }
+
+    def complete_expired(self, now=None, batch_size=500):
+        """
+        Auto-complete up to ``batch_size`` expired attempts with a single UPDATE.
+        Returns the number of attempts completed.
+        """
+        now = now or timezone.now()
+        rows = list(self.expired(now).order_by("expires_at").values_list("pk", "user_id")[:batch_size])
+        if not rows:
+            return 0
+        ids = [pk for pk, _ in rows]
+        scores = self.bulk_scores(ids)
+        whens = [When(pk=pk, then=Value(Decimal(str(score)))) for pk, score in scores.items()]
+        completed = self.filter(pk__in=ids, completed_at__isnull=True).update(
+            score=Case(*whens, default=Value(Decimal("0")), output_field=DecimalField(max_digits=6, decimal_places=2)),
+            completed_at=now,
+        )
+        attempts_completed.send(
+            sender=self.model, attempt_ids=ids, user_ids={user_id for _, user_id in rows if user_id}
+        )
+        return completed
 
 
 class QuizAttempt(models.Model):
@@ -98,6 +232,7 @@ class QuizAttempt(models.Model):
     attempt_number = models.PositiveIntegerField(default=1)
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
     score = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True,
                                 help_text="Percentage score 0.00 - 100.00")
 
@@ -107,12 +242,28 @@ class QuizAttempt(models.Model):
         ordering = ["-started_at"]
         indexes = [
             models.Index(fields=["quiz", "user"], name="qa_quiz_user_idx"),
+            models.Index(
+                fields=["expires_at"],
+                name="qa_open_expires_idx",
+                condition=Q(completed_at__isnull=True),
+            ),
+            # a user's completed attempts, newest first (core.feed)
+            models.Index(
+                fields=["user", "-completed_at", "-id"],
+                name="qa_user_completed_idx",
+                condition=Q(completed_at__isnull=False),
+            ),
         ]
         unique_together = ("quiz", "user", "attempt_number")
     def __str__(self):
         username = getattr(self.user, "username", "Unknown")
         return f"{username} — {self.quiz.title} (attempt {self.attempt_number})"
 
+    def is_expired(self, now=None):
+        if self.expires_at is None:
+            return False
+        return (now or timezone.now()) >= self.expires_at
+
     def _mcq_questions(self):
         return self.quiz.questions.filter(type=Question.MULTIPLE_CHOICE).prefetch_related("choices")
 
@@ -1,4 +1,5 @@
 from rest_framework.permissions import BasePermission
+from .caching import enrolled_user_ids
 from .models import QuizAttempt, Quiz
 from courses.models import Course
 
@@ -14,13 +15,10 @@ class IsEnrolledInCourse(BasePermission):
         if request.method == "POST" and "quiz" in request.data:
             quiz_id = request.data.get("quiz")
             try:
-                quiz = Quiz.objects.select_related("course").get(pk=quiz_id)
+                quiz = Quiz.objects.only("course_id").get(pk=quiz_id)
             except Quiz.DoesNotExist:
                 return False
-            course = getattr(quiz, "course", None)
-            if course is None:
-                return False
-            return course.students.filter(pk=user.pk).exist()
+            return user.pk in enrolled_user_ids(quiz.course_id)
         return True
 
     def has_object_permission(self, request, view, obj):
@@ -29,16 +27,13 @@ class IsEnrolledInCourse(BasePermission):
             return False
 
         if isinstance(obj, Quiz):
-            course = getattr(obj, "course", None)
+            course_id = obj.course_id
         elif isinstance(obj, QuizAttempt):
-            course = getattr(obj.quiz, "course", None)
+            course_id = obj.quiz.course_id
         else:
             return False
 
-        if course is None:
-            return False
-
-        return course.students.filter(pk=user.pk).exists()
+        return user.pk in enrolled_user_ids(course_id)
 
 
 class IsFirstQuizAttempt(BasePermission):
@@ -57,6 +52,6 @@ class IsFirstQuizAttempt(BasePermission):
             quiz = Quiz.objects.get(pk=quiz_id)
         except Quiz.DoesNotExist:
             return True
-        if quiz.single_attempt and quiz.attempts.filter(user=user, completed_at__isnull=False).exist():
+        if quiz.single_attempt and quiz.attempts.filter(user=user, completed_at__isnull=False).exists():
             return False
         return True
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Scheduled publishing. Drafts with an ``opens_at`` are warmed
+``QUIZ_PREWARM_LEAD`` seconds ahead (payload, answer key, course roster) and
+published at ``opens_at`` by the ``publish_quizzes`` command, so the first
+students to open a quiz hit warm caches.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.dashboard import invalidate_dashboards
+
+from .caching import answer_key, enrolled_user_ids, mark_published, quiz_payload
+from .models import Quiz
+
+
+def warm_quiz(quiz_id, course_id):
+    quiz_payload(quiz_id)
+    answer_key(quiz_id)
+    enrolled_user_ids(course_id)
+
+
+def prewarm_upcoming(now=None, lead=None):
+    """Warm the caches of drafts opening within ``lead`` seconds; returns how many."""
+    now = now or timezone.now()
+    if lead is None:
+        lead = getattr(settings, "QUIZ_PREWARM_LEAD", 300)
+    upcoming = list(Quiz.objects.due_to_open(now + timedelta(seconds=lead)).values_list("pk", "course_id"))
+    for quiz_id, course_id in upcoming:
+        warm_quiz(quiz_id, course_id)
+    return len(upcoming)
+
+
+def publish_due(now=None):
+    """Publish the drafts whose ``opens_at`` has passed; returns how many."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = list(Quiz.objects.due_to_open(now).select_for_update(skip_locked=True).values_list("pk", "course_id"))
+        if not due:
+            return 0
+        Quiz.objects.filter(pk__in=[quiz_id for quiz_id, _ in due]).update(
+            draft=False, published_at=Coalesce("published_at", Value(now)), updated_at=timezone.now(),
+        )
+        transaction.on_commit(lambda: _published(due))
+    return len(due)
+
+
+def _published(due):
+    for quiz_id, course_id in due:
+        mark_published(quiz_id)
+        warm_quiz(quiz_id, course_id)
+        invalidate_dashboards(enrolled_user_ids(course_id))
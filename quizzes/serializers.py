@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.utils import timezone
-from .models import Quiz, Question, Choice, QuizAttempt, Answer
+
+from core.fastpath import FastSerializer
+from .models import Quiz, Question, Choice, QuizAttempt, Answer, score_percentage
 
 class ChoiceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -21,7 +23,30 @@ class QuizSerializer(serializers.ModelSerializer):
     course = serializers.PrimaryKeyRelatedField(read_only=True)
     class Meta:
         model = Quiz
-        fields = ("id", "title", "description", "course", "random_order", "single_attempt", "pass_mark", "draft", "questions", "created_at")
+        fields = ("id", "title", "description", "course", "random_order", "single_attempt", "pass_mark", "draft", "time_limit", "opens_at", "closes_at", "questions", "created_at")
+
+
+class SyncChoiceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Choice
+        fields = ["id", "text"]
+
+
+class SyncQuestionSerializer(QuestionSerializer):
+    choices = SyncChoiceSerializer(many=True, read_only=True)
+
+
+class QuizSyncSerializer(QuizSerializer):
+    """``QuizSerializer`` without the answer key, for the delta sync API (``core.sync``)."""
+
+    questions = SyncQuestionSerializer(many=True, read_only=True)
+
+    class Meta(QuizSerializer.Meta):
+        fields = QuizSerializer.Meta.fields + ("updated_at",)
+
+
+class FastQuizSerializer(FastSerializer):
+    serializer_class = QuizSerializer
 
 
 class AnswerSubmitSerializer(serializers.Serializer):
@@ -52,25 +77,20 @@ class AttemptSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = QuizAttempt
-        fields = ("id", "quiz", "user", "attempt_number", "started_at", "completed_at", "score", "answers")
-        read_only_fields = ("id", "user", "attempt_number", "started_at", "completed_at", "score", "answers")
+        fields = ("id", "quiz", "user", "attempt_number", "started_at", "expires_at", "completed_at", "score", "answers")
+        read_only_fields = ("id", "user", "attempt_number", "started_at", "expires_at", "completed_at", "score", "answers")
 
     def compute_score(self, attempt):
-        mcq_qs = list(attempt._mcq_questions())
-        total = len(mcq_qs)
+        from .caching import answer_key
+
+        key = answer_key(attempt.quiz_id)
+        total = len(key)
         if total == 0:
             return 0.0, 0, 0
 
-        # fetch answers keyed by question_id
-        answers = {a.question_id: a for a in attempt.answers.select_related("selected_choice").all()}
-        correct = 0
-        for q in mcq_qs:
-            ans = answers.get(q.id)
-            if ans and ans.selected_choice and getattr(ans.selected_choice, "is_correct", False):
-                correct += 1
-
-        percentage = (correct / total) * 100.0
-        return float(round(percentage, 2)), correct, total
+        selected = attempt.answers.filter(question_id__in=key).values_list("question_id", "selected_choice_id")
+        correct = sum(1 for question_id, choice_id in selected if choice_id in key[question_id])
+        return score_percentage(correct, total), correct, total
 
     def complete_attempt(self, attempt):
         score, correct, total = self.compute_score(attempt)
@@ -78,3 +98,7 @@ class AttemptSerializer(serializers.ModelSerializer):
         attempt.completed_at = timezone.now()
         attempt.save(update_fields=["score", "completed_at"])
         return score
+
+
+class FastAttemptSerializer(FastSerializer):
+    serializer_class = AttemptSerializer
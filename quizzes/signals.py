@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after attempts are completed in bulk (no post_save is sent for them).
+# Arguments: attempt_ids, user_ids.
+attempts_completed = Signal()
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from courses.models import Course, Program
+from quizzes.models import Answer, Choice, Question, Quiz, QuizAttempt
+
+User = get_user_model()
+
+
+class AttemptExpiryTest(APITestCase):
+    def setUp(self):
+        self.instructor = User.objects.create_user(username="instr", password="pass")
+        self.student = User.objects.create_user(username="student", password="pass")
+        program = Program.objects.create(title="Program")
+        self.course = Course.objects.create(
+            title="Course", code="C-1", program=program, level="bachelor",
+            semester="fall", instructor=self.instructor,
+        )
+        self.course.students.add(self.student)
+        self.quiz = Quiz.objects.create(course=self.course, title="Timed", time_limit=30)
+        self.q1 = Question.objects.create(quiz=self.quiz, text="Q1", order=1)
+        self.q2 = Question.objects.create(quiz=self.quiz, text="Q2", order=2)
+        self.right = Choice.objects.create(question=self.q1, text="Right", is_correct=True)
+        Choice.objects.create(question=self.q1, text="Wrong", is_correct=False)
+        self.q2_right = Choice.objects.create(question=self.q2, text="Right", is_correct=True)
+
+    def test_start_attempt_sets_expiry_from_time_limit(self):
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=self.quiz)
+        self.assertEqual(attempt.expires_at - attempt.started_at, timedelta(minutes=30))
+
+    def test_untimed_quiz_never_expires(self):
+        self.quiz.time_limit = None
+        self.quiz.save()
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=self.quiz)
+        self.assertIsNone(attempt.expires_at)
+        self.assertEqual(QuizAttempt.objects.complete_expired(now=timezone.now() + timedelta(days=365)), 0)
+
+    def test_attempts_expire_when_the_quiz_closes(self):
+        closes_at = timezone.now() + timedelta(minutes=10)
+        self.quiz.closes_at = closes_at
+        self.quiz.save()
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=self.quiz)
+        self.assertEqual(attempt.expires_at, closes_at)
+
+        self.quiz.time_limit = None
+        self.quiz.save()
+        self.assertEqual(self.quiz.expiry_for(timezone.now()), closes_at)
+        self.quiz.closes_at = timezone.now() + timedelta(hours=2)
+        started_at = timezone.now()
+        self.quiz.time_limit = 30
+        self.assertEqual(self.quiz.expiry_for(started_at), started_at + timedelta(minutes=30))
+
+    def test_complete_expired_scores_in_bulk(self):
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=self.quiz)
+        Answer.objects.create(attempt=attempt, question=self.q1, selected_choice=self.right)
+        other = User.objects.create_user(username="other", password="pass")
+        untouched = QuizAttempt.objects.start_attempt(user=other, quiz=self.quiz)
+        QuizAttempt.objects.filter(pk=untouched.pk).update(expires_at=timezone.now() + timedelta(hours=1))
+
+        later = attempt.expires_at + timedelta(seconds=1)
+        self.assertEqual(QuizAttempt.objects.complete_expired(now=later, batch_size=10), 1)
+
+        attempt.refresh_from_db()
+        untouched.refresh_from_db()
+        self.assertEqual(attempt.score, Decimal("50.00"))
+        self.assertEqual(attempt.completed_at, later)
+        self.assertIsNone(untouched.completed_at)
+
+    def test_command_sweeps_all_batches(self):
+        for i in range(5):
+            user = User.objects.create_user(username=f"s{i}", password="pass")
+            QuizAttempt.objects.start_attempt(user=user, quiz=self.quiz)
+        QuizAttempt.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        call_command("expire_attempts", batch_size=2, stdout=StringIO())
+        self.assertFalse(QuizAttempt.objects.filter(completed_at__isnull=True).exists())
+
+    def test_late_answer_is_rejected(self):
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=self.quiz)
+        QuizAttempt.objects.filter(pk=attempt.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.client.force_authenticate(user=self.student)
+        url = reverse("attempt-answer", args=[attempt.pk])
+        res = self.client.post(url, {"question": self.q1.id, "selected_choice": self.right.id}, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertFalse(Answer.objects.filter(attempt=attempt).exists())
+
+    def test_complete_after_expiry_is_rejected(self):
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=self.quiz)
+        QuizAttempt.objects.filter(pk=attempt.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.client.force_authenticate(user=self.student)
+        res = self.client.post(reverse("attempt-complete", args=[attempt.pk]))
+        self.assertEqual(res.status_code, 400)
+        attempt.refresh_from_db()
+        self.assertIsNone(attempt.completed_at)
+
+    def test_complete_keeps_the_score_of_a_completed_attempt(self):
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=self.quiz)
+        Answer.objects.create(attempt=attempt, question=self.q1, selected_choice=self.right)
+        swept_at = attempt.expires_at + timedelta(seconds=1)
+        QuizAttempt.objects.complete_expired(now=swept_at)
+        # a late answer would change the score if it were recomputed
+        Answer.objects.create(attempt=attempt, question=self.q2, selected_choice=self.q2_right)
+
+        self.client.force_authenticate(user=self.student)
+        res = self.client.post(reverse("attempt-complete", args=[attempt.pk]))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["score"], 50.0)
+        attempt.refresh_from_db()
+        self.assertEqual((attempt.completed_at, attempt.score), (swept_at, Decimal("50.00")))
+
+    def test_answer_within_time_limit_is_recorded(self):
+        attempt = QuizAttempt.objects.start_attempt(user=self.student, quiz=self.quiz)
+        self.client.force_authenticate(user=self.student)
+        url = reverse("attempt-answer", args=[attempt.pk])
+        res = self.client.post(url, {"question": self.q1.id, "selected_choice": self.right.id}, format="json")
+        self.assertEqual(res.status_code, 201)
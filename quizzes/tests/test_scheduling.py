@@ -0,0 +1,74 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.views import get_tokens_for_user
+from courses.models import Course, Program
+from quizzes.models import Choice, Question, Quiz
+
+User = get_user_model()
+
+
+class ScheduledPublishingTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(username="student", password="pass")
+        program = Program.objects.create(title="Program")
+        self.course = Course.objects.create(
+            title="Course", code="C-1", program=program, level="bachelor", semester="fall", instructor=self.student,
+        )
+        self.course.students.add(self.student)
+        now = timezone.now()
+        self.quiz = Quiz.objects.create(
+            course=self.course, title="Exam", draft=True,
+            opens_at=now + timedelta(minutes=2), closes_at=now + timedelta(hours=1),
+        )
+        question = Question.objects.create(quiz=self.quiz, text="2+2?", order=1)
+        Choice.objects.create(question=question, text="4", is_correct=True)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.student)['access']}")
+
+    def test_open_filters_on_the_schedule(self):
+        now = timezone.now()
+        self.assertFalse(Quiz.objects.open(now).exists())
+        Quiz.objects.filter(pk=self.quiz.pk).update(draft=False)
+        self.assertFalse(Quiz.objects.open(now).exists())
+        self.assertTrue(Quiz.objects.open(now + timedelta(minutes=5)).exists())
+        self.assertFalse(Quiz.objects.open(now + timedelta(hours=2)).exists())
+
+    def test_open_quizzes_query_can_use_the_schedule_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("uses SQLite's INDEXED BY")
+        sql, params = Quiz.objects.open().filter(course=self.course).query.sql_with_params()
+        # SQLite refuses INDEXED BY when the index cannot serve the query
+        sql = sql.replace('FROM "quizzes_quiz"', 'FROM "quizzes_quiz" INDEXED BY "quiz_course_schedule_idx"')
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def test_scheduler_warms_then_publishes(self):
+        call_command("publish_quizzes", stdout=StringIO())
+        self.assertTrue(Quiz.objects.get(pk=self.quiz.pk).draft)
+        self.assertEqual(self.client.get(reverse("quiz-list")).json(), [])
+
+        Quiz.objects.filter(pk=self.quiz.pk).update(opens_at=timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("publish_quizzes", stdout=out)
+        self.assertIn("published 1", out.getvalue())
+        self.assertFalse(Quiz.objects.get(pk=self.quiz.pk).draft)
+
+        url = reverse("quiz-detail", args=[self.quiz.pk])
+        with self.assertNumQueries(1):  # the quiz row; payload and roster are warm
+            body = self.client.get(url).json()
+        self.assertFalse(body["draft"])
+        self.assertEqual(len(body["questions"]), 1)
+
+    def test_attempts_need_an_open_quiz(self):
+        res = self.client.post(reverse("attempt-list"), {"quiz": self.quiz.pk})
+        self.assertEqual(res.status_code, 403)
@@ -3,31 +3,64 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from .models import Quiz, QuizAttempt, Answer, Question
-from .serializers import QuizSerializer, AttemptSerializer, AnswerSubmitSerializer
+from .caching import quiz_payload
+from .models import Quiz, QuizAttempt, Answer
+from .serializers import (
+    AnswerSubmitSerializer,
+    AttemptSerializer,
+    FastAttemptSerializer,
+    FastQuizSerializer,
+    QuizSerializer,
+)
 from .permissions import IsEnrolledInCourse, IsFirstQuizAttempt
+from core.idempotency import idempotent
+from core.sparse import SparseFieldsMixin
 from courses.models import Course
 
 
-class QuizViewSet(viewsets.ReadOnlyModelViewSet):
+class QuizViewSet(SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Quiz.objects.all().select_related("course")
     serializer_class = QuizSerializer
     permission_classes = [IsAuthenticated, IsEnrolledInCourse]
+    query_budget = {"list": 4, "retrieve": 6}
+    available_when_degraded = True
 
     def get_queryset(self):
         user = self.request.user
-        course_ids = Course.objects.filter(Students=user).values_list("id", flat=True)
-        return Quiz.objects.filter(course_id__in=course_ids)
-
-
-class QuizAttemptViewSet(viewsets.ModelViewSet):
+        course_ids = Course.objects.filter(students=user).values_list("id", flat=True)
+        qs = Quiz.objects.open().filter(course_id__in=course_ids)
+        if self.action == "retrieve":
+            # the payload comes from quiz_payload(), only the permission check reads the row
+            return qs
+        return qs.prefetch_related("questions__choices")
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None or self.sparse_tree() is not None:
+            return super().list(request, *args, **kwargs)
+        return Response(FastQuizSerializer(self.filter_queryset(self.get_queryset())).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.sparse_tree() is not None:
+            return super().retrieve(request, *args, **kwargs)
+        quiz = self.get_object()
+        return Response(quiz_payload(quiz.pk))
+
+
+class QuizAttemptViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = QuizAttempt.objects.all().select_related("quiz")
     serializer_class = AttemptSerializer
     permission_classes = [IsAuthenticated, IsEnrolledInCourse, IsFirstQuizAttempt]
+    throttle_scope = "attempts"
 
     def get_queryset(self):
         return QuizAttempt.objects.filter(user=self.request.user).select_related("quiz")
 
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None or self.sparse_tree() is not None:
+            return super().list(request, *args, **kwargs)
+        return Response(FastAttemptSerializer(self.filter_queryset(self.get_queryset())).data)
+
+    @idempotent
     def create(self, request, *args, **kwargs):
         quiz_id = request.data.get("quiz")
         if not quiz_id:
@@ -38,6 +71,9 @@ class QuizAttemptViewSet(viewsets.ModelViewSet):
         except Quiz.DoesNotExist:
             return Response({"detail": "Quiz not found."}, status=status.HTTP_404_NOT_FOUND)
 
+        if not quiz.is_open():
+            return Response({"detail": "This quiz is not open."}, status=status.HTTP_403_FORBIDDEN)
+
         if not quiz.allow_new_attempt_for_user(request.user):
             return Response({"detail": "You are not allowed another attempt for this quiz."}, status=status.HTTP_403_FORBIDDEN)
         
@@ -49,12 +85,16 @@ class QuizAttemptViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(attempt)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    @action(detail=True, methods=["post"],permission_classes=[IsAuthenticated])
+    @action(detail=True, methods=["post"],permission_classes=[IsAuthenticated], throttle_scope="answer")
+    @idempotent
     def answer(self, request, pk=None):
         attempt = self.get_object()
         if attempt.user_id != request.user.id:
             return Response({"detail": "Forbidden."}, status=status.HTTP_403_FORBIDDEN)
 
+        if attempt.completed_at is not None or attempt.is_expired():
+            return Response({"detail": "This attempt is closed; late answers are not accepted."}, status=status.HTTP_400_BAD_REQUEST)
+
         serializer = AnswerSubmitSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -82,17 +122,18 @@ class QuizAttemptViewSet(viewsets.ModelViewSet):
         status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
         return Response({"detail": "Answer recorded"}, status=status_code)
 
-    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated], throttle_scope="complete")
+    @idempotent
     def complete(self, request, pk=None):
         attempt = self.get_object()
         if attempt.user_id != request.user.id:
             return Response({"detail": "Forbidden."}, status=status.HTTP_403_FORBIDDEN)
 
-        mcq_questions_qs = attempt.quiz.questions.filter(type=Question.MULTIPLE_CHOICE)
-        total_mcq = mcq_questions_qs.count()
-
-        mcq_answers = attempt.answers.filter(question__type=Question.MULTIPLE_CHOICE)
-        correct = sum(1 for ans in mcq_answers if ans.selected_choice and ans.selected_choice.is_correct)
+        if attempt.completed_at is not None:
+            # already scored, by an earlier call or by the expiry sweeper
+            return Response({"score": float(attempt.score or 0)}, status=status.HTTP_200_OK)
+        if attempt.is_expired():
+            return Response({"detail": "This attempt has expired; it is scored automatically."}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = AttemptSerializer(context={"request": request})
         score = serializer.complete_attempt(attempt)